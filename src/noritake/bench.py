@@ -0,0 +1,240 @@
+"""Benchmark representative workloads through a recording communications channel.
+
+Run as 'python -m noritake.bench'; results are printed as JSON, one record per workload with bytes on
+the wire, number of writes, Python CPU time and modeled wire time, all per iteration. With
+'--baseline' the byte and write counts are compared against a previous run and the exit code is non
+zero on regressions.
+"""
+
+import argparse
+import json
+import sys
+import time
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+import numpy as np
+
+from noritake.gu600_comms import SPI_SPEED_HZ, GU600CommsRecorder
+from noritake.gu600_config import GU600Models
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_enums import *
+from noritake.gu600_framebuffer import GU600FrameBuffer
+from noritake.gu600_grayscale import GU600GrayscaleDisplay
+from noritake.gu600_planner import GU600PlannedFrameBuffer
+from noritake.gu600_text import GU600TextField
+from noritake.gu600_widgets import GU600LevelMeter
+
+# Pause GU600CommsSPI makes after every write.
+SPI_WRITE_OVERHEAD = 0.00001
+# Start bit, 8 data bits and stop bit.
+SERIAL_BITS_PER_BYTE = 10
+# Pitch of the lines of 'TEXT_PAGE' in the 7x15 font, which puts their baselines at 15, 31, 47 and 63.
+LINE_PITCH = 16
+
+TEXT_PAGE = [
+    "Glenn Gould (1982)       -12dB",
+    "Johann Sebastian Bach         ",
+    "Goldberg Variations           ",
+    "Variatio 10.             01:12",
+]
+
+Workload = Callable[[GU600Driver], Callable[[int], None]]
+
+
+def _clear(vfd: GU600Driver) -> Callable[[int], None]:
+    def run(i: int) -> None:
+        vfd.clear_all()
+
+    return run
+
+
+def _text_page(vfd: GU600Driver) -> Callable[[int], None]:
+    def run(i: int) -> None:
+        vfd.clear_all()
+        vfd.select_extended_font(
+            ExtendedFontFace.FONTFACE_7x15A,
+            FontProportion.FONT_FIXEDSPACE,
+            FontSpace.FONTSPACE_1PIXEL,
+        )
+        for row, line in enumerate(TEXT_PAGE):
+            vfd.write_text(0, (row + 1) * LINE_PITCH - 1, line)
+
+    return run
+
+
+def _text_page_batched(vfd: GU600Driver) -> Callable[[int], None]:
+    page = _text_page(vfd)
+
+    def run(i: int) -> None:
+        with vfd.batch():
+            page(i)
+
+    return run
+
+
+def _clock_field(vfd: GU600Driver) -> Callable[[int], None]:
+    field = GU600TextField(vfd, 0, len(TEXT_PAGE) * LINE_PITCH - 1, 30)
+    field.update(TEXT_PAGE[3])
+
+    def run(i: int) -> None:
+        field.update(f"Variatio 10.             {i // 60 % 60:02}:{i % 60:02}")
+
+    return run
+
+
+def _bitmap_blit(vfd: GU600Driver) -> Callable[[int], None]:
+    frames = np.random.default_rng(0).random((2, vfd.config.height, vfd.config.width))
+    framebuffer = GU600FrameBuffer(vfd)
+
+    def run(i: int) -> None:
+        framebuffer.blit(0, 0, frames[i % 2] > 0.5)
+        framebuffer.invalidate()
+        framebuffer.flush()
+
+    return run
+
+
+def _animation(vfd: GU600Driver, planned: bool = False) -> Callable[[int], None]:
+    framebuffer = GU600PlannedFrameBuffer(vfd) if planned else GU600FrameBuffer(vfd)
+    framebuffer.flush()
+    sprite = np.ones((16, 16), dtype=bool)
+    span = vfd.config.width - sprite.shape[1]
+
+    def run(i: int) -> None:
+        x = i % span
+        framebuffer.fill_rect(x - 1, 20, x - 1, 35, False)
+        framebuffer.blit(x, 20, sprite)
+        framebuffer.flush()
+
+    return run
+
+
+def _animation_planned(vfd: GU600Driver) -> Callable[[int], None]:
+    return _animation(vfd, planned=True)
+
+
+def _grayscale(vfd: GU600Driver) -> Callable[[int], None]:
+    gradient = np.linspace(0, 255, vfd.config.width).astype(np.uint8)
+    grayscale = GU600GrayscaleDisplay(vfd)
+    grayscale.show(np.tile(gradient, (vfd.config.height, 1)))
+    grayscale.step()
+
+    def run(i: int) -> None:
+        grayscale.step()
+
+    return run
+
+
+def _level_meter(vfd: GU600Driver) -> Callable[[int], None]:
+    meter = GU600LevelMeter(vfd, 0, 56, vfd.config.width - 1, 63)
+    levels = np.random.default_rng(0).uniform(-30, 0, 64)
+    meter.update(levels[0])
+
+    def run(i: int) -> None:
+        meter.update(levels[i % len(levels)])
+
+    return run
+
+
+WORKLOADS: Mapping[str, Workload] = {
+    "clear": _clear,
+    "text_page": _text_page,
+    "text_page_batched": _text_page_batched,
+    "clock_field": _clock_field,
+    "bitmap_blit": _bitmap_blit,
+    "animation": _animation,
+    "animation_planned": _animation_planned,
+    "grayscale": _grayscale,
+    "level_meter": _level_meter,
+}
+
+
+def wire_time(
+    size: int, writes: int, spi_speed_hz: int = SPI_SPEED_HZ, baud: int = 0
+) -> float:
+    """Model the time 'size' bytes in 'writes' transfers take on the wire; over a serial line at 'baud' if
+    given, else over SPI at 'spi_speed_hz'."""
+    if baud:
+        return size * SERIAL_BITS_PER_BYTE / baud
+    return size * 8 / spi_speed_hz + writes * SPI_WRITE_OVERHEAD
+
+
+def run_workload(
+    name: str,
+    model: str = "GU240x64D-K612A8",
+    iterations: int = 100,
+    spi_speed_hz: int = SPI_SPEED_HZ,
+    baud: int = 0,
+) -> Dict[str, Any]:
+    """Run workload 'name' and return its per iteration cost."""
+    recorder = GU600CommsRecorder()
+    vfd = GU600Driver(recorder, GU600Models[model])
+    run = WORKLOADS[name](vfd)
+    recorder.clear()
+    start = time.process_time()
+    for i in range(iterations):
+        run(i)
+    cpu = time.process_time() - start
+    size = len(recorder.data) / iterations
+    writes = recorder.writes / iterations
+    return {
+        "workload": name,
+        "model": model,
+        "iterations": iterations,
+        "bytes": size,
+        "writes": writes,
+        "cpu_time": cpu / iterations,
+        "wire_time": wire_time(len(recorder.data), recorder.writes, spi_speed_hz, baud)
+        / iterations,
+    }
+
+
+def regressions(
+    results: List[Dict[str, Any]], baseline: List[Dict[str, Any]], tolerance: float
+) -> List[str]:
+    """Describe every workload whose bytes or writes grew by more than 'tolerance' over 'baseline'."""
+    previous = {(r["workload"], r["model"]): r for r in baseline}
+    messages = []
+    for result in results:
+        before = previous.get((result["workload"], result["model"]))
+        if before is None:
+            continue
+        for key in ("bytes", "writes"):
+            if result[key] > before[key] * (1 + tolerance):
+                messages.append(
+                    f"{result['workload']}: {key} grew from {before[key]} to {result[key]}"
+                )
+    return messages
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m noritake.bench")
+    parser.add_argument("workloads", nargs="*", help=", ".join(WORKLOADS))
+    parser.add_argument("--model", default="GU240x64D-K612A8", choices=GU600Models)
+    parser.add_argument("--iterations", type=int, default=100)
+    parser.add_argument("--spi-speed", type=int, default=SPI_SPEED_HZ)
+    parser.add_argument("--baud", type=int, default=0)
+    parser.add_argument("--baseline", help="JSON results of a previous run")
+    parser.add_argument("--tolerance", type=float, default=0.0)
+    args = parser.parse_args(argv)
+    for name in args.workloads:
+        if name not in WORKLOADS:
+            parser.error(f"unknown workload '{name}'")
+
+    results = [
+        run_workload(name, args.model, args.iterations, args.spi_speed, args.baud)
+        for name in args.workloads or WORKLOADS
+    ]
+    json.dump(results, sys.stdout, indent=2)
+    sys.stdout.write("\n")
+    if args.baseline:
+        with open(args.baseline) as fh:
+            messages = regressions(results, json.load(fh), args.tolerance)
+        for message in messages:
+            sys.stderr.write(message + "\n")
+        return 1 if messages else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,237 @@
+import mmap
+import struct
+import time
+from typing import BinaryIO, Callable, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from noritake.gu600_comms import GU600CommsRecorder
+from noritake.gu600_config import GU600Config
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_planner import apply, plan
+from noritake.gu600_stream import write_image
+
+# File layout: header, frame records holding the commands to send, index of (offset, size, flags) per
+# frame. All integers are little endian.
+MAGIC = b"GU6A"
+VERSION = 1
+HEADER = struct.Struct("<4sHHHIIQ")
+INDEX_ENTRY = struct.Struct("<QII")
+KEYFRAME = 0x01
+KEYFRAME_INTERVAL = 50
+# A frame sent more than this fraction of the frame interval after it was due counts as late.
+LATE_FRACTION = 0.25
+
+
+class PlaybackStats(NamedTuple):
+    """Outcome of playing frames at a target rate. Dropped frames were skipped to catch up, late frames
+    were sent after they were due."""
+
+    frames: int
+    dropped: int
+    late: int
+    bytes: int
+    max_lateness: float
+    duration: float
+
+
+class GU600AnimationWriter:
+    """Write an animation file frame by frame. Each frame is stored as the commands that draw it: a
+    keyframe draws the entire frame, every other frame the changes since the one before it, as found by
+    'gu600_planner.plan'. A keyframe is stored every 'keyframe_interval' frames, and whenever drawing the
+    changes would take more bytes than the full frame. Only the previous frame is kept in memory."""
+
+    def __init__(
+        self,
+        path: str,
+        config: GU600Config,
+        fps: float,
+        keyframe_interval: int = KEYFRAME_INTERVAL,
+    ) -> None:
+        assert fps > 0 and keyframe_interval > 0
+        self._config = config
+        self._interval_us = round(1000000 / fps)
+        self._keyframe_interval = keyframe_interval
+        self._recorder = GU600CommsRecorder()
+        self._driver = GU600Driver(self._recorder, config)
+        self._previous: Optional[np.ndarray] = None
+        self._index: List[Tuple[int, int, int]] = []
+        self._file: BinaryIO = open(path, "wb")
+        self._file.write(bytes(HEADER.size))
+
+    @property
+    def frames(self) -> int:
+        return len(self._index)
+
+    def add_frame(self, image: np.ndarray) -> None:
+        """Append a boolean frame of shape (height, width)."""
+        image = np.asarray(image, dtype=bool)
+        if image.shape != (self._config.height, self._config.width):
+            raise ValueError(
+                f"Frame of shape {image.shape} does not match the display {self._config.height}x"
+                f"{self._config.width}."
+            )
+        keyframe = self._encode_keyframe(image)
+        flags = KEYFRAME
+        record = keyframe
+        if self._previous is not None and len(self._index) % self._keyframe_interval:
+            # Frames may be skipped during playback, so none relies on the state another one left.
+            self._driver.invalidate()
+            self._recorder.clear()
+            apply(self._driver, plan(self._previous, image))
+            if len(self._recorder.data) < len(keyframe):
+                record, flags = bytes(self._recorder.data), 0
+        self._index.append((self._file.tell(), len(record), flags))
+        self._file.write(record)
+        self._previous = image.copy()
+
+    def close(self) -> None:
+        """Write the index and header and close the file."""
+        if self._file.closed:
+            return
+        index_offset = self._file.tell()
+        for entry in self._index:
+            self._file.write(INDEX_ENTRY.pack(*entry))
+        self._file.seek(0)
+        self._file.write(
+            HEADER.pack(
+                MAGIC,
+                VERSION,
+                self._config.width,
+                self._config.height,
+                self._interval_us,
+                len(self._index),
+                index_offset,
+            )
+        )
+        self._file.close()
+
+    def __enter__(self) -> "GU600AnimationWriter":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def _encode_keyframe(self, image: np.ndarray) -> bytes:
+        self._driver.invalidate()
+        self._recorder.clear()
+        write_image(self._driver, 0, 0, image)
+        return bytes(self._recorder.data)
+
+
+class GU600AnimationPlayer:
+    """Play an animation file written by 'GU600AnimationWriter'. The file is memory mapped and frames are
+    passed to the driver as views into the mapping, so memory use does not grow with its length."""
+
+    def __init__(self, path: str) -> None:
+        with open(path, "rb") as fh:
+            self._map = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._map)
+        magic, version, width, height, interval_us, frames, index_offset = (
+            HEADER.unpack_from(self._map)
+        )
+        self.width: int = width
+        self.height: int = height
+        self.interval: float = interval_us / 1000000
+        self._frames: int = frames
+        self._index_offset: int = index_offset
+        if magic != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a GU600 animation file.")
+
+    @property
+    def frames(self) -> int:
+        return self._frames
+
+    @property
+    def fps(self) -> float:
+        return 1 / self.interval
+
+    def is_keyframe(self, frame: int) -> bool:
+        return bool(self._entry(frame)[2] & KEYFRAME)
+
+    def frame(self, frame: int) -> memoryview:
+        """Return the commands of a frame as a view into the file; release it before closing the player."""
+        offset, size, _ = self._entry(frame)
+        return self._view[offset : offset + size]
+
+    def next_keyframe(self, frame: int) -> Optional[int]:
+        """Return the first keyframe at or after 'frame', or None."""
+        for candidate in range(frame, self._frames):
+            if self.is_keyframe(candidate):
+                return candidate
+        return None
+
+    def play(
+        self,
+        driver: GU600Driver,
+        fps: Optional[float] = None,
+        loop: bool = False,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> PlaybackStats:
+        """Send the frames to 'driver' at 'fps', by default the rate the file was written with, once or
+        until interrupted if 'loop' is set. When a frame is more than one interval behind, playback skips
+        ahead to the latest keyframe that is due, if there is one, and the frames in between are dropped;
+        otherwise the frame is sent late."""
+        if (driver.config.width, driver.config.height) != (self.width, self.height):
+            raise ValueError(
+                f"Animation of {self.width}x{self.height} does not match the display."
+            )
+        interval = 1 / fps if fps else self.interval
+        frames = dropped = late = size = 0
+        max_lateness = 0.0
+        start = clock()
+        due = start
+        frame = 0
+        while frame < self._frames:
+            now = clock()
+            if now < due:
+                sleep(due - now)
+                now = clock()
+            lateness = now - due
+            if lateness > interval:
+                target = frame + int(lateness / interval)
+                keyframe = self._last_keyframe(frame + 1, target)
+                if keyframe is not None:
+                    dropped += keyframe - frame
+                    due += (keyframe - frame) * interval
+                    lateness = now - due
+                    frame = keyframe
+            if lateness > interval * LATE_FRACTION:
+                late += 1
+            max_lateness = max(max_lateness, lateness)
+            with self.frame(frame) as data:
+                if len(data):
+                    driver.write(data)
+                size += len(data)
+            frames += 1
+            frame += 1
+            due += interval
+            if loop and frame == self._frames:
+                frame = 0
+        return PlaybackStats(frames, dropped, late, size, max_lateness, clock() - start)
+
+    def close(self) -> None:
+        self._view.release()
+        self._map.close()
+
+    def __enter__(self) -> "GU600AnimationPlayer":
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def _entry(self, frame: int) -> Tuple[int, int, int]:
+        if not 0 <= frame < self._frames:
+            raise IndexError(f"Frame {frame} is not within 0-{self._frames - 1}.")
+        entry: Tuple[int, int, int] = INDEX_ENTRY.unpack_from(
+            self._map, self._index_offset + frame * INDEX_ENTRY.size
+        )
+        return entry
+
+    def _last_keyframe(self, first: int, last: int) -> Optional[int]:
+        for candidate in range(min(last, self._frames - 1), first - 1, -1):
+            if self.is_keyframe(candidate):
+                return candidate
+        return None
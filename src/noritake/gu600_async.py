@@ -0,0 +1,165 @@
+import asyncio
+import queue
+import threading
+import time
+from typing import Any, List, NamedTuple, Optional, Tuple
+
+from noritake.gu600_comms import GU600Comms, Message, as_buffer
+from noritake.gu600_config import GU600Config
+from noritake.gu600_driver import GU600Driver
+
+MAX_QUEUE_SIZE = 256
+
+
+class GU600QueueStats(NamedTuple):
+    """Snapshot of the state of a 'GU600CommsThreaded' queue."""
+
+    depth: int
+    max_depth: int
+    messages: int
+    bytes: int
+    mean_latency: float
+    max_latency: float
+
+
+class GU600CommsThreaded(GU600Comms):
+    """Queue messages and write them to another communications channel from a background thread.
+    Writing returns immediately unless the queue holds 'max_queue_size' messages, in which case it blocks
+    until the writer thread has caught up."""
+
+    def __init__(
+        self, comms_link: GU600Comms, max_queue_size: int = MAX_QUEUE_SIZE
+    ) -> None:
+        self._comms_link = comms_link
+        self._queue: "queue.Queue[Optional[Tuple[float, bytes]]]" = queue.Queue(
+            max_queue_size
+        )
+        self._lock = threading.Lock()
+        self._error: Optional[BaseException] = None
+        self._closed = False
+        self._max_depth = 0
+        self._messages = 0
+        self._bytes = 0
+        self._total_latency = 0.0
+        self._max_latency = 0.0
+        self._thread = threading.Thread(
+            target=self._run, name="gu600-writer", daemon=True
+        )
+        self._thread.start()
+
+    @property
+    def comms_link(self) -> GU600Comms:
+        return self._comms_link
+
+    @property
+    def depth(self) -> int:
+        """Number of messages waiting to be written."""
+        return self._queue.qsize()
+
+    def write(self, message: Message) -> bool:
+        self._raise_error()
+        if self._closed:
+            raise RuntimeError("Writer thread has been closed.")
+        self._queue.put((time.perf_counter(), bytes(as_buffer(message))))
+        depth = self._queue.qsize()
+        with self._lock:
+            self._max_depth = max(self._max_depth, depth)
+        return True
+
+    def read(self, count: int, timeout: float = 0.0) -> List[int]:
+        self.flush()
+        return self._comms_link.read(count, timeout)
+
+    def xfer(self, message: Message, count: int, timeout: float = 0.0) -> List[int]:
+        self.flush()
+        return self._comms_link.xfer(message, count, timeout)
+
+    def flush(self) -> bool:
+        """Block until all queued messages have been written. An exception raised by the underlying
+        channel in the writer thread is raised here."""
+        self._queue.join()
+        self._raise_error()
+        return True
+
+    def close(self) -> None:
+        """Write all queued messages and stop the writer thread."""
+        if not self._closed:
+            self._closed = True
+            self._queue.put(None)
+            self._thread.join()
+        self._raise_error()
+
+    def stats(self) -> GU600QueueStats:
+        """Return a snapshot of the queue depth and write latency."""
+        with self._lock:
+            return GU600QueueStats(
+                depth=self._queue.qsize(),
+                max_depth=self._max_depth,
+                messages=self._messages,
+                bytes=self._bytes,
+                mean_latency=(
+                    self._total_latency / self._messages if self._messages else 0.0
+                ),
+                max_latency=self._max_latency,
+            )
+
+    def _raise_error(self) -> None:
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def _run(self) -> None:
+        while True:
+            item = self._queue.get()
+            try:
+                if item is None:
+                    return
+                queued, message = item
+                self._comms_link.write(message)
+                latency = time.perf_counter() - queued
+                with self._lock:
+                    self._messages += 1
+                    self._bytes += len(message)
+                    self._total_latency += latency
+                    self._max_latency = max(self._max_latency, latency)
+            except Exception as error:
+                self._error = error
+            finally:
+                self._queue.task_done()
+
+
+class AsyncGU600Driver(GU600Driver):
+    """Driver whose command methods only queue the encoded command and return at once; a background thread
+    writes the queue to the communications link."""
+
+    def __init__(
+        self,
+        comms_link: GU600Comms,
+        config: GU600Config,
+        max_queue_size: int = MAX_QUEUE_SIZE,
+    ) -> None:
+        self._writer = GU600CommsThreaded(comms_link, max_queue_size)
+        super().__init__(self._writer, config)
+
+    def flush(self) -> bool:
+        """Block until all queued commands have been written to the device."""
+        return self._writer.flush()
+
+    async def drain(self) -> bool:
+        """Wait, without blocking the event loop, until all queued commands have been written."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(None, self._writer.flush)
+
+    def close(self) -> None:
+        """Write all queued commands and stop the writer thread."""
+        self._writer.close()
+
+    def stats(self) -> GU600QueueStats:
+        """Return queue depth and latency statistics of the writer thread."""
+        return self._writer.stats()
+
+    def __enter__(self) -> "AsyncGU600Driver":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
@@ -0,0 +1,95 @@
+import hashlib
+import pickle
+from collections import OrderedDict
+from typing import Any, Callable, NamedTuple
+
+from noritake.gu600_comms import GU600CommsRecorder
+from noritake.gu600_driver import GU600Driver
+
+MAX_CACHE_SIZE = 65536
+
+Render = Callable[[GU600Driver], Any]
+
+
+class GU600CacheStats(NamedTuple):
+    """Snapshot of the counters of a 'GU600ScreenCache'."""
+
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size: int
+
+
+class GU600ScreenCache:
+    """Cache the encoded commands of whole screens. A screen is identified by its logical content, any
+    value that can be pickled such as a tuple of the strings shown, which is hashed together with the
+    display size. The first time a screen is shown its render function is run against a recording
+    driver; after that the recorded bytes are sent in one write. Screens are evicted least recently used
+    first once all of them take more than 'max_size' bytes. The render function should draw the entire
+    screen and set any mode it relies on, as it is replayed whatever the display showed before."""
+
+    def __init__(self, driver: GU600Driver, max_size: int = MAX_CACHE_SIZE) -> None:
+        self._driver = driver
+        self._max_size = max_size
+        self._screens: "OrderedDict[bytes, bytes]" = OrderedDict()
+        self._size = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def key(self, content: Any) -> bytes:
+        """Return the cache key of a screen."""
+        config = self._driver.config
+        data = pickle.dumps((config.width, config.height, content), protocol=4)
+        return hashlib.blake2b(data, digest_size=16).digest()
+
+    def show(self, content: Any, render: Render) -> bool:
+        """Show the screen identified by 'content', calling 'render' with a driver to draw it unless it is
+        cached."""
+        key = self.key(content)
+        data = self._screens.get(key)
+        if data is None:
+            self._misses += 1
+            data = self.encode(render)
+            self._store(key, data)
+        else:
+            self._hits += 1
+            self._screens.move_to_end(key)
+        return self._driver.write(data)
+
+    def encode(self, render: Render) -> bytes:
+        """Return the commands 'render' sends, without caching them."""
+        recorder = GU600CommsRecorder()
+        render(GU600Driver(recorder, self._driver.config))
+        return bytes(recorder.data)
+
+    def invalidate(self, content: Any) -> None:
+        """Forget the screen identified by 'content'."""
+        data = self._screens.pop(self.key(content), None)
+        if data is not None:
+            self._size -= len(data)
+
+    def clear(self) -> None:
+        """Forget all screens."""
+        self._screens.clear()
+        self._size = 0
+
+    def stats(self) -> GU600CacheStats:
+        return GU600CacheStats(
+            hits=self._hits,
+            misses=self._misses,
+            evictions=self._evictions,
+            entries=len(self._screens),
+            size=self._size,
+        )
+
+    def _store(self, key: bytes, data: bytes) -> None:
+        if len(data) > self._max_size:
+            return
+        self._screens[key] = data
+        self._size += len(data)
+        while self._size > self._max_size:
+            _, evicted = self._screens.popitem(last=False)
+            self._size -= len(evicted)
+            self._evictions += 1
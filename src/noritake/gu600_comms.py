@@ -1,39 +1,178 @@
 import time
-from typing import List
+from typing import List, Union
 
+import numpy as np
 import spidev
 
 PACKET_HEADER = 0x02
 PACKET_FOOTER = 0x03
 VFDACK = 0x50
 MAX_MESSAGE_SIZE = 256
+MAX_TRANSFER_SIZE = 4096
 BRIGHTNESS_LEVELS = 8
+RESPONSE_TIMEOUT = 0.01
+SPI_SPEED_HZ = 500000
+# Bytes read while the display has nothing to send; SPI clocks in these from an idle line.
+IDLE_BYTES = (0x00, 0xFF)
+# Time between reads while waiting for a response over SPI.
+RESPONSE_POLL_INTERVAL = 0.0005
+
+# Anything supporting the buffer protocol is accepted at run time; NumPy arrays are named so that type
+# checkers accept them too.
+Message = Union[List[int], bytes, bytearray, memoryview, np.ndarray]
+
+
+def as_buffer(message: Message) -> Union[bytes, bytearray, memoryview]:
+    """Return 'message' as contiguous bytes. Buffer protocol objects are not copied unless they are not
+    contiguous, lists are converted once."""
+    if isinstance(message, (bytes, bytearray)):
+        return message
+    if isinstance(message, list):
+        return bytes(message)
+    view = message.data if isinstance(message, np.ndarray) else memoryview(message)
+    if not view.c_contiguous:
+        return view.tobytes()
+    return view if view.format == "B" and view.ndim == 1 else view.cast("B")
 
 
 class GU600Comms:
-    def write(self, message: List[int]) -> bool:
-        """Write bytes to an underlying communications channel."""
+    def write(self, message: Message) -> bool:
+        """Write bytes to an underlying communications channel. The message may be reused by the caller
+        once this returns, so implementations must copy what they keep."""
+        pass
+
+    def read(self, count: int, timeout: float = 0.0) -> List[int]:
+        """Read up to 'count' bytes from an underlying communications channel, waiting at most 'timeout'
+        seconds for them to arrive."""
         pass
 
+    def xfer(self, message: Message, count: int, timeout: float = 0.0) -> List[int]:
+        """Write 'message' and read up to 'count' bytes of response, waiting at most 'timeout' seconds for
+        them. Full duplex channels override this to do both in a single transfer."""
+        self.write(message)
+        return self.read(count, timeout)
+
 
 class GU600CommsSPI(GU600Comms):
-    def __init__(self, spi_num: int, spi_ce: int) -> None:
+    def __init__(self, spi_num: int, spi_ce: int, speed_hz: int = SPI_SPEED_HZ) -> None:
+        self.spi_num = spi_num
+        self.spi_ce = spi_ce
         self.spi = spidev.SpiDev()
         self.spi.open(spi_num, spi_ce)
-        # on raspberry pi zero w buster, speed was set to 1250000 and didn't work
-        self.spi.max_speed_hz = 500000
+        # on raspberry pi zero w buster, speed was set to 1250000 and didn't work, see gu600_tuning for
+        # finding the speed a board can do
+        self.spi.max_speed_hz = speed_hz
+
+    @property
+    def speed_hz(self) -> int:
+        return int(self.spi.max_speed_hz)
+
+    @speed_hz.setter
+    def speed_hz(self, speed_hz: int) -> None:
+        self.spi.max_speed_hz = speed_hz
 
-    def write(self, message: List[int]) -> bool:
-        self.spi.writebytes(message)
+    def write(self, message: Message) -> bool:
+        # writebytes2 takes buffers without converting every byte, and splits large transfers itself.
+        self.spi.writebytes2(as_buffer(message))
         time.sleep(0.00001)
         return True
 
+    def read(self, count: int, timeout: float = 0.0) -> List[int]:
+        """SPI clocks in a byte whether or not the display has one to send, so bytes equal to 'IDLE_BYTES'
+        are taken for an idle line and read again until 'count' others arrived or 'timeout' seconds
+        passed. A response byte of 00H or FFH cannot be told from an idle line and is not returned."""
+        received: List[int] = []
+        deadline = time.monotonic() + timeout
+        while True:
+            received += (
+                b
+                for b in self.spi.readbytes(count - len(received))
+                if b not in IDLE_BYTES
+            )
+            if len(received) >= count or time.monotonic() >= deadline:
+                return received
+            time.sleep(RESPONSE_POLL_INTERVAL)
+
+
+class GU600CommsRecorder(GU600Comms):
+    """Record all bytes written instead of sending them anywhere."""
+
+    def __init__(self) -> None:
+        self.data = bytearray()
+        self.writes = 0
+
+    def write(self, message: Message) -> bool:
+        self.data += as_buffer(message)
+        self.writes += 1
+        return True
+
+    def read(self, count: int, timeout: float = 0.0) -> List[int]:
+        return []
+
+    def clear(self) -> None:
+        self.data.clear()
+        self.writes = 0
+
+
+class GU600CommsBatch(GU600Comms):
+    """Gather messages into a single buffer and pass them on to another communications channel in as few
+    transfers as possible, each at most 'max_transfer_size' bytes long."""
+
+    def __init__(
+        self, comms_link: GU600Comms, max_transfer_size: int = MAX_TRANSFER_SIZE
+    ) -> None:
+        assert max_transfer_size > 0
+        self._comms_link = comms_link
+        self._max_transfer_size = max_transfer_size
+        self._buffer = bytearray(max_transfer_size)
+        self._size = 0
+
+    @property
+    def comms_link(self) -> GU600Comms:
+        return self._comms_link
+
+    @property
+    def pending(self) -> int:
+        """Number of bytes gathered but not yet flushed."""
+        return self._size
+
+    def write(self, message: Message) -> bool:
+        data = as_buffer(message)
+        end = self._size + len(data)
+        if end > len(self._buffer):
+            self._buffer.extend(bytes(end - len(self._buffer)))
+        self._buffer[self._size : end] = data
+        self._size = end
+        return True
+
+    def read(self, count: int, timeout: float = 0.0) -> List[int]:
+        self.flush()
+        return self._comms_link.read(count, timeout)
+
+    def xfer(self, message: Message, count: int, timeout: float = 0.0) -> List[int]:
+        self.flush()
+        return self._comms_link.xfer(message, count, timeout)
+
+    def flush(self) -> bool:
+        """Pass all gathered bytes on to the underlying channel."""
+        result = True
+        with memoryview(self._buffer) as view:
+            for start in range(0, self._size, self._max_transfer_size):
+                end = min(start + self._max_transfer_size, self._size)
+                with view[start:end] as chunk:
+                    result &= self._comms_link.write(chunk)
+        self._size = 0
+        return result
+
 
 class GU600CommsI2C(GU600Comms):
     def __init__(self) -> None:
         pass
 
-    def write(self, message: List[int]) -> bool:
+    def write(self, message: Message) -> bool:
+        pass
+
+    def read(self, count: int, timeout: float = 0.0) -> List[int]:
         pass
 
 
@@ -41,5 +180,8 @@ class GU600CommsRS232(GU600Comms):
     def __init__(self, port: str, baud: int) -> None:
         pass
 
-    def write(self, message: List[int]) -> bool:
+    def write(self, message: Message) -> bool:
+        pass
+
+    def read(self, count: int, timeout: float = 0.0) -> List[int]:
         pass
@@ -0,0 +1,77 @@
+from typing import List
+
+import numpy as np
+
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_framebuffer import GU600FrameBuffer, Rectangle, dirty_rectangles
+from noritake.gu600_planner import apply, plan
+from noritake.gu600_stream import write_image
+
+WINDOWS = 2
+
+
+class GU600DoubleBuffer(GU600FrameBuffer):
+    """Frame buffer that draws each frame into the hidden one of the two hardware windows and then makes
+    it visible with 'show_window', so a frame never shows half drawn. Both windows cover the entire
+    display and each holds its own underlying data, the window shown last being on top. A shadow of
+    every window is kept, so 'flush' only sends what changed since the hidden window was last drawn,
+    which is the frame before the one on display, using 'gu600_planner.plan'."""
+
+    def __init__(self, driver: GU600Driver) -> None:
+        super().__init__(driver)
+        self._shadows = [np.zeros_like(self._buffer) for _ in range(WINDOWS)]
+        self._valid_windows = [False] * WINDOWS
+        self._defined = False
+        # Index of the window on display, window 1 is index 0.
+        self._front = 1
+
+    @property
+    def front(self) -> int:
+        """Number of the window on display."""
+        return self._front + 1
+
+    def invalidate(self) -> None:
+        """Forget what both windows hold, the next two flushes will send the entire frame."""
+        super().invalidate()
+        self._valid_windows = [False] * WINDOWS
+        self._defined = False
+
+    def dirty_rectangles(self) -> List[Rectangle]:
+        """Return the pixel rectangles that differ between the frame and the hidden window."""
+        back = 1 - self._front
+        if not self._valid_windows[back]:
+            return [(0, 0, self._width - 1, self._height - 1)]
+        return [
+            self._to_pixels(r)
+            for r in dirty_rectangles(self._shadows[back], self._buffer)
+        ]
+
+    def flush(self) -> bool:
+        """Draw the frame into the hidden window and show it."""
+        result = True
+        if not self._defined:
+            for window in range(WINDOWS):
+                result &= self._select(window)
+                result &= self._driver.define_window(
+                    0, 0, self._width - 1, self._height - 1
+                )
+            self._defined = True
+        back = 1 - self._front
+        result &= self._select(back)
+        if self._valid_windows[back]:
+            previous = np.unpackbits(self._shadows[back], axis=1)[:, : self._width]
+            result &= apply(self._driver, plan(previous.astype(bool), self.pixels))
+        else:
+            result &= write_image(self._driver, 0, 0, self.pixels)
+        result &= self._driver.show_window()
+        self._shadows[back][:] = self._buffer
+        self._valid_windows[back] = True
+        self._shadow[:] = self._buffer
+        self._valid = True
+        self._front = back
+        return result
+
+    def _select(self, window: int) -> bool:
+        if window == 0:
+            return self._driver.select_window1()
+        return self._driver.select_window2()
@@ -1,78 +1,162 @@
-from typing import List
-
-from noritake.gu600_comms import GU600Comms
+import threading
+from contextlib import contextmanager
+from typing import Iterator, List, Optional, Tuple
+
+from noritake import gu600_encoder as enc
+from noritake.gu600_comms import (
+    MAX_TRANSFER_SIZE,
+    RESPONSE_TIMEOUT,
+    GU600Comms,
+    GU600CommsBatch,
+    Message,
+    as_buffer,
+)
 from noritake.gu600_config import GU600Config
 from noritake.gu600_enums import *
+from noritake.gu600_fonts import FONTS, GU600Font, decode_extended_font
 
 PACKET_HEADER = 0x02
 PACKET_FOOTER = 0x03
 VFDACK = 0x50
 MAX_MESSAGE_SIZE = 256
 BRIGHTNESS_LEVELS = 8
+MAX_GRAPHIC_SIZE = 0xFF
+# Character introducing two hexadecimal digits in hex receive mode.
+HEX_PREFIX = 0x60
 
 
 class GU600Driver:
+    """Encode commands for a GU600 display. The driver keeps track of the write mode, font, selected
+    window, brightness, hex mode and cursor position it has set, and leaves out commands that would not
+    change any of them; 'bytes_saved' counts the bytes left out. Anything not known for sure, such as
+    the cursor after an area command, is forgotten, and so is everything after 'reset', a macro or a raw
+    'write'. Call 'invalidate' if something else may have changed the display state. The link is used
+    with 'lock' held, which other threads sharing the link take as well."""
+
     def __init__(self, comms_link: GU600Comms, config: GU600Config) -> None:
         self._comms_link = comms_link
+        self._lock = threading.RLock()
+        self._message = bytearray(MAX_MESSAGE_SIZE)
         self._config = config
+        self._bytes_saved = 0
+        self.invalidate()
 
     @property
     def config(self) -> GU600Config:
         return self._config
 
-    def write(self, message: List[int]) -> bool:
-        """Write a sequence of words to device."""
-        return self._comms_link.write(message)
+    @property
+    def comms_link(self) -> GU600Comms:
+        return self._comms_link
+
+    @property
+    def lock(self) -> threading.RLock:
+        """Held while the driver writes to or reads from its link, and while it swaps in and flushes a
+        batch."""
+        return self._lock
+
+    @property
+    def bytes_saved(self) -> int:
+        """Number of bytes left out as the display was in the requested state already."""
+        return self._bytes_saved
+
+    def invalidate(self) -> None:
+        """Forget the display state, the next commands are all sent."""
+        self._write_mode: Optional[bytes] = None
+        self._font_command: Optional[bytes] = None
+        self._font: Optional[GU600Font] = None
+        self._window: Optional[int] = None
+        self._brightness: Optional[int] = None
+        self._hex_mode: Optional[bool] = None
+        self._cursor: Optional[Tuple[int, int]] = None
+
+    def write(self, message: Message) -> bool:
+        """Write a sequence of words to device. The display state is forgotten, as the driver cannot tell
+        what they change."""
+        self.invalidate()
+        return self._send(message)
+
+    @contextmanager
+    def batch(
+        self, max_transfer_size: int = MAX_TRANSFER_SIZE
+    ) -> Iterator[GU600CommsBatch]:
+        """Gather all commands issued within the context and send them when leaving it, split into
+        transfers of at most 'max_transfer_size' bytes. The bytes sent are the same as without batching.
+        Nested batches are merged into the outermost one."""
+        if isinstance(self._comms_link, GU600CommsBatch):
+            yield self._comms_link
+            return
+        with self._lock:
+            link = GU600CommsBatch(self._comms_link, max_transfer_size)
+            self._comms_link = link
+        try:
+            yield link
+        finally:
+            with self._lock:
+                self._comms_link = link.comms_link
+                link.flush()
 
     def send_dummy_byte(self) -> bool:
         """Send a dummy byte."""
-        return self.write([0x00])
+        return self._send(enc.DUMMY_BYTE)
 
     def send_macro_start(self, marcoNumber: int) -> bool:
         """Start user defined macro 1-7."""
-        return self.write([self._minmax(0, marcoNumber, 7)])
+        self.invalidate()
+        return self._send(enc.MACRO_START[self._minmax(0, marcoNumber, 7)])
 
     def send_backspace(self) -> bool:
         """Non destructive backspace. The cursor is moved left by the width of the currently select font. If
         the cursor is at the left end of the display, no cursor movement is made."""
-        return self.write([0x08])
+        self._cursor = None
+        return self._send(enc.BACKSPACE)
 
     def move_curser_horizontal_tab(self) -> bool:
         """Cursor is moved right by the width of the currently select font. If the cursor is at the end of the
         display, no cursor movement is made."""
-        return self.write([0x09])
+        self._cursor = None
+        return self._send(enc.HORIZONTAL_TAB)
 
     def move_curser_line_feed(self) -> bool:
         """Moves the cursor down by the height of the currently selected font. If the cursor is at the bottom
         of the display, no cursor movement is made."""
-        return self.write([0x0A])
+        self._cursor = None
+        return self._send(enc.LINE_FEED)
 
     def move_curser_home(self) -> bool:
         """Moves the cursor horizontal position to 00H, the vertical positioning is dependent on the currently
         selected font, allowing for immediate character writing in the top-left corner of the display."""
-        return self.write([0x0B])
+        self._cursor = None
+        return self._send(enc.HOME)
 
     def move_curser_vertical_tab(self) -> bool:
         """Moves the cursor up one character row. If the cursor is at the top of the top end of the display, no
         cursor movement is made."""
-        return self.write([0x0C])
+        self._cursor = None
+        return self._send(enc.VERTICAL_TAB)
 
     def move_curser_carriage_return(self) -> bool:
         """Moves the cursor horizontal position to 00H. The vertical position is unchanged."""
-        return self.write([0x0D])
+        self._cursor = None if self._cursor is None else (0, self._cursor[1])
+        return self._send(enc.CARRIAGE_RETURN)
 
     def clear_EOL(self) -> bool:
         """Clear all characters from the current cursor position to the end of the display."""
-        return self.write([0x0E])
+        self._cursor = None
+        return self._send(enc.CLEAR_EOL)
 
     def send_test(self) -> bool:
         """Place module into self-test mode. The module will repetitively show a few test screens. The test
         mode will stop on the next received byte."""
-        return self.write([0x0F])
+        self.invalidate()
+        return self._send(enc.TEST)
 
     def set_cursor_position(self, x: int, y: int) -> bool:
         """Sets the cursor position."""
-        return self.write([0x10, x, y])
+        if self._cursor == (x, y):
+            return self._skip(3)
+        self._cursor = (x, y)
+        return self._send(bytes((0x10, x, y)))
 
     def set_area(self, left: int, top: int, right: int, bottom: int) -> bool:
         """Fill specified area. All dots within the specified area are illuminated. Please note that the cursor
@@ -105,22 +189,28 @@ class GU600Driver:
 
     def set_pixel(self) -> bool:
         """Illuminate a single pixel at the current cursor position."""
-        return self.write([0x16])
+        return self._send(enc.SET_PIXEL)
 
     def clear_pixel(self) -> bool:
         """Clear a single pixel at the current cursor position."""
-        return self.write([0x17])
+        return self._send(enc.CLEAR_PIXEL)
 
-    def write_graphic(self, data: List[int]) -> bool:
+    def write_graphic(self, data: Message) -> bool:
         """Write graphical data, length, direct to display. See write mode command (1AH) for graphic
-        orientation and cursor movements."""
-        message: List[int] = [0x18, len(data)]
-        message.extend(data)
-        return self.write(message)
+        orientation and cursor movements. Raises ValueError for more than 255 bytes, the length does not
+        fit its single byte; 'gu600_stream' splits larger images."""
+        payload = as_buffer(data)
+        if len(payload) > MAX_GRAPHIC_SIZE:
+            raise ValueError(
+                f"Graphic data takes {len(payload)} bytes, at most {MAX_GRAPHIC_SIZE} are allowed."
+            )
+        self._cursor = None
+        return self._send_command([0x18, len(payload)], payload)
 
     def reset(self) -> bool:
         """Resets display to power-on defaults:"""
-        return self.write([0x19])
+        self.invalidate()
+        return self._send(enc.RESET)
 
     def set_write_mode(
         self,
@@ -133,67 +223,82 @@ class GU600Driver:
         """Set the write mode according to the
         'GraphicOrientation', 'CursorMovement',
         'CursorDirection', 'UnderScoreCursor', and 'PenType'."""
-        message: List[int] = [
-            0x1A,
-            (graphicOrientation << 7)
-            + (cursorMovement << 6)
-            + (cursorDirection << 5)
-            + (underScoreCursor << 3)
-            + penType,
-        ]
-        return self.write(message)
-
-    def set_macro(self, macroNumber: int, data: List[int]) -> bool:
+        command = enc.write_mode(
+            graphicOrientation,
+            cursorMovement,
+            cursorDirection,
+            underScoreCursor,
+            penType,
+        )
+        if command == self._write_mode:
+            return self._skip(len(command))
+        self._write_mode = command
+        return self._send(command)
+
+    def set_macro(self, macroNumber: int, data: Message) -> bool:
         """Send macro data to EEPROM. Macro Number = 00H - 07H. Macro 0 is executed at power-up
         only. A maximum of 472 bytes is allowed for macro data. The display may flicker whilst writing
         macro data."""
-        message: List[int] = [0x1B, self._minmax(0, macroNumber, 7), len(data)]
-        message.extend(data)
-        return self.write(message)
+        payload = as_buffer(data)
+        header = [0x1B, self._minmax(0, macroNumber, 7), len(payload)]
+        return self._send_command(header, payload)
 
     def set_brightness(self, brightness: int) -> bool:
         """Select one of the eight brightness levels ranging from F8H to FFH."""
-        message: List[int] = [
-            0x1B,
-            0xF8 + self._minmax(0, brightness, BRIGHTNESS_LEVELS - 1),
-        ]
-        return self.write(message)
+        brightness = self._minmax(0, brightness, BRIGHTNESS_LEVELS - 1)
+        if brightness == self._brightness:
+            return self._skip(len(enc.BRIGHTNESS[brightness]))
+        self._brightness = brightness
+        return self._send(enc.BRIGHTNESS[brightness])
 
     def erase_macros(self) -> bool:
         """Clear all downloaded macros in EEPROM. Screen may blank momentarily while macro data is
         being erased."""
-        return self.write([0x1B, 0x4D])
+        return self._send(enc.ERASE_MACROS)
 
     def lock_EEPROM(self) -> bool:
         """All data contained within the non-volatile EEPROM is locked (4CH), and no changes are possible
         until the unlock command (55H) is executed."""
-        return self.write([0x1B, 0x4C])
+        return self._send(enc.LOCK_EEPROM)
 
     def unlock_EEPROM(self) -> bool:
         """Unlock EEPROM to permit configuration data being sent."""
-        return self.write([0x1B, 0x55])
+        return self._send(enc.UNLOCK_EEPROM)
 
     def send_checksum(self) -> bool:
         """All data received is added to the checksum. This command will read the lower 8-bits of that
         checksum, before being cleared. Please note that the checksum is cleared when executing the
         test mode."""
-        return self.write([0x1B, 0x43])
+        return self._send(enc.CHECKSUM)
+
+    def query_checksum(self, timeout: float = RESPONSE_TIMEOUT) -> Optional[int]:
+        """Read and clear the checksum as 'send_checksum' does and return it, or None if the display did
+        not answer within 'timeout' seconds."""
+        with self._lock:
+            response = self._comms_link.xfer(enc.CHECKSUM, 1, timeout)
+        return response[0] if response else None
 
     def power_on(self) -> bool:
         """Turn on VFD power supply (default)."""
-        return self.write([0x1B, 0x50])
+        return self._send(enc.POWER_ON)
 
     def power_off(self) -> bool:
         """Turn off VFD power supply (The display’s contents will be preserved)."""
-        return self.write([0x1B, 0x46])
+        return self._send(enc.POWER_OFF)
 
     def set_hex_mode(self) -> bool:
         """Enable hex receive mode, character 60H is interpreted as a hexadecimal prefix."""
-        return self.write([0x1B, 0x48])
+        if self._hex_mode:
+            return self._skip(len(enc.HEX_MODE))
+        self._hex_mode = True
+        return self._send(enc.HEX_MODE)
 
     def set_binary_mMode(self) -> bool:
         """Disable hex receive mode."""
-        return self.write([0x1B, 0x42])
+        if self._hex_mode is False:
+            return self._skip(len(enc.BINARY_MODE))
+        self._hex_mode = False
+        return self._send(enc.BINARY_MODE)
 
     def set_serial_config(
         self,
@@ -205,109 +310,114 @@ class GU600Driver:
     ) -> bool:
         """Set Asynchronous Communications, this command takes affect at power-up or hardware reset, using
         'AutomaticSend', 'PacketMode', 'CommsBuffer', 'Parity', and 'BaudeRate'."""
-        message: List[int] = [
-            0x1B,
-            0x49,
-            (automaticSend << 7)
-            + (packetMode << 6)
-            + (commsBuffer << 5)
-            + (parity << 3)
-            + baudeRate,
-        ]
-        return self.write(message)
+        return self._send(
+            enc.serial_config(automaticSend, packetMode, commsBuffer, parity, baudeRate)
+        )
 
     def enable_IO_port(self, data: int) -> bool:
         """Set I/O port direction. A ‘1’ indicates an input, a ‘0’ an output. All output lines are immediately set
         low. All input lines have their pull-ups enabled. This value is stored in EEPROM and will
         automatically be set at power up."""
-        return self.write([0x1B, 0x44, data])
+        return self._send(bytes((0x1B, 0x44, data)))
 
     def set_port_lines(self, data: int) -> bool:
         """Set Output lines on I/O port, a ‘1’ will set 5V on the output ports, or enable the pull-ups on the
         inputs."""
-        return self.write([0x1B, 0x4F, data])
+        return self._send(bytes((0x1B, 0x4F, data)))
 
     def read_port(self) -> bool:
         """Read current I/O port status. A single byte is transmitted showing the current state of the I/O lines."""
-        return self.write([0x1B, 0x52])
+        return self._send(enc.READ_PORT)
+
+    def query_port(self, timeout: float = RESPONSE_TIMEOUT) -> Optional[int]:
+        """Read current I/O port status and return it, or None if the display did not answer within 'timeout'
+        seconds."""
+        with self._lock:
+            response = self._comms_link.xfer(enc.READ_PORT, 1, timeout)
+        return response[0] if response else None
 
     def enable_key_scanning(self) -> bool:
         """Set I/O port to key scanning. The I/O ports are continuously scanned for any key press. This
         mode is stored in EEPROM and will automatically be selected at power up."""
-        return self.write([0x1B, 0x4B])
+        return self._send(enc.KEY_SCANNING)
 
     def select_font(self, fontFace: FontFace) -> bool:
         "Select font according to specified enumerator 'FontFace'."
-        return self.write([fontFace])
+        command = bytes((fontFace,))
+        if command == self._font_command:
+            return self._skip(len(command))
+        self._font_command = command
+        self._font = FONTS.get(fontFace)
+        return self._send(command)
 
     def write_graphic_area(
-        self, left: int, top: int, right: int, bottom: int, data: List[int]
+        self, left: int, top: int, right: int, bottom: int, data: Message
     ) -> bool:
         """Write graphic data within defined area. See write mode command (1AH) for graphic orientation
         and cursor movements."""
-        message: List[int] = [0x1F, left, top, right, bottom]
-        message.extend(data)
-        return self.write(message)
+        self._cursor = None
+        return self._send_command([0x1F, left, top, right, bottom], data)
 
     def write_character(self, c: int) -> bool:
         """Display character from selected font."""
-        return self.write([self._minmax(0x20, c, 0xFF)])
+        command = enc.CHARACTERS[c if 0 <= c <= 0xFF else self._minmax(0x20, c, 0xFF)]
+        self._advance(command)
+        return self._send(command)
 
     def select_window1(self) -> bool:
         """Select window 1 so that window and area command functions operate on the underlying data or
         text scroll."""
-        return self.write([0x1B, 0x80])
+        return self._select_window(1, enc.SELECT_WINDOW1)
 
     def select_window2(self) -> bool:
         """Select window 2 so that window and area command functions operate on the underlying data."""
-        return self.write([0x1B, 0x81])
+        return self._select_window(2, enc.SELECT_WINDOW2)
 
     def define_window(self, left: int, top: int, right: int, bottom: int) -> bool:
         """Define window co-ordinates."""
-        return self.write([0x1B, 0x82, left, top, right, bottom])
+        return self._send(bytes((0x1B, 0x82, left, top, right, bottom)))
 
     def set_window_mode(self, windowMode: WindowMode) -> bool:
         """Set window mode according to 'WindowMode'."""
-        return self.write([0x1B, 0x52, windowMode])
+        return self._send(bytes((0x1B, 0x83, windowMode)))
 
     def show_window(self) -> bool:
         """Make selected window visible."""
-        return self.write([0x1B, 0x84])
+        return self._send(enc.SHOW_WINDOW)
 
     def kill_window(self) -> bool:
         """Destroy selected window. Any scroll, flash and wipe effects will be stopped."""
-        return self.write([0x1B, 0x85])
+        return self._send(enc.KILL_WINDOW)
 
     def flash_window(self, number: int) -> bool:
         """Flash selected window’s underlying data. Flash type depends on window’s write mode.
         Number = number of flashes.
         FFH = infinite.
         00H = stop flashing."""
-        return self.write([0x1B, 0x86, number])
+        return self._send(bytes((0x1B, 0x86, number)))
 
     def set_window_flash_speed(self, flashOn: FlashTime, flashOff: FlashTime) -> bool:
         """Set flash rate of selected window according to 'FlashTime'."""
-        return self.write([0x1B, 0x87, (flashOn << 4) + flashOff])
+        return self._send(enc.window_flash_speed(flashOn, flashOff))
 
     def set_window_wipe_effect(self, wipeEffect: WipeEffect) -> bool:
         """Perform a wipe action on the selected window’s underlying data using 'WipeEffect'."""
-        return self.write([0x1B, 0x88, wipeEffect])
+        return self._send(bytes((0x1B, 0x88, wipeEffect)))
 
     def set_window_wipe_speed(self, wipeSpeed: WipeSpeed) -> bool:
         """Set the wipe effect speed (pixels per second) for the selected window using 'WipeSpeed'."""
-        return self.write([0x1B, 0x89, wipeSpeed])
+        return self._send(bytes((0x1B, 0x89, wipeSpeed)))
 
     def select_window_pattern(self, patternType: PatternType) -> bool:
         """Select pre-defined pattern (00H-0FH) for window according to 'PatternType'."""
-        return self.write([0x1B, 0x8D, patternType])
+        return self._send(bytes((0x1B, 0x8D, patternType)))
 
-    def set_window_pattern_data(self, pattern: List[int]) -> bool:
+    def set_window_pattern_data(self, pattern: Message) -> bool:
         """A user 16x16 pixel pattern (32 bytes) can be defined for the selected window.
         All data should be in vertical format with D7 uppermost."""
-        assert len(pattern) == 32
-        message: List[int] = [0x1F, 0x8E]
-        message.extend(pattern)
-        return self.write(message)
+        payload = as_buffer(pattern)
+        assert len(payload) == 32
+        return self._send_command([0x1B, 0x8E], payload)
 
     def set_window_pattern_option(
         self,
@@ -318,16 +428,11 @@ class GU600Driver:
     ) -> bool:
         """Set window pattern options using:
         'InvertPattern', 'PatternAlignment', 'PatternAlignV', and 'PatternAlignH'."""
-
-        message: List[int] = [
-            0x1B,
-            0x8F,
-            (invertPattern << 3)
-            + (patternAlignment << 2)
-            + (patternAlignV << 1)
-            + patternAlignH,
-        ]
-        return self.write(message)
+        return self._send(
+            enc.window_pattern_option(
+                invertPattern, patternAlignment, patternAlignV, patternAlignH
+            )
+        )
 
     def set_scroll_text_in_window(
         self,
@@ -335,23 +440,17 @@ class GU600Driver:
         scrollContents: ScrollContents,
         scrollDirection: ScrollDirection,
         number: int,
-        text: List[int],
+        text: Message,
     ) -> bool:
         """Scroll text data within area defined by window 1 using
         'PadEndOfText', 'ScrollContents', and 'ScrollDirection'.
         Text to be scrolled with 00H signalling end of text."""
-        message: List[int] = [
-            0x1B,
-            0x90,
-            (padEndOfText << 5) + (scrollContents << 4) + scrollDirection,
-            number,
-        ]
-        message.extend(text)
-        return self.write(message)
+        mode = enc.scroll_text_mode(padEndOfText, scrollContents, scrollDirection)
+        return self._send_command([0x1B, 0x90, mode, number], text)
 
     def set_scroll_speed(self, scrollSpeed: ScrollSpeed) -> bool:
         """Set window 1 scroll speed (pixels per second) using 'ScrollSpeed'."""
-        return self.write([0x1B, 0x91, scrollSpeed])
+        return self._send(bytes((0x1B, 0x91, scrollSpeed)))
 
     def select_extended_font(
         self,
@@ -360,30 +459,87 @@ class GU600Driver:
         fontSpace: FontSpace,
     ) -> bool:
         """Select extended font defined by 'ExtendedFontFace', 'FontProportion', and 'FontSpace'."""
-        message: List[int] = [
-            0x1B,
-            0x98,
-            (fontSpace << 4) + (fontProportion << 3) + extendedFontFace,
-        ]
-        return self.write(message)
+        command = enc.extended_font(extendedFontFace, fontProportion, fontSpace)
+        if command == self._font_command:
+            return self._skip(len(command))
+        self._font_command = command
+        try:
+            self._font = decode_extended_font(command[2])
+        except (KeyError, ValueError):
+            self._font = None
+        return self._send(command)
 
     def draw_line(self, x: int, y: int) -> bool:
         """Draws line from current cursor position to specified x, y. Cursor position is updated to x, y."""
-        return self.write([0x1B, 0x9A, x, y])
+        self._cursor = (x, y)
+        return self._send(bytes((0x1B, 0x9A, x, y)))
 
     def set_auto_fade(self, luminance: Luminance, fadeSpeed: FadeSpeed) -> bool:
         """Perform automatic fade to a defined level using 'Luminance' and 'FadeSpeed'."""
-        return self.write([0x1B, 0x9C, luminance + (fadeSpeed << 4)])
+        self._brightness = None
+        return self._send(enc.auto_fade(luminance, fadeSpeed))
 
     def set_command_delay(self, delay: int) -> bool:
         """Delay any pending commands by 'delay' in multiple of 10ms delay period."""
-        return self.write([0x1B, 0x9F, delay])
+        return self._send(bytes((0x1B, 0x9F, delay)))
 
     def write_text(self, x: int, y: int, text: str) -> bool:
         """Set the test at cursor position defined by x & y."""
-        message: List[int] = [0x10, x, y]
-        message.extend([ord(c) for c in text])
-        return self.write(message)
+        data = enc.encode_text(text)
+        if self._cursor == (x, y):
+            self._skip(3)
+            result = self._send(data) if data else True
+        else:
+            self._cursor = (x, y)
+            result = self._send_command([0x10, x, y], data)
+        self._advance(data)
+        return result
+
+    def _send_command(self, header: List[int], data: Message) -> bool:
+        """Send a command header and its payload as a single message, composed in a buffer kept for
+        reuse, as links copy what they keep."""
+        payload = as_buffer(data)
+        size = len(header) + len(payload)
+        with self._lock:
+            if size > len(self._message):
+                self._message = bytearray(size)
+            self._message[: len(header)] = header
+            self._message[len(header) : size] = payload
+            return self._comms_link.write(memoryview(self._message)[:size])
+
+    def _send(self, message: Message) -> bool:
+        with self._lock:
+            return self._comms_link.write(message)
+
+    def _skip(self, size: int) -> bool:
+        self._bytes_saved += size
+        return True
+
+    def _select_window(self, window: int, command: bytes) -> bool:
+        if window == self._window:
+            return self._skip(len(command))
+        self._window = window
+        return self._send(command)
+
+    def _advance(self, text: bytes) -> None:
+        """Move the cursor past 'text'; it is forgotten unless font and write mode are known and the
+        cursor moves horizontally forward, and if it reaches the right edge. Glyph widths of proportional
+        fonts are not known, only fixed spaced fonts are followed. Unless hex mode is known to be off, text
+        containing the hex prefix (60H) may draw fewer characters than it has bytes, and is not followed."""
+        if self._cursor is None:
+            return
+        if (
+            self._font is None
+            or self._font.proportional
+            or (self._hex_mode is not False and HEX_PREFIX in text)
+            or self._write_mode is None
+            or (self._write_mode[1] >> 6) & 0x01 != CursorMovement.MOVEMENT_HORIZONTAL
+            or (self._write_mode[1] >> 5) & 0x01 != CursorDirection.DIRECTION_FORWARD
+        ):
+            self._cursor = None
+            return
+        x = self._cursor[0] + self._font.text_width(text.decode("latin-1"))
+        self._cursor = (x, self._cursor[1]) if x < self._config.width else None
 
     def _minmax(self, minumum: int, value: int, maximum: int) -> int:
         return min(max(minumum, value), maximum)
@@ -391,4 +547,5 @@ class GU600Driver:
     def _send_area_command(
         self, command: int, left: int, top: int, right: int, bottom: int
     ) -> bool:
-        return self.write([command, left, top, right, bottom])
+        self._cursor = None
+        return self._send(bytes((command, left, top, right, bottom)))
@@ -0,0 +1,397 @@
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from noritake.gu600_comms import BRIGHTNESS_LEVELS, GU600Comms, Message, as_buffer
+from noritake.gu600_config import GU600Config
+from noritake.gu600_enums import *
+from noritake.gu600_fonts import DEFAULT_FONT, FONTS, GU600Font, decode_extended_font
+
+# Number of argument bytes following an escape (1BH) sub-command, where fixed.
+ESCAPE_ARGUMENTS: Dict[int, int] = {
+    0x44: 1,
+    0x49: 1,
+    0x4F: 1,
+    0x82: 4,
+    0x83: 1,
+    0x86: 1,
+    0x87: 1,
+    0x88: 1,
+    0x89: 1,
+    0x8D: 1,
+    0x8E: 32,
+    0x8F: 1,
+    0x91: 1,
+    0x98: 1,
+    0x9A: 2,
+    0x9C: 1,
+    0x9F: 1,
+}
+
+
+def line_points(x0: int, y0: int, x1: int, y1: int) -> Tuple[np.ndarray, np.ndarray]:
+    """Return the x and y coordinates of the pixels of a line from x0, y0 to x1, y1 (Bresenham)."""
+    xs: List[int] = []
+    ys: List[int] = []
+    dx, dy = abs(x1 - x0), -abs(y1 - y0)
+    sx, sy = (1 if x0 < x1 else -1), (1 if y0 < y1 else -1)
+    error = dx + dy
+    while True:
+        xs.append(x0)
+        ys.append(y0)
+        if x0 == x1 and y0 == y1:
+            break
+        twice = 2 * error
+        if twice >= dy:
+            error += dy
+            x0 += sx
+        if twice <= dx:
+            error += dx
+            y0 += sy
+    return np.array(xs), np.array(ys)
+
+
+def unpack_area(
+    data: bytes, width: int, height: int, orientation: GraphicOrientation
+) -> np.ndarray:
+    """Unpack the data of a graphic area command (1FH) into a boolean array of shape (height, width). In
+    horizontal orientation each row takes (width + 7) // 8 bytes with D7 leftmost; in vertical orientation
+    each band of 8 rows takes 'width' bytes with D7 uppermost."""
+    raw = np.frombuffer(data, dtype=np.uint8)
+    if orientation == GraphicOrientation.ORIENTATION_HORIZONTAL:
+        bits = np.unpackbits(raw.reshape(height, -1), axis=1)
+        return bits[:, :width].astype(bool)
+    bits = np.unpackbits(raw.reshape(-1, 1, width), axis=1)
+    return bits.reshape(-1, width)[:height].astype(bool)
+
+
+def area_size(width: int, height: int, orientation: GraphicOrientation) -> int:
+    """Number of data bytes of a graphic area command (1FH) for an area of width x height pixels."""
+    if orientation == GraphicOrientation.ORIENTATION_HORIZONTAL:
+        return height * ((width + 7) // 8)
+    return width * ((height + 7) // 8)
+
+
+def command_size(
+    buffer: Union[bytes, bytearray], position: int, orientation: GraphicOrientation
+) -> Optional[int]:
+    """Return the size of the command starting at 'position' in 'buffer', or None if not yet known. The
+    size of a graphic area command (1FH) depends on the graphic orientation in effect."""
+    available = len(buffer) - position
+    code = buffer[position]
+    if code == 0x10:
+        return 3
+    if 0x11 <= code <= 0x15:
+        return 5
+    if code == 0x18:
+        return 2 + buffer[position + 1] if available >= 2 else None
+    if code == 0x1A:
+        return 2
+    if code == 0x1F:
+        if available < 5:
+            return None
+        left, top, right, bottom = buffer[position + 1 : position + 5]
+        width, height = right - left + 1, bottom - top + 1
+        return 5 + area_size(max(width, 0), max(height, 0), orientation)
+    if code != 0x1B:
+        return 1
+    if available < 2:
+        return None
+    escape = buffer[position + 1]
+    if escape <= 0x07:
+        return 3 + buffer[position + 2] if available >= 3 else None
+    if escape == 0x90:
+        end = buffer.find(0x00, position + 4)
+        return end - position + 1 if end >= 0 else None
+    return 2 + ESCAPE_ARGUMENTS.get(escape, 0)
+
+
+class GU600CommandSplitter:
+    """Split a command stream written in pieces into whole commands. The incomplete command a piece
+    ends with is kept and completed by the next one, and the graphic orientation the size of graphic
+    commands depends on is followed."""
+
+    def __init__(self) -> None:
+        self._pending = bytearray()
+        self._orientation = GraphicOrientation.ORIENTATION_HORIZONTAL
+
+    @property
+    def pending(self) -> int:
+        """Number of bytes of the incomplete command kept."""
+        return len(self._pending)
+
+    def split(self, data: Message) -> List[bytes]:
+        """Return the commands completed by 'data'."""
+        buffer = self._pending + as_buffer(data)
+        commands = []
+        position = 0
+        while position < len(buffer):
+            size = command_size(buffer, position, self._orientation)
+            if size is None or position + size > len(buffer):
+                break
+            command = bytes(buffer[position : position + size])
+            position += size
+            if command[0] == 0x1A:
+                self._orientation = GraphicOrientation(command[1] >> 7)
+            elif command[0] == 0x19:
+                self._orientation = GraphicOrientation.ORIENTATION_HORIZONTAL
+            commands.append(command)
+        del buffer[:position]
+        self._pending = buffer
+        return commands
+
+
+class GU600CommsEmulator(GU600Comms):
+    """Software model of a GU600 module that interprets the command stream written to it and renders into
+    a boolean pixel array. Commands may be split across writes. Window effects (flash, wipe, scroll,
+    patterns) are recorded but not rendered, and hex receive mode is not interpreted. Responses to
+    'send_checksum' and 'read_port', and key presses, can be read back with 'read'."""
+
+    def __init__(self, config: GU600Config) -> None:
+        self._config = config
+        self._pixels = np.zeros((config.height, config.width), dtype=bool)
+        self._pending = bytearray()
+        self._responses: List[int] = []
+        self._macros: Dict[int, bytes] = {}
+        self.port = 0xFF
+        self.checksum = 0
+        self.commands = 0
+        self.reset()
+
+    @property
+    def config(self) -> GU600Config:
+        return self._config
+
+    @property
+    def pixels(self) -> np.ndarray:
+        """The display contents as boolean array of shape (height, width)."""
+        return self._pixels
+
+    @property
+    def cursor(self) -> Tuple[int, int]:
+        return self.x, self.y
+
+    @property
+    def font(self) -> GU600Font:
+        return self._font
+
+    def reset(self) -> None:
+        """Return to power-on defaults and clear the display."""
+        self._pixels[:] = False
+        self.x, self.y = 0, 0
+        self.orientation = GraphicOrientation.ORIENTATION_HORIZONTAL
+        self.movement = CursorMovement.MOVEMENT_HORIZONTAL
+        self.direction = CursorDirection.DIRECTION_FORWARD
+        self.pen = PenType.PENTYPE_OVER
+        self.brightness = BRIGHTNESS_LEVELS - 1
+        self.power = True
+        self.hex_mode = False
+        self.key_scanning = False
+        self.window = 1
+        self.windows: Dict[int, Tuple[int, int, int, int]] = {}
+        self.visible_windows: Dict[int, bool] = {1: False, 2: False}
+        self.scroll_text: bytes = b""
+        self._font = DEFAULT_FONT
+
+    def write(self, message: Message) -> bool:
+        self._pending += as_buffer(message)
+        del self._pending[: self._run(self._pending)]
+        return True
+
+    def read(self, count: int, timeout: float = 0.0) -> List[int]:
+        response, self._responses = self._responses[:count], self._responses[count:]
+        return response
+
+    def press_key(self, key: int) -> None:
+        """Simulate a key press, the key code is sent if key scanning is enabled."""
+        if self.key_scanning:
+            self._responses.append(key)
+
+    def _run(self, buffer: bytearray) -> int:
+        """Execute all complete commands in 'buffer' and return the number of bytes consumed."""
+        position = 0
+        while position < len(buffer):
+            size = command_size(buffer, position, self.orientation)
+            if size is None or position + size > len(buffer):
+                break
+            command = bytes(buffer[position : position + size])
+            position += size
+            self.checksum = (self.checksum + sum(command)) & 0xFF
+            self._execute(command)
+        return position
+
+    def _execute(self, command: bytes) -> None:
+        self.commands += 1
+        code = command[0]
+        if 0x01 <= code <= 0x07:
+            self._run(bytearray(self._macros.get(code, b"")))
+        elif code in (0x08, 0x09, 0x0A, 0x0B, 0x0C, 0x0D):
+            self._move_cursor(code)
+        elif code == 0x0E:
+            top = max(self.y - self._font.height + 1, 0)
+            self._pixels[top : self.y + 1, self.x :] = False
+            self._pixels[self.y + 1 :, :] = False
+        elif code == 0x0F:
+            self.checksum = 0
+        elif code == 0x10:
+            self.x, self.y = command[1], command[2]
+        elif 0x11 <= code <= 0x15:
+            self._area(code, *command[1:5])
+        elif code in (0x16, 0x17):
+            if 0 <= self.x < self._config.width and 0 <= self.y < self._config.height:
+                self._pixels[self.y, self.x] = code == 0x16
+        elif code == 0x18:
+            self._graphic(command[2:])
+        elif code == 0x19:
+            self.reset()
+        elif code == 0x1A:
+            mode = command[1]
+            self.orientation = GraphicOrientation(mode >> 7)
+            self.movement = CursorMovement((mode >> 6) & 0x01)
+            self.direction = CursorDirection((mode >> 5) & 0x01)
+            self.pen = PenType(mode & 0x03)
+        elif code == 0x1B:
+            self._escape(command[1], command[2:])
+        elif code in FONTS.keys():
+            self._font = FONTS[FontFace(code)]
+        elif code == 0x1F:
+            left, top, right, bottom = command[1:5]
+            width, height = right - left + 1, bottom - top + 1
+            if width > 0 and height > 0:
+                bits = unpack_area(command[5:], width, height, self.orientation)
+                self._draw(left, top, bits)
+            self.x, self.y = left, top
+        elif code >= 0x20:
+            self._character(code)
+
+    def _escape(self, escape: int, arguments: bytes) -> None:
+        if escape <= 0x07:
+            self._macros[escape] = arguments[1:]
+        elif escape >= 0xF8:
+            self.brightness = escape - 0xF8
+        elif escape == 0x43:
+            self._responses.append(self.checksum)
+            self.checksum = 0
+        elif escape == 0x4D:
+            self._macros.clear()
+        elif escape in (0x50, 0x46):
+            self.power = escape == 0x50
+        elif escape in (0x48, 0x42):
+            self.hex_mode = escape == 0x48
+        elif escape == 0x4B:
+            self.key_scanning = True
+        elif escape == 0x4F:
+            self.port = arguments[0]
+        elif escape == 0x52:
+            self._responses.append(self.port)
+        elif escape in (0x80, 0x81):
+            self.window = escape - 0x7F
+        elif escape == 0x82:
+            left, top, right, bottom = arguments
+            self.windows[self.window] = (left, top, right, bottom)
+        elif escape in (0x84, 0x85):
+            self.visible_windows[self.window] = escape == 0x84
+        elif escape == 0x90:
+            self.scroll_text = arguments[2:-1]
+        elif escape == 0x98:
+            try:
+                self._font = decode_extended_font(arguments[0])
+            except (KeyError, ValueError):
+                pass
+        elif escape == 0x9A:
+            xs, ys = line_points(self.x, self.y, arguments[0], arguments[1])
+            inside = (
+                (0 <= xs)
+                & (xs < self._config.width)
+                & (0 <= ys)
+                & (ys < self._config.height)
+            )
+            self._pixels[ys[inside], xs[inside]] = True
+            self.x, self.y = arguments[0], arguments[1]
+        elif escape == 0x9C:
+            self.brightness = arguments[0] & 0x07
+
+    def _move_cursor(self, code: int) -> None:
+        advance, height = self._font.advance(0x20), self._font.height
+        if code == 0x08 and self.x >= advance:
+            self.x -= advance
+        elif code == 0x09 and self.x + 2 * advance <= self._config.width:
+            self.x += advance
+        elif code == 0x0A and self.y + height < self._config.height:
+            self.y += height
+        elif code == 0x0B:
+            self.x, self.y = 0, height - 1
+        elif code == 0x0C and self.y >= height:
+            self.y -= height
+        elif code == 0x0D:
+            self.x = 0
+
+    def _area(self, code: int, left: int, top: int, right: int, bottom: int) -> None:
+        area = self._pixels[top : bottom + 1, left : right + 1]
+        if code == 0x11:
+            area[:] = True
+        elif code == 0x12:
+            area[:] = False
+        elif code == 0x13:
+            np.logical_not(area, out=area)
+        else:
+            on = code == 0x14
+            area[:1, :] = on
+            area[-1:, :] = on
+            area[:, :1] = on
+            area[:, -1:] = on
+        self.x, self.y = left, top
+
+    def _graphic(self, data: bytes) -> None:
+        raw = np.frombuffer(data, dtype=np.uint8)
+        count = len(raw)
+        if count == 0:
+            return
+        backwards = self.direction == CursorDirection.DIRECTION_BACKWARDS
+        if backwards:
+            raw = raw[::-1]
+        bits = np.unpackbits(raw[:, None], axis=1).astype(bool)
+        vertical = self.orientation == GraphicOrientation.ORIENTATION_VERTICAL
+        if self.movement == CursorMovement.MOVEMENT_HORIZONTAL:
+            block = bits.T if vertical else bits.reshape(1, -1)
+            step = 1 if vertical else 8
+            left = self.x - (count - 1) * step if backwards else self.x
+            self._draw(left, self.y, block)
+            self.x += -count * step if backwards else count * step
+        else:
+            block = bits.reshape(-1, 1) if vertical else bits
+            step = 8 if vertical else 1
+            top = self.y - (count - 1) * step if backwards else self.y
+            self._draw(self.x, top, block)
+            self.y += -count * step if backwards else count * step
+        self._clamp_cursor()
+
+    def _character(self, code: int) -> None:
+        glyph = self._font.glyph(code)
+        self._draw(self.x, self.y - glyph.shape[0] + 1, glyph)
+        self.x += glyph.shape[1]
+        self._clamp_cursor()
+
+    def _clamp_cursor(self) -> None:
+        """Keep the cursor between 0 and one past the last column and row, so drawing past an edge stays
+        off the display instead of wrapping to the other one."""
+        self.x = min(max(self.x, 0), self._config.width)
+        self.y = min(max(self.y, 0), self._config.height)
+
+    def _draw(self, x: int, y: int, bits: np.ndarray) -> None:
+        """Combine 'bits' with the display at x, y using the current pen type."""
+        height, width = self._pixels.shape
+        left, top = max(x, 0), max(y, 0)
+        right, bottom = min(x + bits.shape[1], width), min(y + bits.shape[0], height)
+        if right <= left or bottom <= top:
+            return
+        target = self._pixels[top:bottom, left:right]
+        source = bits[top - y : bottom - y, left - x : right - x]
+        if self.pen == PenType.PENTYPE_OVER:
+            target[:] = source
+        elif self.pen == PenType.PENTYPE_AND:
+            target &= source
+        elif self.pen == PenType.PENTYPE_OR:
+            target |= source
+        else:
+            target ^= source
@@ -0,0 +1,146 @@
+from functools import lru_cache
+from typing import Tuple
+
+from noritake.gu600_comms import BRIGHTNESS_LEVELS
+from noritake.gu600_enums import *
+
+# Commands without arguments.
+DUMMY_BYTE = b"\x00"
+BACKSPACE = b"\x08"
+HORIZONTAL_TAB = b"\x09"
+LINE_FEED = b"\x0a"
+HOME = b"\x0b"
+VERTICAL_TAB = b"\x0c"
+CARRIAGE_RETURN = b"\x0d"
+CLEAR_EOL = b"\x0e"
+TEST = b"\x0f"
+SET_PIXEL = b"\x16"
+CLEAR_PIXEL = b"\x17"
+RESET = b"\x19"
+ERASE_MACROS = b"\x1b\x4d"
+LOCK_EEPROM = b"\x1b\x4c"
+UNLOCK_EEPROM = b"\x1b\x55"
+CHECKSUM = b"\x1b\x43"
+POWER_ON = b"\x1b\x50"
+POWER_OFF = b"\x1b\x46"
+HEX_MODE = b"\x1b\x48"
+BINARY_MODE = b"\x1b\x42"
+READ_PORT = b"\x1b\x52"
+KEY_SCANNING = b"\x1b\x4b"
+SELECT_WINDOW1 = b"\x1b\x80"
+SELECT_WINDOW2 = b"\x1b\x81"
+SHOW_WINDOW = b"\x1b\x84"
+KILL_WINDOW = b"\x1b\x85"
+
+# Commands with a small, fixed set of arguments.
+MACRO_START: Tuple[bytes, ...] = tuple(bytes((n,)) for n in range(8))
+BRIGHTNESS: Tuple[bytes, ...] = tuple(
+    bytes((0x1B, 0xF8 + level)) for level in range(BRIGHTNESS_LEVELS)
+)
+CHARACTERS: Tuple[bytes, ...] = tuple(bytes((max(0x20, c),)) for c in range(256))
+
+# Maps every byte to itself, except control codes which become spaces, as 'write_character' does.
+TEXT_TABLE = bytes(max(0x20, c) for c in range(256))
+
+
+def encode_text(text: str) -> bytes:
+    """Encode text as Latin-1 for display; control characters become spaces, characters outside Latin-1
+    question marks."""
+    return text.encode("latin-1", "replace").translate(TEXT_TABLE)
+
+
+@lru_cache(maxsize=None)
+def write_mode(
+    graphicOrientation: GraphicOrientation,
+    cursorMovement: CursorMovement,
+    cursorDirection: CursorDirection,
+    underScoreCursor: UnderScoreCursor,
+    penType: PenType,
+) -> bytes:
+    """Encode a write mode command (1AH)."""
+    return bytes(
+        (
+            0x1A,
+            (graphicOrientation << 7)
+            + (cursorMovement << 6)
+            + (cursorDirection << 5)
+            + (underScoreCursor << 3)
+            + penType,
+        )
+    )
+
+
+@lru_cache(maxsize=None)
+def serial_config(
+    automaticSend: AutomaticSend,
+    packetMode: PacketMode,
+    commsBuffer: CommsBuffer,
+    parity: Parity,
+    baudeRate: BaudeRate,
+) -> bytes:
+    """Encode an asynchronous communications command (1BH 49H)."""
+    return bytes(
+        (
+            0x1B,
+            0x49,
+            (automaticSend << 7)
+            + (packetMode << 6)
+            + (commsBuffer << 5)
+            + (parity << 3)
+            + baudeRate,
+        )
+    )
+
+
+@lru_cache(maxsize=None)
+def window_pattern_option(
+    invertPattern: InvertPattern,
+    patternAlignment: PatternAlignment,
+    patternAlignV: PatternAlignV,
+    patternAlignH: PatternAlignH,
+) -> bytes:
+    """Encode a window pattern option command (1BH 8FH)."""
+    return bytes(
+        (
+            0x1B,
+            0x8F,
+            (invertPattern << 3)
+            + (patternAlignment << 2)
+            + (patternAlignV << 1)
+            + patternAlignH,
+        )
+    )
+
+
+@lru_cache(maxsize=None)
+def scroll_text_mode(
+    padEndOfText: PadEndOfText,
+    scrollContents: ScrollContents,
+    scrollDirection: ScrollDirection,
+) -> int:
+    """Encode the mode byte of a scroll text command (1BH 90H)."""
+    return (padEndOfText << 5) + (scrollContents << 4) + scrollDirection
+
+
+@lru_cache(maxsize=None)
+def extended_font(
+    extendedFontFace: ExtendedFontFace,
+    fontProportion: FontProportion,
+    fontSpace: FontSpace,
+) -> bytes:
+    """Encode an extended font command (1BH 98H)."""
+    return bytes(
+        (0x1B, 0x98, (fontSpace << 4) + (fontProportion << 3) + extendedFontFace)
+    )
+
+
+@lru_cache(maxsize=None)
+def window_flash_speed(flashOn: FlashTime, flashOff: FlashTime) -> bytes:
+    """Encode a window flash speed command (1BH 87H)."""
+    return bytes((0x1B, 0x87, (flashOn << 4) + flashOff))
+
+
+@lru_cache(maxsize=None)
+def auto_fade(luminance: Luminance, fadeSpeed: FadeSpeed) -> bytes:
+    """Encode an automatic fade command (1BH 9CH)."""
+    return bytes((0x1B, 0x9C, luminance + (fadeSpeed << 4)))
@@ -0,0 +1,198 @@
+import asyncio
+import queue
+import threading
+import time
+from enum import IntEnum
+from typing import AsyncIterator, Callable, Iterator, List, NamedTuple, Optional
+
+from noritake import gu600_encoder as enc
+from noritake.gu600_comms import IDLE_BYTES, RESPONSE_TIMEOUT, GU600CommsBatch
+from noritake.gu600_driver import GU600Driver
+
+# Polls every 5ms, well below the 20ms at which a key press starts to feel sluggish.
+POLL_INTERVAL = 0.005
+# Key codes read per poll at most.
+MAX_KEYS = 4
+
+
+class EventType(IntEnum):
+    """Kind of a 'GU600Event'."""
+
+    EVENT_KEY = 0
+    EVENT_PORT = 1
+
+
+class GU600Event(NamedTuple):
+    """A key press, with its key code, or a change of the I/O port lines, with their new state."""
+
+    type: EventType
+    value: int
+    time: float
+
+
+EventCallback = Callable[[GU600Event], None]
+
+
+class GU600EventSource:
+    """Poll a display for key presses and I/O port changes from a background thread. Key codes are read
+    once key scanning has been enabled ('enable_key_scanning'); the port is queried if 'port' is set,
+    and an event sent whenever its state changes. The thread sleeps between polls, so an event is seen
+    at most 'interval' seconds plus one transfer after it happened. Events are passed to callbacks, which
+    run on the polling thread, and can be consumed with a for loop or, from asyncio, with 'async for'.
+    Both loops end when the source is closed. Polls hold the driver's lock, so they never interleave
+    with commands sent from other threads, and go past a batch being gathered rather than flushing it."""
+
+    def __init__(
+        self,
+        driver: GU600Driver,
+        interval: float = POLL_INTERVAL,
+        keys: bool = True,
+        port: bool = False,
+        timeout: float = RESPONSE_TIMEOUT,
+    ) -> None:
+        assert interval > 0
+        self._driver = driver
+        self._interval = interval
+        self._keys = keys
+        self._port = port
+        self._timeout = timeout
+        self._last_port: Optional[int] = None
+        self._callbacks: List[EventCallback] = []
+        self._subscribers: List[Callable[[Optional[GU600Event]], None]] = []
+        self._lock = threading.Lock()
+        self._error: Optional[BaseException] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def interval(self) -> float:
+        return self._interval
+
+    @interval.setter
+    def interval(self, interval: float) -> None:
+        assert interval > 0
+        self._interval = interval
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None
+
+    def add_callback(self, callback: EventCallback) -> None:
+        with self._lock:
+            self._callbacks.append(callback)
+
+    def remove_callback(self, callback: EventCallback) -> None:
+        with self._lock:
+            self._callbacks.remove(callback)
+
+    def start(self) -> None:
+        """Start the polling thread."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="gu600-events", daemon=True
+            )
+            self._thread.start()
+
+    def close(self) -> None:
+        """Stop the polling thread and end all loops over the events. An exception raised while polling
+        is raised here."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+        for subscriber in self._take_subscribers():
+            subscriber(None)
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def poll(self) -> List[GU600Event]:
+        """Read pending key codes and the port state once, pass the resulting events on and return them."""
+        events = []
+        keys: List[int] = []
+        response: List[int] = []
+        with self._driver.lock:
+            link = self._driver.comms_link
+            if isinstance(link, GU600CommsBatch):
+                link = link.comms_link
+            if self._keys:
+                keys = link.read(MAX_KEYS, 0.0)
+            if self._port:
+                response = link.xfer(enc.READ_PORT, 1, self._timeout)
+        now = time.monotonic()
+        for key in keys:
+            if key not in IDLE_BYTES:
+                events.append(GU600Event(EventType.EVENT_KEY, key, now))
+        if self._port:
+            state = response[0] if response else None
+            if state is not None and state != self._last_port:
+                self._last_port = state
+                events.append(GU600Event(EventType.EVENT_PORT, state, now))
+        with self._lock:
+            receivers = self._callbacks + self._subscribers
+        for event in events:
+            for receiver in receivers:
+                receiver(event)
+        return events
+
+    def __iter__(self) -> Iterator[GU600Event]:
+        events: "queue.Queue[Optional[GU600Event]]" = queue.Queue()
+        self._subscribe(events.put)
+        self.start()
+        try:
+            while True:
+                event = events.get()
+                if event is None:
+                    return
+                yield event
+        finally:
+            self._unsubscribe(events.put)
+
+    async def __aiter__(self) -> AsyncIterator[GU600Event]:
+        loop = asyncio.get_running_loop()
+        events: "asyncio.Queue[Optional[GU600Event]]" = asyncio.Queue()
+
+        def subscriber(event: Optional[GU600Event]) -> None:
+            loop.call_soon_threadsafe(events.put_nowait, event)
+
+        self._subscribe(subscriber)
+        self.start()
+        try:
+            while True:
+                event = await events.get()
+                if event is None:
+                    return
+                yield event
+        finally:
+            self._unsubscribe(subscriber)
+
+    def __enter__(self) -> "GU600EventSource":
+        self.start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def _subscribe(self, subscriber: Callable[[Optional[GU600Event]], None]) -> None:
+        with self._lock:
+            self._subscribers.append(subscriber)
+
+    def _unsubscribe(self, subscriber: Callable[[Optional[GU600Event]], None]) -> None:
+        with self._lock:
+            if subscriber in self._subscribers:
+                self._subscribers.remove(subscriber)
+
+    def _take_subscribers(self) -> List[Callable[[Optional[GU600Event]], None]]:
+        with self._lock:
+            subscribers, self._subscribers = self._subscribers, []
+        return subscribers
+
+    def _run(self) -> None:
+        # Event.wait sleeps until the interval is over or the source is closed, never spinning.
+        while not self._stop.wait(self._interval):
+            try:
+                self.poll()
+            except Exception as error:
+                self._error = error
+                return
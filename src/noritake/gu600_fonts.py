@@ -0,0 +1,148 @@
+from functools import lru_cache
+from typing import Dict, Mapping, Tuple, Union
+
+import numpy as np
+
+from noritake.gu600_enums import *
+
+# 5x7 glyphs for 20H - 7EH, one byte per column with D0 uppermost.
+GLYPHS_5x7 = (
+    b"\x00\x00\x00\x00\x00\x00\x00\x5f\x00\x00\x00\x07\x00\x07\x00\x14\x7f\x14\x7f\x14"
+    b"\x24\x2a\x7f\x2a\x12\x23\x13\x08\x64\x62\x36\x49\x56\x20\x50\x00\x05\x03\x00\x00"
+    b"\x00\x1c\x22\x41\x00\x00\x41\x22\x1c\x00\x2a\x1c\x7f\x1c\x2a\x08\x08\x3e\x08\x08"
+    b"\x00\x50\x30\x00\x00\x08\x08\x08\x08\x08\x00\x60\x60\x00\x00\x20\x10\x08\x04\x02"
+    b"\x3e\x51\x49\x45\x3e\x00\x42\x7f\x40\x00\x42\x61\x51\x49\x46\x21\x41\x45\x4b\x31"
+    b"\x18\x14\x12\x7f\x10\x27\x45\x45\x45\x39\x3c\x4a\x49\x49\x30\x01\x71\x09\x05\x03"
+    b"\x36\x49\x49\x49\x36\x06\x49\x49\x29\x1e\x00\x36\x36\x00\x00\x00\x56\x36\x00\x00"
+    b"\x08\x14\x22\x41\x00\x14\x14\x14\x14\x14\x00\x41\x22\x14\x08\x02\x01\x51\x09\x06"
+    b"\x32\x49\x79\x41\x3e\x7e\x11\x11\x11\x7e\x7f\x49\x49\x49\x36\x3e\x41\x41\x41\x22"
+    b"\x7f\x41\x41\x22\x1c\x7f\x49\x49\x49\x41\x7f\x09\x09\x09\x01\x3e\x41\x49\x49\x7a"
+    b"\x7f\x08\x08\x08\x7f\x00\x41\x7f\x41\x00\x20\x40\x41\x3f\x01\x7f\x08\x14\x22\x41"
+    b"\x7f\x40\x40\x40\x40\x7f\x02\x0c\x02\x7f\x7f\x04\x08\x10\x7f\x3e\x41\x41\x41\x3e"
+    b"\x7f\x09\x09\x09\x06\x3e\x41\x51\x21\x5e\x7f\x09\x19\x29\x46\x46\x49\x49\x49\x31"
+    b"\x01\x01\x7f\x01\x01\x3f\x40\x40\x40\x3f\x1f\x20\x40\x20\x1f\x3f\x40\x38\x40\x3f"
+    b"\x63\x14\x08\x14\x63\x07\x08\x70\x08\x07\x61\x51\x49\x45\x43\x00\x7f\x41\x41\x00"
+    b"\x02\x04\x08\x10\x20\x00\x41\x41\x7f\x00\x04\x02\x01\x02\x04\x40\x40\x40\x40\x40"
+    b"\x00\x01\x02\x04\x00\x20\x54\x54\x54\x78\x7f\x48\x44\x44\x38\x38\x44\x44\x44\x20"
+    b"\x38\x44\x44\x48\x7f\x38\x54\x54\x54\x18\x08\x7e\x09\x01\x02\x0c\x52\x52\x52\x3e"
+    b"\x7f\x08\x04\x04\x78\x00\x44\x7d\x40\x00\x20\x40\x44\x3d\x00\x7f\x10\x28\x44\x00"
+    b"\x00\x41\x7f\x40\x00\x7c\x04\x18\x04\x78\x7c\x08\x04\x04\x78\x38\x44\x44\x44\x38"
+    b"\x7c\x14\x14\x14\x08\x08\x14\x14\x18\x7c\x7c\x08\x04\x04\x08\x48\x54\x54\x54\x20"
+    b"\x04\x3f\x44\x40\x20\x3c\x40\x40\x20\x7c\x1c\x20\x40\x20\x1c\x3c\x40\x30\x40\x3c"
+    b"\x44\x28\x10\x28\x44\x0c\x50\x50\x50\x3c\x44\x64\x54\x4c\x44\x00\x08\x36\x41\x00"
+    b"\x00\x00\x7f\x00\x00\x00\x41\x36\x08\x00\x10\x08\x08\x10\x08"
+)
+# Shown for character codes without a glyph in the table above.
+GLYPH_BOX = b"\x7f\x41\x41\x41\x7f"
+
+
+class GU600Font:
+    """Metrics of a GU600 font, plus an approximation of its glyphs. The module's own font data is not
+    available, so glyphs are scaled from a built-in 5x7 table; widths, heights and the resulting cursor
+    advance follow the font definition. Characters are drawn with the cursor at their bottom left
+    corner."""
+
+    def __init__(
+        self, width: int, height: int, spacing: int = 1, proportional: bool = False
+    ) -> None:
+        self._width = width
+        self._height = height
+        self._spacing = spacing
+        self._proportional = proportional
+        self._glyphs: Dict[int, np.ndarray] = {}
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    @property
+    def height(self) -> int:
+        return self._height
+
+    @property
+    def spacing(self) -> int:
+        return self._spacing
+
+    @property
+    def proportional(self) -> bool:
+        return self._proportional
+
+    def glyph(self, code: int) -> np.ndarray:
+        """Return the character cell of 'code' as boolean array of shape (height, advance), including the
+        spacing columns to its right."""
+        cell = self._glyphs.get(code)
+        if cell is None:
+            cell = self._render(code)
+            self._glyphs[code] = cell
+        return cell
+
+    def advance(self, code: int) -> int:
+        """Number of pixels the cursor moves right after writing 'code'."""
+        if not self._proportional:
+            return self._width + self._spacing
+        return int(self.glyph(code).shape[1])
+
+    def text_width(self, text: str) -> int:
+        """Number of pixels the cursor moves right after writing 'text'."""
+        if not self._proportional:
+            return len(text) * (self._width + self._spacing)
+        return sum(self.advance(ord(c)) for c in text)
+
+    def _render(self, code: int) -> np.ndarray:
+        if 0x20 <= code < 0x7F:
+            start = (code - 0x20) * 5
+            columns = GLYPHS_5x7[start : start + 5]
+        else:
+            columns = GLYPH_BOX
+        bits = np.unpackbits(np.frombuffer(columns, dtype=np.uint8)[:, None], axis=1)
+        source = bits[:, :0:-1].T.astype(bool)
+        rows = np.arange(self._height) * 7 // self._height
+        cols = np.arange(self._width) * 5 // self._width
+        glyph = source[rows][:, cols]
+        if self._proportional:
+            used = np.flatnonzero(glyph.any(axis=0))
+            if used.size:
+                glyph = glyph[:, used[0] : used[-1] + 1]
+            else:
+                glyph = glyph[:, : (self._width + 1) // 2]
+        spacing = np.zeros((self._height, self._spacing), dtype=bool)
+        return np.hstack((glyph, spacing))
+
+
+FONTS: Mapping[FontFace, GU600Font] = {
+    FontFace.PROPORTIONAL_MINI: GU600Font(5, 5, 1, True),
+    FontFace.FIXEDSPACED_5X7: GU600Font(5, 7, 1),
+    FontFace.FIXEDSPACED_10x14: GU600Font(10, 14, 2),
+}
+
+EXTENDED_FONT_SIZES: Mapping[ExtendedFontFace, Tuple[int, int]] = {
+    ExtendedFontFace.FONTFACE_5x5A: (5, 5),
+    ExtendedFontFace.FONTFACE_5x7A: (5, 7),
+    ExtendedFontFace.FONTFACE_10x14A: (10, 14),
+    ExtendedFontFace.FONTFACE_7x15A: (7, 15),
+    ExtendedFontFace.FONTFACE_5x7C: (5, 7),
+    ExtendedFontFace.FONTFACE_10x14C: (10, 14),
+}
+
+DEFAULT_FONT = FONTS[FontFace.FIXEDSPACED_5X7]
+
+
+@lru_cache(maxsize=None)
+def extended_font(
+    extendedFontFace: Union[ExtendedFontFace, int],
+    fontProportion: Union[FontProportion, int],
+    fontSpace: Union[FontSpace, int],
+) -> GU600Font:
+    """Return the font selected by 'select_extended_font' with the same arguments."""
+    width, height = EXTENDED_FONT_SIZES[ExtendedFontFace(extendedFontFace)]
+    return GU600Font(
+        width,
+        height,
+        int(fontSpace) + 1,
+        fontProportion == FontProportion.FONT_PROPORTIONAL,
+    )
+
+
+def decode_extended_font(mode: int) -> GU600Font:
+    """Return the font selected by the mode byte of an extended font command (1BH 98H)."""
+    return extended_font(mode & 0x07, (mode >> 3) & 0x01, (mode >> 4) & 0x07)
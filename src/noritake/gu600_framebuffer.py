@@ -0,0 +1,185 @@
+from typing import List, Tuple
+
+import numpy as np
+
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_enums import *
+from noritake.gu600_stream import AREA_COMMAND_SIZE, area_chunks
+
+Rectangle = Tuple[int, int, int, int]
+
+
+def dirty_rectangles(previous: np.ndarray, current: np.ndarray) -> List[Rectangle]:
+    """Find the byte aligned rectangles in which two packed frames differ. Both frames are arrays of
+    shape (height, stride) holding 8 horizontal pixels per byte. The rectangles are returned as
+    (left, top, right, bottom) in byte columns and pixel rows, chosen such that the sum of the area
+    command overhead and the enclosed data is kept small."""
+    diff = previous != current
+    rectangles: List[Rectangle] = []
+    if not diff.any():
+        return rectangles
+    for first, last in _runs(diff.any(axis=0), AREA_COMMAND_SIZE):
+        band = diff[:, first : last + 1]
+        rows = np.flatnonzero(band.any(axis=1))
+        spans = [np.flatnonzero(band[row]) for row in rows]
+        rectangle = None
+        for row, span in zip(rows, spans):
+            left, right = first + int(span[0]), first + int(span[-1])
+            if rectangle is None:
+                rectangle = (left, int(row), right, int(row))
+                continue
+            merged = (
+                min(rectangle[0], left),
+                rectangle[1],
+                max(rectangle[2], right),
+                int(row),
+            )
+            if _cost(merged) <= _cost(rectangle) + _cost((left, 0, right, 0)):
+                rectangle = merged
+            else:
+                rectangles.append(rectangle)
+                rectangle = (left, int(row), right, int(row))
+        if rectangle is not None:
+            rectangles.append(rectangle)
+    return rectangles
+
+
+def _runs(mask: np.ndarray, gap: int) -> List[Tuple[int, int]]:
+    """Group the set entries of a boolean vector into runs, bridging holes shorter than 'gap'."""
+    indices = np.flatnonzero(mask)
+    runs: List[Tuple[int, int]] = []
+    if indices.size == 0:
+        return runs
+    breaks = np.flatnonzero(np.diff(indices) > gap)
+    starts = np.concatenate(([0], breaks + 1))
+    ends = np.concatenate((breaks, [indices.size - 1]))
+    for start, end in zip(starts, ends):
+        runs.append((int(indices[start]), int(indices[end])))
+    return runs
+
+
+def _cost(rectangle: Rectangle) -> int:
+    left, top, right, bottom = rectangle
+    return AREA_COMMAND_SIZE + (right - left + 1) * (bottom - top + 1)
+
+
+class GU600FrameBuffer:
+    """Bit packed frame buffer the application draws into. Each row holds 8 horizontal pixels per byte
+    with D7 leftmost, which is the layout 'write_graphic_area' expects in horizontal orientation. A
+    shadow copy of what was last sent to the display is kept, so that 'flush' only transfers the
+    rectangles that have changed."""
+
+    def __init__(self, driver: GU600Driver) -> None:
+        self._driver = driver
+        self._width = driver.config.width
+        self._height = driver.config.height
+        self._stride = (self._width + 7) // 8
+        self._buffer = np.zeros((self._height, self._stride), dtype=np.uint8)
+        self._shadow = np.zeros_like(self._buffer)
+        self._valid = False
+
+    @property
+    def width(self) -> int:
+        return self._width
+
+    @property
+    def height(self) -> int:
+        return self._height
+
+    @property
+    def buffer(self) -> np.ndarray:
+        """The packed frame of shape (height, stride)."""
+        return self._buffer
+
+    @property
+    def pixels(self) -> np.ndarray:
+        """A boolean copy of the frame of shape (height, width)."""
+        return np.unpackbits(self._buffer, axis=1)[:, : self._width].astype(bool)
+
+    def invalidate(self) -> None:
+        """Forget what the display shows, the next 'flush' will send the entire frame."""
+        self._valid = False
+
+    def clear(self) -> None:
+        """Clear all pixels."""
+        self._buffer[:] = 0
+
+    def fill(self) -> None:
+        """Illuminate all pixels."""
+        self.fill_rect(0, 0, self._width - 1, self._height - 1)
+
+    def get_pixel(self, x: int, y: int) -> bool:
+        """Return the state of the pixel at x, y."""
+        return bool(self._buffer[y, x >> 3] & (0x80 >> (x & 7)))
+
+    def set_pixel(self, x: int, y: int, on: bool = True) -> None:
+        """Illuminate, or clear, the pixel at x, y; pixels outside the display are ignored."""
+        if 0 <= x < self._width and 0 <= y < self._height:
+            if on:
+                self._buffer[y, x >> 3] |= 0x80 >> (x & 7)
+            else:
+                self._buffer[y, x >> 3] &= ~(0x80 >> (x & 7)) & 0xFF
+
+    def fill_rect(
+        self, left: int, top: int, right: int, bottom: int, on: bool = True
+    ) -> None:
+        """Illuminate, or clear, all pixels within the specified area."""
+        width, height = right - left + 1, bottom - top + 1
+        if width > 0 and height > 0:
+            self.blit(left, top, np.full((height, width), on, dtype=bool))
+
+    def blit(self, x: int, y: int, image: np.ndarray) -> None:
+        """Copy a boolean image of shape (height, width) with its top left corner at x, y. The image is
+        clipped to the display."""
+        image = np.asarray(image, dtype=bool)
+        left, top = max(x, 0), max(y, 0)
+        right = min(x + image.shape[1], self._width) - 1
+        bottom = min(y + image.shape[0], self._height) - 1
+        if right < left or bottom < top:
+            return
+        first, last = left >> 3, right >> 3
+        rows = slice(top, bottom + 1)
+        bits = np.unpackbits(self._buffer[rows, first : last + 1], axis=1)
+        bits[:, left - first * 8 : right - first * 8 + 1] = image[
+            top - y : bottom - y + 1, left - x : right - x + 1
+        ]
+        self._buffer[rows, first : last + 1] = np.packbits(bits, axis=1)
+
+    def dirty_rectangles(self) -> List[Rectangle]:
+        """Return the pixel rectangles (left, top, right, bottom) the next 'flush' would send."""
+        if not self._valid:
+            return [(0, 0, self._width - 1, self._height - 1)]
+        return [
+            self._to_pixels(r) for r in dirty_rectangles(self._shadow, self._buffer)
+        ]
+
+    def flush(self) -> bool:
+        """Send the changed parts of the frame to the display using 'write_graphic_area', split into commands
+        of at most MAX_MESSAGE_SIZE bytes. The write mode is set to horizontal orientation and pen type
+        'over' beforehand."""
+        if self._valid:
+            rectangles = dirty_rectangles(self._shadow, self._buffer)
+        else:
+            rectangles = [(0, 0, self._stride - 1, self._height - 1)]
+        if not rectangles:
+            return True
+        result = self._driver.set_write_mode(
+            GraphicOrientation.ORIENTATION_HORIZONTAL,
+            CursorMovement.MOVEMENT_HORIZONTAL,
+            CursorDirection.DIRECTION_FORWARD,
+            UnderScoreCursor.UNDERSCORECURSOR_STATICOFF,
+            PenType.PENTYPE_OVER,
+        )
+        for rectangle in rectangles:
+            first, top, last, bottom = rectangle
+            data = self._buffer[top : bottom + 1, first : last + 1]
+            left, top, right, bottom = self._to_pixels(rectangle)
+            for chunk in area_chunks(left, top, right, data):
+                result &= self._driver.write_graphic_area(*chunk)
+            self._shadow[top : bottom + 1, first : last + 1] = data
+        self._valid = True
+        return result
+
+    def _to_pixels(self, rectangle: Rectangle) -> Rectangle:
+        first, top, last, bottom = rectangle
+        return first * 8, top, min(last * 8 + 7, self._width - 1), bottom
@@ -0,0 +1,200 @@
+import threading
+import time
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from noritake.gu600_animation import LATE_FRACTION, PlaybackStats
+from noritake.gu600_comms import GU600CommsRecorder
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_planner import apply, plan
+from noritake.gu600_stream import write_image
+
+# Bits of gray per pixel: 4 shades, shown as a cycle of 3 frames.
+GRAY_BITS = 2
+MAX_GRAY_BITS = 4
+# Frames sent per second; with 2 bits a cycle repeats 50 times a second, fast enough not to flicker.
+FRAME_RATE = 150.0
+
+
+def plane_sequence(bits: int) -> List[int]:
+    """Return the bit planes shown during one cycle, in order. Plane k is shown 2**k times out of
+    2**bits - 1 frames, so a pixel is lit for the fraction of the cycle its gray level is of the maximum.
+    The most significant plane takes every other frame, the next one every fourth and so on, which
+    spreads each plane evenly over the cycle."""
+    assert 1 <= bits <= MAX_GRAY_BITS
+    sequence = []
+    for frame in range(1, 2**bits):
+        trailing_zeros = (frame & -frame).bit_length() - 1
+        sequence.append(bits - 1 - trailing_zeros)
+    return sequence
+
+
+def bit_planes(image: np.ndarray, bits: int = GRAY_BITS) -> np.ndarray:
+    """Quantize an 8-bit grayscale image of shape (height, width) to 'bits' bits, rounding to the
+    nearest level, and return its bit planes as a boolean array of shape (bits, height, width), the
+    least significant first."""
+    levels = (np.asarray(image, dtype=np.uint32) * (2**bits - 1) + 127) // 255
+    return np.stack([(levels >> k) & 1 for k in range(bits)]).astype(bool)
+
+
+def grayscale_frames(image: np.ndarray, bits: int = GRAY_BITS) -> List[np.ndarray]:
+    """Return the cycle of 1-bit frames that shows an 8-bit grayscale image in 2**bits shades."""
+    planes = bit_planes(image, bits)
+    return [planes[plane] for plane in plane_sequence(bits)]
+
+
+class GU600GrayscaleDisplay:
+    """Show 8-bit grayscale images by cycling through their bit planes at a fixed frame rate, each plane
+    shown for a share of the cycle in proportion to its weight. When an image is shown the commands
+    turning every frame of its cycle into the next one are planned once with 'gu600_planner.plan' and
+    kept, so sending a frame is a single write of only what changed. Frames are sent by 'play', or by a
+    background thread between 'start' and 'close'. 'bandwidth' tells whether the link keeps up with the
+    frame rate."""
+
+    def __init__(
+        self, driver: GU600Driver, bits: int = GRAY_BITS, rate: float = FRAME_RATE
+    ) -> None:
+        assert 1 <= bits <= MAX_GRAY_BITS and rate > 0
+        self._driver = driver
+        self._bits = bits
+        self._interval = 1 / rate
+        self._lock = threading.Lock()
+        self._frames: List[np.ndarray] = []
+        self._deltas: List[bytes] = []
+        self._pending: Optional[Tuple[List[np.ndarray], List[bytes]]] = None
+        self._shown: Optional[np.ndarray] = None
+        self._position = 0
+        self._stats = PlaybackStats(0, 0, 0, 0, 0.0, 0.0)
+        self._error: Optional[BaseException] = None
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def rate(self) -> float:
+        return 1 / self._interval
+
+    @property
+    def cycle_size(self) -> int:
+        """Number of bytes one cycle of the image shown takes, once it is on display."""
+        with self._lock:
+            deltas = self._pending[1] if self._pending else self._deltas
+        return sum(len(delta) for delta in deltas)
+
+    @property
+    def bandwidth(self) -> float:
+        """Number of bytes per second cycling through the image shown takes."""
+        return self.cycle_size * self.rate / ((1 << self._bits) - 1)
+
+    def show(self, image: np.ndarray) -> None:
+        """Cycle through the frames of an 8-bit grayscale image of shape (height, width) from the next
+        frame sent on."""
+        config = self._driver.config
+        image = np.asarray(image)
+        if image.shape != (config.height, config.width):
+            raise ValueError(
+                f"Image of shape {image.shape} does not match the display {config.height}x"
+                f"{config.width}."
+            )
+        frames = grayscale_frames(image, self._bits)
+        deltas = [self._delta(frames[i - 1], frames[i]) for i in range(len(frames))]
+        with self._lock:
+            self._pending = frames, deltas
+
+    def step(self) -> int:
+        """Send the next frame and return the number of bytes it took."""
+        with self._lock:
+            pending, self._pending = self._pending, None
+            if pending is not None:
+                self._frames, self._deltas = pending
+                self._position = 0
+            elif self._frames:
+                self._position = (self._position + 1) % len(self._frames)
+            else:
+                return 0
+            frame = self._frames[self._position]
+            if pending is None:
+                data = self._deltas[self._position]
+            elif self._shown is None:
+                data = self._encode(lambda d: write_image(d, 0, 0, frame))
+            else:
+                data = self._delta(self._shown, frame)
+            self._shown = frame
+        if data:
+            self._driver.write(data)
+        return len(data)
+
+    def play(
+        self,
+        frames: Optional[int] = None,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], object] = time.sleep,
+    ) -> PlaybackStats:
+        """Send 'frames' frames at the frame rate, or until 'close' is called. A frame sent more than
+        a quarter of the frame interval after it was due counts as late; no frame is dropped, as every
+        one is sent as the changes from the frame before it."""
+        count = late = size = 0
+        max_lateness = 0.0
+        start = clock()
+        due = start
+        while (frames is None or count < frames) and not self._stop.is_set():
+            now = clock()
+            if now < due:
+                sleep(due - now)
+                now = clock()
+            lateness = now - due
+            if lateness > self._interval * LATE_FRACTION:
+                late += 1
+            max_lateness = max(max_lateness, lateness)
+            size += self.step()
+            count += 1
+            due += self._interval
+        return PlaybackStats(count, 0, late, size, max_lateness, clock() - start)
+
+    def stats(self) -> PlaybackStats:
+        """Outcome of the last run of the background thread."""
+        return self._stats
+
+    def start(self) -> None:
+        """Start sending frames from a background thread."""
+        if self._thread is None:
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="gu600-grayscale", daemon=True
+            )
+            self._thread.start()
+
+    def close(self) -> None:
+        """Stop the background thread. An exception raised while sending is raised here."""
+        if self._thread is not None:
+            self._stop.set()
+            self._thread.join()
+            self._thread = None
+            self._stop.clear()
+        error, self._error = self._error, None
+        if error is not None:
+            raise error
+
+    def __enter__(self) -> "GU600GrayscaleDisplay":
+        self.start()
+        return self
+
+    def __exit__(self, *args: object) -> None:
+        self.close()
+
+    def _encode(self, draw: Callable[[GU600Driver], object]) -> bytes:
+        # A fresh driver every time, as frames are sent with 'write', which leaves the display state
+        # unknown, and 'show' may encode while the background thread does.
+        recorder = GU600CommsRecorder()
+        draw(GU600Driver(recorder, self._driver.config))
+        return bytes(recorder.data)
+
+    def _delta(self, previous: np.ndarray, current: np.ndarray) -> bytes:
+        return self._encode(lambda driver: apply(driver, plan(previous, current)))
+
+    def _run(self) -> None:
+        try:
+            # Event.wait sleeps until the frame is due or the display is closed.
+            self._stats = self.play(sleep=self._stop.wait)
+        except Exception as error:
+            self._error = error
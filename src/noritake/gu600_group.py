@@ -0,0 +1,181 @@
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Hashable,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    TypeVar,
+    cast,
+)
+
+from noritake.gu600_async import AsyncGU600Driver
+from noritake.gu600_comms import GU600Comms, GU600CommsSPI
+from noritake.gu600_driver import GU600Driver
+
+T = TypeVar("T")
+
+
+def spi_bus(comms_link: GU600Comms) -> Optional[int]:
+    """Return the SPI bus number of a communications channel, looking through wrapping channels, or None
+    if it is not on SPI."""
+    link: Optional[GU600Comms] = comms_link
+    while link is not None:
+        if isinstance(link, GU600CommsSPI):
+            return link.spi_num
+        link = getattr(link, "comms_link", None)
+    return None
+
+
+class GU600PanelStats(NamedTuple):
+    """Snapshot of the operations run on one panel of a 'DisplayGroup'."""
+
+    operations: int
+    failures: int
+    mean_latency: float
+    max_latency: float
+
+
+class _Panel:
+    def __init__(self, driver: GU600Driver, bus: Hashable) -> None:
+        self.driver = driver
+        self.bus = bus
+        self.pending: List["Future[Any]"] = []
+        self.operations = 0
+        self.failures = 0
+        self.total_latency = 0.0
+        self.max_latency = 0.0
+
+
+class DisplayGroup:
+    """Drive many displays at once. Every bus gets a worker thread, so operations on panels sharing a bus
+    run one after the other while different buses are driven in parallel. Panels on SPI are assigned to
+    their SPI bus unless a bus is given; any other panel gets a bus of its own."""
+
+    def __init__(self) -> None:
+        self._panels: Dict[str, _Panel] = {}
+        self._executors: Dict[Hashable, ThreadPoolExecutor] = {}
+        self._lock = threading.Lock()
+
+    @property
+    def names(self) -> List[str]:
+        return list(self._panels)
+
+    def driver(self, name: str) -> GU600Driver:
+        return self._panels[name].driver
+
+    def add(
+        self, name: str, driver: GU600Driver, bus: Optional[Hashable] = None
+    ) -> None:
+        """Add panel 'name' driven by 'driver' on 'bus'."""
+        if bus is None:
+            spi_num = spi_bus(driver.comms_link)
+            bus = name if spi_num is None else ("spi", spi_num)
+        self._panels[name] = _Panel(driver, bus)
+        if bus not in self._executors:
+            self._executors[bus] = ThreadPoolExecutor(
+                max_workers=1, thread_name_prefix=f"gu600-bus-{bus}"
+            )
+
+    def submit(self, name: str, operation: Callable[[GU600Driver], T]) -> "Future[T]":
+        """Queue 'operation' to be called with the driver of panel 'name' on the thread of its bus."""
+        panel = self._panels[name]
+        future = self._executors[panel.bus].submit(self._timed, panel, operation)
+        with self._lock:
+            panel.pending = [f for f in panel.pending if not f.done()]
+            panel.pending.append(future)
+        return future
+
+    def run(
+        self,
+        operation: Callable[[GU600Driver], T],
+        names: Optional[Iterable[str]] = None,
+    ) -> Dict[str, "Future[T]"]:
+        """Queue 'operation' for all panels, or those named, and return the futures by panel."""
+        return {name: self.submit(name, operation) for name in names or self._panels}
+
+    def set_brightness(self, brightness: int) -> bool:
+        """Set the brightness of all panels and wait until done."""
+        return self._all(self.run(lambda vfd: vfd.set_brightness(brightness)))
+
+    def clear_all(self) -> bool:
+        """Clear all panels and wait until done."""
+        return self._all(self.run(lambda vfd: vfd.clear_all()))
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every operation queued so far has completed on every panel, including the queues of
+        asynchronous drivers. Returns False on a timeout or if any operation failed."""
+        with self._lock:
+            pending = [f for panel in self._panels.values() for f in panel.pending]
+        done, not_done = wait(pending, timeout)
+        result = not not_done and all(
+            f.exception() is None and f.result() is not False for f in done
+        )
+        asynchronous = [
+            name
+            for name, panel in self._panels.items()
+            if isinstance(panel.driver, AsyncGU600Driver)
+        ]
+        if asynchronous:
+            flushes = self.run(
+                lambda vfd: cast(AsyncGU600Driver, vfd).flush(), asynchronous
+            )
+            result &= self._all(flushes, timeout)
+        return result
+
+    def stats(self) -> Dict[str, GU600PanelStats]:
+        """Return operation counts and latencies by panel."""
+        with self._lock:
+            return {
+                name: GU600PanelStats(
+                    operations=panel.operations,
+                    failures=panel.failures,
+                    mean_latency=(
+                        panel.total_latency / panel.operations
+                        if panel.operations
+                        else 0.0
+                    ),
+                    max_latency=panel.max_latency,
+                )
+                for name, panel in self._panels.items()
+            }
+
+    def close(self) -> None:
+        """Complete all queued operations and stop the bus threads."""
+        for executor in self._executors.values():
+            executor.shutdown(wait=True)
+
+    def __enter__(self) -> "DisplayGroup":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+    def _timed(self, panel: _Panel, operation: Callable[[GU600Driver], T]) -> T:
+        start = time.perf_counter()
+        failed = True
+        try:
+            result = operation(panel.driver)
+            failed = result is False
+            return result
+        finally:
+            latency = time.perf_counter() - start
+            with self._lock:
+                panel.operations += 1
+                panel.failures += failed
+                panel.total_latency += latency
+                panel.max_latency = max(panel.max_latency, latency)
+
+    @staticmethod
+    def _all(
+        futures: Dict[str, "Future[Any]"], timeout: Optional[float] = None
+    ) -> bool:
+        done, not_done = wait(futures.values(), timeout)
+        return not not_done and all(
+            f.exception() is None and f.result() is not False for f in done
+        )
@@ -0,0 +1,144 @@
+from enum import IntEnum
+from functools import lru_cache
+from typing import List, Tuple, Union
+
+import numpy as np
+
+from noritake.gu600_enums import GraphicOrientation
+
+LUMINANCE = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+class Dither(IntEnum):
+    """Argument type used in 'to_monochrome'."""
+
+    DITHER_NONE = 0
+    DITHER_ORDERED = 1
+    DITHER_FLOYD_STEINBERG = 2
+
+
+def from_buffer(
+    buffer: Union[bytes, bytearray, memoryview],
+    width: int,
+    height: int,
+    channels: int = 1,
+) -> np.ndarray:
+    """Wrap a raw 8 bit grayscale (1 channel), RGB (3) or RGBA (4) buffer, row by row, as a grayscale
+    image of shape (height, width) without copying grayscale data."""
+    raw = np.frombuffer(buffer, dtype=np.uint8, count=width * height * channels)
+    if channels == 1:
+        return raw.reshape(height, width)
+    return to_grayscale(raw.reshape(height, width, channels))
+
+
+def to_grayscale(image: np.ndarray) -> np.ndarray:
+    """Convert an image of shape (height, width), (height, width, 3) or (height, width, 4) into 8 bit
+    grayscale. Boolean images map to 0 and 255."""
+    image = np.asarray(image)
+    if image.dtype == bool:
+        return image.astype(np.uint8) * 255
+    if image.ndim == 3:
+        image = image[..., :3].astype(np.float32) @ LUMINANCE + 0.5
+    if image.dtype != np.uint8:
+        image = np.clip(image, 0, 255).astype(np.uint8)
+    return image
+
+
+@lru_cache(maxsize=None)
+def bayer_matrix(size: int) -> np.ndarray:
+    """Return the ordered dither threshold matrix of 'size' x 'size' (a power of 2) scaled to 0 - 255."""
+    matrix = np.zeros((1, 1), dtype=np.int32)
+    while matrix.shape[0] < size:
+        matrix = np.block(
+            [[4 * matrix, 4 * matrix + 2], [4 * matrix + 3, 4 * matrix + 1]]
+        )
+    thresholds = (matrix.astype(np.float32) + 0.5) * (256.0 / matrix.size)
+    thresholds.flags.writeable = False
+    return thresholds
+
+
+def threshold(image: np.ndarray, level: int = 128) -> np.ndarray:
+    """Illuminate every pixel at or above 'level'."""
+    return to_grayscale(image) >= level
+
+
+def dither_ordered(image: np.ndarray, size: int = 4) -> np.ndarray:
+    """Ordered (Bayer) dither of a grayscale image."""
+    gray = to_grayscale(image)
+    matrix = bayer_matrix(size)
+    reps = (-(-gray.shape[0] // size), -(-gray.shape[1] // size))
+    tiled = np.tile(matrix, reps)[: gray.shape[0], : gray.shape[1]]
+    return gray >= tiled
+
+
+@lru_cache(maxsize=16)
+def _wavefronts(height: int, width: int) -> List[Tuple[np.ndarray, np.ndarray]]:
+    """Split the pixels into anti-diagonals x + 2y. Floyd-Steinberg only propagates errors to pixels
+    on later anti-diagonals, so all pixels on one can be processed at once. Returned are the flat indices
+    into the image and into the error buffer, which has a guard column either side and a guard row
+    below."""
+    stride = width + 2
+    fronts = []
+    for t in range(width + 2 * (height - 1)):
+        ys = np.arange(max(0, (t - width + 2) // 2), min(height - 1, t // 2) + 1)
+        xs = t - 2 * ys
+        fronts.append((ys * width + xs, ys * stride + xs + 1))
+    return fronts
+
+
+def dither_floyd_steinberg(image: np.ndarray, level: int = 128) -> np.ndarray:
+    """Floyd-Steinberg error diffusion of a grayscale image, vectorised along anti-diagonals. Unlike
+    thresholding and ordered dither this is not a single array operation and takes a few milliseconds
+    for a full frame."""
+    gray = to_grayscale(image)
+    height, width = gray.shape
+    stride = width + 2
+    buffer = np.zeros((height + 1, stride), dtype=np.float32)
+    buffer[:height, 1:-1] = gray
+    values = buffer.ravel()
+    result = np.zeros(height * width, dtype=bool)
+    for pixels, cells in _wavefronts(height, width):
+        old = values[cells]
+        on = old >= level
+        result[pixels] = on
+        error = old - on * np.float32(255.0)
+        values[cells + 1] += error * np.float32(7 / 16)
+        values[cells + (stride - 1)] += error * np.float32(3 / 16)
+        values[cells + stride] += error * np.float32(5 / 16)
+        values[cells + (stride + 1)] += error * np.float32(1 / 16)
+    return result.reshape(height, width)
+
+
+def to_monochrome(
+    image: np.ndarray, dither: Dither = Dither.DITHER_NONE, level: int = 128
+) -> np.ndarray:
+    """Convert an image into a boolean array of illuminated pixels using 'Dither'."""
+    if dither == Dither.DITHER_ORDERED:
+        return dither_ordered(image)
+    if dither == Dither.DITHER_FLOYD_STEINBERG:
+        return dither_floyd_steinberg(image, level)
+    return threshold(image, level)
+
+
+def pack_bitmap(bits: np.ndarray, orientation: GraphicOrientation) -> np.ndarray:
+    """Pack a boolean image of shape (height, width) into the byte layout 'write_graphic_area' expects:
+    in horizontal orientation row by row with D7 leftmost, in vertical orientation band of 8 rows by band
+    of 8 rows with D7 uppermost. Rows and bands are padded with cleared pixels."""
+    bits = np.asarray(bits, dtype=bool)
+    if orientation == GraphicOrientation.ORIENTATION_HORIZONTAL:
+        return np.packbits(bits, axis=1).ravel()
+    height, width = bits.shape
+    bands = -(-height // 8)
+    if bands * 8 != height:
+        bits = np.vstack((bits, np.zeros((bands * 8 - height, width), dtype=bool)))
+    return np.packbits(bits.reshape(bands, 8, width), axis=1).ravel()
+
+
+def convert(
+    image: np.ndarray,
+    orientation: GraphicOrientation,
+    dither: Dither = Dither.DITHER_NONE,
+    level: int = 128,
+) -> np.ndarray:
+    """Convert an image into packed graphic data for 'write_graphic' or 'write_graphic_area'."""
+    return pack_bitmap(to_monochrome(image, dither, level), orientation)
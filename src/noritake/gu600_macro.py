@@ -0,0 +1,68 @@
+from contextlib import contextmanager
+from typing import Dict, Iterator, Mapping
+
+from noritake.gu600_comms import GU600CommsRecorder
+from noritake.gu600_driver import GU600Driver
+
+MAX_MACRO_NUMBER = 7
+# All macros share this much EEPROM; each is further limited by its single length byte.
+MACRO_EEPROM_SIZE = 472
+MAX_MACRO_SIZE = 255
+
+
+class GU600MacroRecorder:
+    """Record sequences of driver calls as macros, upload them to the EEPROM of the display and trigger
+    them later with a single byte. Macro 0 runs at power-up only, macros 1-7 on demand."""
+
+    def __init__(self, driver: GU600Driver) -> None:
+        self._driver = driver
+        self._macros: Dict[int, bytes] = {}
+
+    @property
+    def macros(self) -> Mapping[int, bytes]:
+        """The recorded macros by number."""
+        return self._macros
+
+    @property
+    def size(self) -> int:
+        """Number of EEPROM bytes taken by all recorded macros."""
+        return sum(len(data) for data in self._macros.values())
+
+    @contextmanager
+    def record(self, macroNumber: int) -> Iterator[GU600Driver]:
+        """Record the calls made within the context on the returned driver as macro 'macroNumber'. Nothing
+        is sent to the display. Raises ValueError if the macro does not fit."""
+        if not 0 <= macroNumber <= MAX_MACRO_NUMBER:
+            raise ValueError(f"Macro number {macroNumber} is not within 0-7.")
+        recorder = GU600CommsRecorder()
+        yield GU600Driver(recorder, self._driver.config)
+        data = bytes(recorder.data)
+        if len(data) > MAX_MACRO_SIZE:
+            raise ValueError(
+                f"Macro {macroNumber} takes {len(data)} bytes, at most {MAX_MACRO_SIZE} are allowed."
+            )
+        others = self.size - len(self._macros.get(macroNumber, b""))
+        if others + len(data) > MACRO_EEPROM_SIZE:
+            raise ValueError(
+                f"Macros would take {others + len(data)} bytes of EEPROM, at most {MACRO_EEPROM_SIZE} are"
+                " available."
+            )
+        self._macros[macroNumber] = data
+
+    def upload(self) -> bool:
+        """Send all recorded macros to the EEPROM of the display."""
+        result = True
+        for number, data in sorted(self._macros.items()):
+            result &= self._driver.set_macro(number, data)
+        return result
+
+    def play(self, macroNumber: int) -> bool:
+        """Execute uploaded macro 1-7 on the display."""
+        if not 1 <= macroNumber <= MAX_MACRO_NUMBER:
+            raise ValueError(f"Macro number {macroNumber} is not within 1-7.")
+        return self._driver.send_macro_start(macroNumber)
+
+    def erase(self) -> bool:
+        """Clear all macros, recorded and in EEPROM."""
+        self._macros.clear()
+        return self._driver.erase_macros()
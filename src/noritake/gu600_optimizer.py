@@ -0,0 +1,307 @@
+from typing import Any, Callable, List, Optional, Tuple
+
+import numpy as np
+
+from noritake.gu600_comms import MAX_MESSAGE_SIZE
+from noritake.gu600_config import GU600Config
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_emulator import area_size, unpack_area
+from noritake.gu600_enums import *
+from noritake.gu600_image import pack_bitmap
+from noritake.gu600_planner import Operation, apply, plan_size, render
+from noritake.gu600_stream import AREA_COMMAND_SIZE
+
+# Operations drawing within the rectangle of their first four arguments, which leave the cursor at its
+# top left corner.
+AREA_METHODS = frozenset(
+    (
+        "set_area",
+        "clear_area",
+        "invert_area",
+        "set_outline",
+        "clear_outline",
+        "write_graphic_area",
+        "clear_all",
+    )
+)
+# Area operations that overwrite every pixel of their rectangle whatever it held.
+FILL_METHODS = frozenset(("set_area", "clear_area", "clear_all"))
+# Operations that neither draw nor use the cursor.
+NEUTRAL_METHODS = frozenset(
+    (
+        "set_write_mode",
+        "select_font",
+        "select_extended_font",
+        "set_brightness",
+        "set_auto_fade",
+        "set_command_delay",
+        "power_on",
+        "power_off",
+    )
+)
+# Operations that draw at, or move, the cursor.
+CURSOR_METHODS = frozenset(
+    (
+        "write_character",
+        "write_graphic",
+        "set_pixel",
+        "clear_pixel",
+        "draw_line",
+        "send_backspace",
+        "move_curser_horizontal_tab",
+        "move_curser_line_feed",
+        "move_curser_home",
+        "move_curser_vertical_tab",
+        "move_curser_carriage_return",
+        "clear_EOL",
+    )
+)
+# Setters of which only the last of a consecutive run matters, by the state they set.
+SETTER_SLOTS = {
+    "set_write_mode": "write_mode",
+    "select_font": "font",
+    "select_extended_font": "font",
+    "set_brightness": "brightness",
+}
+# Driver calls returning a response, which 'GU600OperationBuffer' cannot defer.
+QUERY_METHODS = frozenset(("query_checksum", "query_port"))
+
+
+def optimize(operations: List[Operation], config: GU600Config) -> List[Operation]:
+    """Return a list of operations that renders the same as 'operations' with fewer bytes and calls:
+    area operations whose rectangle is entirely filled or cleared again later, cursor positions that are
+    set again before being used and setters overridden by the next operation are dropped, a cursor
+    position followed by characters becomes one 'write_text', and adjacent graphic areas of the same
+    span are fused while the write mode is known. Operations other than the ones listed in this module,
+    and window selection, are barriers nothing is moved or dropped across."""
+    operations = _drop_overwritten(operations, config)
+    operations = _collapse_setters(operations)
+    operations = _merge_text(operations)
+    return _fuse_areas(operations, config)
+
+
+def renders_identically(
+    config: GU600Config,
+    operations: List[Operation],
+    optimized: List[Operation],
+    previous: Optional[np.ndarray] = None,
+) -> bool:
+    """Return True if both lists of operations leave the emulator with the same pixels, starting from
+    'previous', by default a cleared display."""
+    if previous is None:
+        previous = np.zeros((config.height, config.width), dtype=bool)
+    return bool(
+        np.array_equal(
+            render(config, previous, operations), render(config, previous, optimized)
+        )
+    )
+
+
+class GU600OperationBuffer:
+    """Collect driver calls instead of sending them; 'flush' optimizes them with 'optimize' and sends
+    them to the driver. Every call returns True, queries flush first and are answered by the driver."""
+
+    def __init__(self, driver: GU600Driver) -> None:
+        self._driver = driver
+        self._operations: List[Operation] = []
+        self._bytes_saved = 0
+
+    @property
+    def config(self) -> GU600Config:
+        return self._driver.config
+
+    @property
+    def operations(self) -> List[Operation]:
+        """Operations collected since the last flush."""
+        return list(self._operations)
+
+    @property
+    def bytes_saved(self) -> int:
+        """Number of bytes the optimizer left out so far."""
+        return self._bytes_saved
+
+    def flush(self) -> bool:
+        operations, self._operations = self._operations, []
+        optimized = optimize(operations, self._driver.config)
+        self._bytes_saved += plan_size(operations) - plan_size(optimized)
+        return apply(self._driver, optimized)
+
+    def __getattr__(self, name: str) -> Callable[..., Any]:
+        method = getattr(GU600Driver, name, None)
+        if name.startswith("_") or not callable(method):
+            raise AttributeError(name)
+        if name in QUERY_METHODS:
+            self.flush()
+            return getattr(self._driver, name)  # type: ignore[no-any-return]
+
+        def record(*args: Any) -> bool:
+            # Buffers may be reused by the caller before the flush.
+            self._operations.append(
+                Operation(
+                    name,
+                    tuple(
+                        bytes(a) if isinstance(a, (bytearray, memoryview)) else a
+                        for a in args
+                    ),
+                )
+            )
+            return True
+
+        return record
+
+
+def _area(operation: Operation, config: GU600Config) -> Tuple[int, int, int, int]:
+    if operation.method == "clear_all":
+        return 0, 0, config.width - 1, config.height - 1
+    left, top, right, bottom = operation.args[:4]
+    return left, top, right, bottom
+
+
+def _is_barrier(method: str) -> bool:
+    return not (
+        method in AREA_METHODS
+        or method in NEUTRAL_METHODS
+        or method in CURSOR_METHODS
+        or method in ("set_cursor_position", "write_text")
+    )
+
+
+def _drop_overwritten(
+    operations: List[Operation], config: GU600Config
+) -> List[Operation]:
+    """Walk backwards keeping the pixels filled or cleared later on, and whether the cursor is used before
+    it is set again."""
+    covered = np.zeros((config.height, config.width), dtype=bool)
+    cursor_used = True
+    kept: List[Operation] = []
+    for operation in reversed(operations):
+        method = operation.method
+        if method in AREA_METHODS:
+            left, top, right, bottom = _area(operation, config)
+            area = covered[top : bottom + 1, left : right + 1]
+            if not cursor_used and np.all(area):
+                continue
+            if method in FILL_METHODS:
+                area[:] = True
+            cursor_used = False
+        elif method == "set_cursor_position":
+            if not cursor_used:
+                continue
+            cursor_used = False
+        elif method == "write_text":
+            cursor_used = False
+        elif method in CURSOR_METHODS:
+            cursor_used = True
+        elif _is_barrier(method):
+            covered[:] = False
+            cursor_used = True
+        kept.append(operation)
+    kept.reverse()
+    return kept
+
+
+def _collapse_setters(operations: List[Operation]) -> List[Operation]:
+    kept: List[Operation] = []
+    for operation in operations:
+        slot = SETTER_SLOTS.get(operation.method)
+        if slot is not None and kept and SETTER_SLOTS.get(kept[-1].method) == slot:
+            kept[-1] = operation
+        else:
+            kept.append(operation)
+    return kept
+
+
+def _merge_text(operations: List[Operation]) -> List[Operation]:
+    kept: List[Operation] = []
+    for operation in operations:
+        if operation.method == "write_character" and kept:
+            previous = kept[-1]
+            # The same clamping as 'write_character', 'encode_text' maps control codes the same way.
+            c = operation.args[0]
+            character = chr(c if 0 <= c <= 0xFF else min(max(c, 0x20), 0xFF))
+            if previous.method == "set_cursor_position":
+                kept[-1] = Operation("write_text", (*previous.args, character))
+                continue
+            if previous.method == "write_text":
+                x, y, text = previous.args
+                kept[-1] = Operation("write_text", (x, y, text + character))
+                continue
+        kept.append(operation)
+    return kept
+
+
+def _fuse_areas(operations: List[Operation], config: GU600Config) -> List[Operation]:
+    """Fuse runs of graphic areas sharing a side, as long as the cursor they leave is not used."""
+    cursor_used = _cursor_used(operations)
+    orientation: Optional[GraphicOrientation] = None
+    kept: List[Operation] = []
+    for index, operation in enumerate(operations):
+        if operation.method == "set_write_mode":
+            orientation = GraphicOrientation(operation.args[0])
+        elif _is_barrier(operation.method):
+            orientation = None
+        elif (
+            operation.method == "write_graphic_area"
+            and orientation is not None
+            and kept
+            and kept[-1].method == "write_graphic_area"
+        ):
+            fused = _fuse(kept[-1], operation, orientation)
+            if fused is not None and (
+                not cursor_used[index] or fused.args[:2] == operation.args[:2]
+            ):
+                kept[-1] = fused
+                continue
+        kept.append(operation)
+    return kept
+
+
+def _cursor_used(operations: List[Operation]) -> List[bool]:
+    """Return for every operation whether the cursor it leaves is used later on."""
+    used = [True] * len(operations)
+    cursor_used = True
+    for index in range(len(operations) - 1, -1, -1):
+        used[index] = cursor_used
+        method = operations[index].method
+        if method in AREA_METHODS or method in ("set_cursor_position", "write_text"):
+            cursor_used = False
+        elif method not in NEUTRAL_METHODS:
+            cursor_used = True
+    return used
+
+
+def _fuse(
+    first: Operation, second: Operation, orientation: GraphicOrientation
+) -> Optional[Operation]:
+    """Return one graphic area drawing both, if their rectangles share an entire side."""
+    left1, top1, right1, bottom1, data1 = first.args
+    left2, top2, right2, bottom2, data2 = second.args
+    if (left1, right1) == (left2, right2) and bottom1 + 1 == top2:
+        axis = 0
+    elif (left1, right1) == (left2, right2) and bottom2 + 1 == top1:
+        axis, first, second = 0, second, first
+    elif (top1, bottom1) == (top2, bottom2) and right1 + 1 == left2:
+        axis = 1
+    elif (top1, bottom1) == (top2, bottom2) and right2 + 1 == left1:
+        axis, first, second = 1, second, first
+    else:
+        return None
+    parts = []
+    for left, top, right, bottom, data in (first.args, second.args):
+        width, height = right - left + 1, bottom - top + 1
+        if (
+            width < 1
+            or height < 1
+            or len(data) != area_size(width, height, orientation)
+        ):
+            return None
+        parts.append(unpack_area(bytes(data), width, height, orientation))
+    bits = np.concatenate(parts, axis=axis)
+    data = pack_bitmap(bits, orientation).tobytes()
+    if AREA_COMMAND_SIZE + len(data) > MAX_MESSAGE_SIZE:
+        return None
+    left, top = first.args[:2]
+    return Operation(
+        "write_graphic_area",
+        (left, top, left + bits.shape[1] - 1, top + bits.shape[0] - 1, data),
+    )
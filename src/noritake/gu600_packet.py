@@ -0,0 +1,170 @@
+from typing import Iterator, List, Optional
+
+from noritake.gu600_comms import (
+    MAX_MESSAGE_SIZE,
+    PACKET_FOOTER,
+    PACKET_HEADER,
+    VFDACK,
+    GU600Comms,
+    Message,
+    as_buffer,
+)
+from noritake.gu600_emulator import command_size
+from noritake.gu600_enums import *
+
+# Any response other than VFDACK is treated as a rejected packet, this is the one the loopback sends.
+VFDNAK = 0x51
+PACKET_OVERHEAD = 4
+MAX_PAYLOAD_SIZE = MAX_MESSAGE_SIZE - PACKET_OVERHEAD
+ACK_TIMEOUT = 0.05
+MAX_RETRIES = 3
+
+
+def frame_packet(payload: Message) -> bytearray:
+    """Frame a payload of at most MAX_PAYLOAD_SIZE bytes as header, length, payload, checksum, footer.
+    The checksum is the lower 8 bits of the sum of the payload bytes."""
+    data = as_buffer(payload)
+    assert 0 < len(data) <= MAX_PAYLOAD_SIZE
+    packet = bytearray((PACKET_HEADER, len(data)))
+    packet += data
+    packet += bytes((sum(data) & 0xFF, PACKET_FOOTER))
+    return packet
+
+
+class GU600CommsPacket(GU600Comms):
+    """Packet mode transport layered over another communications channel, to be used once the device has
+    been switched to 'PacketMode.PACKETMODE_ON'. Messages are split into packets of at most
+    MAX_MESSAGE_SIZE bytes at command boundaries; only a single command longer than MAX_PAYLOAD_SIZE is
+    split across packets. Each packet is acknowledged before the next one is sent, and a rejected or
+    unacknowledged packet is sent again once any late response to it has been read, so the display runs
+    every command once and in order. Packets are not pipelined: packets carry no sequence number, and the
+    display runs the ones behind a rejected packet before it could be sent again. 'write' returns False
+    once a packet has been retried 'max_retries' times without success."""
+
+    def __init__(
+        self,
+        comms_link: GU600Comms,
+        timeout: float = ACK_TIMEOUT,
+        max_retries: int = MAX_RETRIES,
+    ) -> None:
+        self._comms_link = comms_link
+        self._timeout = timeout
+        self._max_retries = max_retries
+        self._orientation = GraphicOrientation.ORIENTATION_HORIZONTAL
+        self._packets = 0
+        self._retransmissions = 0
+
+    @property
+    def comms_link(self) -> GU600Comms:
+        return self._comms_link
+
+    @property
+    def packets(self) -> int:
+        """Number of packets acknowledged so far."""
+        return self._packets
+
+    @property
+    def retransmissions(self) -> int:
+        """Number of packets sent more than once."""
+        return self._retransmissions
+
+    def write(self, message: Message) -> bool:
+        for payload in self._split(message):
+            if not self._send(frame_packet(payload)):
+                return False
+        return True
+
+    def read(self, count: int, timeout: float = 0.0) -> List[int]:
+        return self._comms_link.read(count, timeout)
+
+    def _send(self, packet: bytearray) -> bool:
+        """Send a packet and wait for its response, sending it again up to 'max_retries' times."""
+        for attempt in range(self._max_retries + 1):
+            if attempt:
+                self._retransmissions += 1
+            self._comms_link.write(packet)
+            response = self._comms_link.read(1, self._timeout)
+            if not response:
+                # A response arriving late still tells whether the packet was run.
+                response = self._comms_link.read(1, self._timeout)
+            if response == [VFDACK]:
+                self._packets += 1
+                return True
+        return False
+
+    def _split(self, message: Message) -> Iterator[bytes]:
+        """Split a message into payloads at command boundaries, following the graphic orientation the
+        size of graphic area commands depends on."""
+        data = bytes(as_buffer(message))
+        start = position = 0
+        while position < len(data):
+            size = command_size(data, position, self._orientation)
+            end = len(data) if size is None else min(position + size, len(data))
+            if data[position] == 0x1A and end - position == 2:
+                self._orientation = GraphicOrientation(data[position + 1] >> 7)
+            elif data[position] == 0x19:
+                self._orientation = GraphicOrientation.ORIENTATION_HORIZONTAL
+            if end - start > MAX_PAYLOAD_SIZE and position > start:
+                yield data[start:position]
+                start = position
+            while end - start > MAX_PAYLOAD_SIZE:
+                yield data[start : start + MAX_PAYLOAD_SIZE]
+                start += MAX_PAYLOAD_SIZE
+            position = end
+        if start < len(data):
+            yield data[start:]
+
+
+class GU600CommsLoopback(GU600Comms):
+    """Local stand-in for a device in packet mode. Packets written to it are checked and answered with
+    VFDACK or VFDNAK; the payload of accepted packets is collected in 'received' and passed on to
+    'comms_link' if given. For testing, every 'nak_every'-th packet is rejected and every 'drop_every'-th
+    packet is lost without a response."""
+
+    def __init__(
+        self,
+        comms_link: Optional[GU600Comms] = None,
+        nak_every: int = 0,
+        drop_every: int = 0,
+    ) -> None:
+        self._comms_link = comms_link
+        self._nak_every = nak_every
+        self._drop_every = drop_every
+        self._count = 0
+        self._pending = bytearray()
+        self._responses: List[int] = []
+        self.received = bytearray()
+
+    def write(self, message: Message) -> bool:
+        self._pending += as_buffer(message)
+        while self._pending:
+            if self._pending[0] != PACKET_HEADER:
+                del self._pending[0]
+                continue
+            if len(self._pending) < 2:
+                break
+            size = self._pending[1] + PACKET_OVERHEAD
+            if len(self._pending) < size:
+                break
+            packet = bytes(self._pending[:size])
+            del self._pending[:size]
+            self._receive(packet)
+        return True
+
+    def read(self, count: int, timeout: float = 0.0) -> List[int]:
+        response, self._responses = self._responses[:count], self._responses[count:]
+        return response
+
+    def _receive(self, packet: bytes) -> None:
+        self._count += 1
+        if self._drop_every and self._count % self._drop_every == 0:
+            return
+        payload = packet[2:-2]
+        valid = packet[-1] == PACKET_FOOTER and packet[-2] == sum(payload) & 0xFF
+        if not valid or (self._nak_every and self._count % self._nak_every == 0):
+            self._responses.append(VFDNAK)
+            return
+        self.received += payload
+        if self._comms_link is not None:
+            self._comms_link.write(payload)
+        self._responses.append(VFDACK)
@@ -0,0 +1,278 @@
+from typing import Any, Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from noritake.gu600_comms import GU600CommsRecorder
+from noritake.gu600_config import GU600Config
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_emulator import GU600CommsEmulator
+from noritake.gu600_enums import *
+from noritake.gu600_framebuffer import GU600FrameBuffer, Rectangle, dirty_rectangles
+from noritake.gu600_stream import AREA_COMMAND_SIZE, area_chunks
+
+# Bytes on the wire per driver method, 'write_graphic_area', 'write_graphic' and 'write_text' add their
+# data.
+COMMAND_SIZES: Dict[str, int] = {
+    "set_cursor_position": 3,
+    "clear_all": AREA_COMMAND_SIZE,
+    "set_area": AREA_COMMAND_SIZE,
+    "clear_area": AREA_COMMAND_SIZE,
+    "invert_area": AREA_COMMAND_SIZE,
+    "set_outline": AREA_COMMAND_SIZE,
+    "clear_outline": AREA_COMMAND_SIZE,
+    "set_pixel": 1,
+    "clear_pixel": 1,
+    "draw_line": 4,
+    "write_graphic_area": AREA_COMMAND_SIZE,
+    "write_graphic": 2,
+    "write_text": 3,
+    "write_character": 1,
+    "set_write_mode": 2,
+    "select_font": 1,
+    "select_extended_font": 3,
+    "set_brightness": 2,
+    "select_window1": 2,
+    "select_window2": 2,
+}
+
+# Number of primitives after which the planner extrapolates their cost to decide whether to go on.
+ESTIMATE_AFTER = 16
+
+BITMAP_WRITE_MODE = (
+    GraphicOrientation.ORIENTATION_HORIZONTAL,
+    CursorMovement.MOVEMENT_HORIZONTAL,
+    CursorDirection.DIRECTION_FORWARD,
+    UnderScoreCursor.UNDERSCORECURSOR_STATICOFF,
+    PenType.PENTYPE_OVER,
+)
+
+
+class Operation(NamedTuple):
+    """A driver call, 'method' with 'args', planned for later execution."""
+
+    method: str
+    args: Tuple[Any, ...] = ()
+
+    @property
+    def size(self) -> int:
+        """Number of bytes the operation sends, at most; the driver may leave out commands that would not
+        change the display state."""
+        size = COMMAND_SIZES.get(self.method)
+        if size is None:
+            # The display size only matters to 'clear_all', which is listed.
+            recorder = GU600CommsRecorder()
+            self.apply(GU600Driver(recorder, GU600Config(0, 0)))
+            return len(recorder.data)
+        if self.method == "write_graphic_area":
+            size += len(self.args[4])
+        elif self.method == "write_graphic":
+            size += len(self.args[0])
+        elif self.method == "write_text":
+            size += len(self.args[2])
+        return size
+
+    def apply(self, driver: GU600Driver) -> bool:
+        return bool(getattr(driver, self.method)(*self.args))
+
+
+def plan_size(operations: List[Operation]) -> int:
+    """Number of bytes a list of operations sends."""
+    return sum(operation.size for operation in operations)
+
+
+def apply(driver: GU600Driver, operations: List[Operation]) -> bool:
+    """Send a list of operations to 'driver'."""
+    result = True
+    for operation in operations:
+        result &= operation.apply(driver)
+    return result
+
+
+def render(
+    config: GU600Config, previous: np.ndarray, operations: List[Operation]
+) -> np.ndarray:
+    """Return the frame the emulator shows after applying 'operations' to 'previous'."""
+    emulator = GU600CommsEmulator(config)
+    emulator.pixels[:] = previous
+    apply(GU600Driver(emulator, config), operations)
+    return np.array(emulator.pixels)
+
+
+def plan(previous: np.ndarray, current: np.ndarray) -> List[Operation]:
+    """Plan the operations that turn the frame 'previous' into 'current', both boolean arrays of shape
+    (height, width), sending as few bytes as possible. Each changed region is either drawn with filled,
+    cleared and inverted rectangles, outlines, diagonal lines and single pixels, or written as bitmap,
+    whichever is cheaper; one plan drawing the bounding box of all changes with primitives is tried too.
+    Operations that draw move the cursor, and bitmaps need horizontal orientation and pen type 'over',
+    so a plan including bitmaps sets the write mode."""
+    previous = np.asarray(previous, dtype=bool)
+    current = np.asarray(current, dtype=bool)
+    height, width = current.shape
+    changed = np.argwhere(previous != current)
+    if changed.size == 0:
+        return []
+
+    operations: List[Operation] = []
+    for first, top, last, bottom in dirty_rectangles(
+        np.packbits(previous, axis=1), np.packbits(current, axis=1)
+    ):
+        left, right = first * 8, min(last * 8 + 7, width - 1)
+        data = np.packbits(current[top : bottom + 1, left : right + 1], axis=1)
+        bitmap = [
+            Operation("write_graphic_area", chunk)
+            for chunk in area_chunks(left, top, right, data)
+        ]
+        primitives = _primitives(
+            previous, current, (left, top, right, bottom), plan_size(bitmap) - 1
+        )
+        operations.extend(bitmap if primitives is None else primitives)
+    if any(operation.method == "write_graphic_area" for operation in operations):
+        operations.insert(0, Operation("set_write_mode", BITMAP_WRITE_MODE))
+
+    (top, left), (bottom, right) = changed.min(axis=0), changed.max(axis=0)
+    bounds = (int(left), int(top), int(right), int(bottom))
+    primitives = _primitives(previous, current, bounds, plan_size(operations) - 1)
+    return operations if primitives is None else primitives
+
+
+class _Candidate(NamedTuple):
+    operations: List[Operation]
+    ys: np.ndarray
+    xs: np.ndarray
+
+
+def _primitives(
+    previous: np.ndarray, current: np.ndarray, bounds: Rectangle, limit: int
+) -> Optional[List[Operation]]:
+    """Greedily cover the changes within 'bounds' with drawing primitives, taking at every step the one
+    changing the most pixels per byte around the first pixel still wrong. Returns None as soon as the
+    operations exceed 'limit' bytes, or are on course to do so."""
+    left, top, right, bottom = bounds
+    target = current[top : bottom + 1, left : right + 1]
+    targets = (~target, target)
+    need = previous[top : bottom + 1, left : right + 1] != target
+    flat = need.ravel()
+    remaining = int(flat.sum())
+    fixed = 0
+    operations: List[Operation] = []
+    size = 0
+    position = 0
+    while True:
+        # Primitives only change pixels after the one they fix, so the search can continue from there.
+        position += int(np.argmax(flat[position:]))
+        if not flat[position]:
+            return operations
+        y, x = divmod(position, need.shape[1])
+        best = max(
+            _candidates(need, targets, x, y, left, top),
+            key=lambda c: (
+                need[c.ys, c.xs].sum() / plan_size(c.operations),
+                -plan_size(c.operations),
+            ),
+        )
+        covered = int(need[best.ys, best.xs].sum())
+        fixed += covered
+        remaining -= covered
+        size += plan_size(best.operations)
+        # Give up early when the rate so far would not fix the remaining pixels within the limit.
+        if size > limit or (
+            len(operations) >= ESTIMATE_AFTER
+            and size + remaining * size / fixed > limit
+        ):
+            return None
+        operations.extend(best.operations)
+        # Every pixel a candidate draws is right afterwards.
+        need[best.ys, best.xs] = False
+
+
+def _candidates(
+    need: np.ndarray,
+    targets: Tuple[np.ndarray, np.ndarray],
+    x: int,
+    y: int,
+    left: int,
+    top: int,
+) -> List[_Candidate]:
+    """Return the primitives that fix the pixel at x, y of a region whose top left corner is at left, top
+    on the display, without breaking any pixel that is right already. 'targets' holds the pixels to be
+    cleared and those to be illuminated."""
+    target = targets[1]
+    on = bool(target[y, x])
+    allowed = targets[on]
+    candidates = []
+    for mask, method in (
+        (allowed, "set_area" if on else "clear_area"),
+        (need, "invert_area"),
+    ):
+        for x1, y1 in _rectangles(mask, x, y):
+            ys, xs = np.mgrid[y : y1 + 1, x : x1 + 1]
+            rectangle = (left + x, top + y, left + x1, top + y1)
+            candidates.append(
+                _Candidate([Operation(method, rectangle)], ys.ravel(), xs.ravel())
+            )
+
+    width, height = _run(allowed[y, x:]), _run(allowed[y:, x])
+    x1, y1 = x + width - 1, y + height - 1
+    if (
+        width >= 3
+        and height >= 3
+        and allowed[y1, x : x1 + 1].all()
+        and allowed[y : y1 + 1, x1].all()
+    ):
+        columns, rows = np.arange(x, x1 + 1), np.arange(y + 1, y1)
+        ys = np.concatenate((np.full(width, y), np.full(width, y1), rows, rows))
+        xs = np.concatenate(
+            (columns, columns, np.full(height - 2, x), np.full(height - 2, x1))
+        )
+        rectangle = (left + x, top + y, left + x1, top + y1)
+        method = "set_outline" if on else "clear_outline"
+        candidates.append(_Candidate([Operation(method, rectangle)], ys, xs))
+
+    cursor = Operation("set_cursor_position", (left + x, top + y))
+    if on:
+        # Diagonal lines, horizontal and vertical ones are cheaper as areas.
+        for step in (1, -1):
+            n = 1
+            while (
+                y + n < target.shape[0]
+                and 0 <= x + step * n < target.shape[1]
+                and target[y + n, x + step * n]
+            ):
+                n += 1
+            if n > 1:
+                end = (left + x + step * (n - 1), top + y + n - 1)
+                ys, xs = y + np.arange(n), x + step * np.arange(n)
+                line = [cursor, Operation("draw_line", end)]
+                candidates.append(_Candidate(line, ys, xs))
+    pixel = [cursor, Operation("set_pixel" if on else "clear_pixel")]
+    candidates.append(_Candidate(pixel, np.array([y]), np.array([x])))
+    return candidates
+
+
+def _rectangles(mask: np.ndarray, x: int, y: int) -> List[Tuple[int, int]]:
+    """Return the bottom right corners of the rectangles of set entries of 'mask' with their top left
+    corner at x, y, grown first to the right and first downwards."""
+    width = _run(mask[y, x:])
+    height = _run(np.all(mask[y:, x : x + width], axis=1))
+    down = _run(mask[y:, x])
+    across = _run(np.all(mask[y : y + down, x:], axis=0))
+    return [(x + width - 1, y + height - 1), (x + across - 1, y + down - 1)]
+
+
+def _run(mask: np.ndarray) -> int:
+    """Length of the run of set entries a boolean vector starts with."""
+    stops = np.flatnonzero(~mask)
+    return int(stops[0]) if stops.size else int(mask.size)
+
+
+class GU600PlannedFrameBuffer(GU600FrameBuffer):
+    """Frame buffer whose 'flush' sends the operations 'plan' finds for the changes since the last flush,
+    rather than bitmaps only. The first flush, and any after 'invalidate', sends the entire frame."""
+
+    def flush(self) -> bool:
+        if not self._valid:
+            return super().flush()
+        previous = np.unpackbits(self._shadow, axis=1)[:, : self.width].astype(bool)
+        result = apply(self._driver, plan(previous, self.pixels))
+        self._shadow[:] = self._buffer
+        return result
@@ -0,0 +1,123 @@
+import time
+from bisect import bisect_left
+from typing import Callable, Dict, List, NamedTuple, Optional, Tuple
+
+from noritake.gu600_comms import GU600Comms, Message, as_buffer
+from noritake.gu600_emulator import GU600CommandSplitter
+
+# Upper bounds in seconds of the write latency histogram buckets, the last bucket takes the rest.
+LATENCY_BUCKETS = (0.00001, 0.0001, 0.001, 0.01, 0.1)
+
+WriteCallback = Callable[[int, int, float], None]
+
+
+def opcode(message: Message) -> int:
+    """Return the command a message starts with; escape commands (1BH) are returned as 1BxxH."""
+    data = as_buffer(message)
+    if len(data) == 0:
+        return -1
+    if data[0] == 0x1B and len(data) > 1:
+        return 0x1B00 | data[1]
+    return data[0]
+
+
+class GU600LinkStats(NamedTuple):
+    """Snapshot of the counters of a 'GU600CommsInstrumented'."""
+
+    writes: int
+    bytes: int
+    failures: int
+    opcodes: Dict[int, Tuple[int, int]]
+    latency_buckets: Tuple[float, ...]
+    latency_counts: List[int]
+    max_latency: float
+    backlog: int
+
+
+class GU600CommsInstrumented(GU600Comms):
+    """Count calls and bytes per command and record a write latency histogram for another communications
+    channel. Writes are split into commands, so every command of a batched transfer is counted, once it
+    is complete; characters (20H and up) count towards the command before them within the same write,
+    such as the cursor command of 'write_text'. Callbacks receive the opcode a write starts with, its
+    size and latency. When disabled, writes are passed through without any bookkeeping."""
+
+    def __init__(self, comms_link: GU600Comms, enabled: bool = True) -> None:
+        self._comms_link = comms_link
+        self._callbacks: List[WriteCallback] = []
+        self.enabled = enabled
+        self.reset()
+
+    @property
+    def comms_link(self) -> GU600Comms:
+        return self._comms_link
+
+    def reset(self) -> None:
+        """Clear all counters."""
+        self._writes = 0
+        self._bytes = 0
+        self._failures = 0
+        self._opcodes: Dict[int, List[int]] = {}
+        self._splitter = GU600CommandSplitter()
+        self._latency_counts = [0] * (len(LATENCY_BUCKETS) + 1)
+        self._max_latency = 0.0
+
+    def add_callback(self, callback: WriteCallback) -> None:
+        self._callbacks.append(callback)
+
+    def remove_callback(self, callback: WriteCallback) -> None:
+        self._callbacks.remove(callback)
+
+    def write(self, message: Message) -> bool:
+        if not self.enabled:
+            return self._comms_link.write(message)
+        data = as_buffer(message)
+        start = time.perf_counter()
+        result = self._comms_link.write(data)
+        self._record(data, result, time.perf_counter() - start)
+        return result
+
+    def read(self, count: int, timeout: float = 0.0) -> List[int]:
+        return self._comms_link.read(count, timeout)
+
+    def xfer(self, message: Message, count: int, timeout: float = 0.0) -> List[int]:
+        if not self.enabled:
+            return self._comms_link.xfer(message, count, timeout)
+        data = as_buffer(message)
+        start = time.perf_counter()
+        response = self._comms_link.xfer(data, count, timeout)
+        self._record(data, True, time.perf_counter() - start)
+        return response
+
+    def stats(self) -> GU600LinkStats:
+        """Return a snapshot of the counters. The backlog is the queue depth, or the number of pending bytes,
+        of the wrapped channel if it has one."""
+        backlog = getattr(
+            self._comms_link, "depth", getattr(self._comms_link, "pending", 0)
+        )
+        return GU600LinkStats(
+            writes=self._writes,
+            bytes=self._bytes,
+            failures=self._failures,
+            opcodes={code: (c[0], c[1]) for code, c in self._opcodes.items()},
+            latency_buckets=LATENCY_BUCKETS,
+            latency_counts=list(self._latency_counts),
+            max_latency=self._max_latency,
+            backlog=int(backlog),
+        )
+
+    def _record(self, data: Message, result: bool, latency: float) -> None:
+        size = len(as_buffer(data))
+        self._writes += 1
+        self._bytes += size
+        self._failures += not result
+        current: Optional[int] = None
+        for command in self._splitter.split(data):
+            if command[0] < 0x20 or current is None:
+                current = opcode(command)
+                self._opcodes.setdefault(current, [0, 0])[0] += 1
+            self._opcodes[current][1] += len(command)
+        self._latency_counts[bisect_left(LATENCY_BUCKETS, latency)] += 1
+        self._max_latency = max(self._max_latency, latency)
+        code = opcode(data)
+        for callback in self._callbacks:
+            callback(code, size, latency)
@@ -0,0 +1,103 @@
+from itertools import islice
+from typing import Iterable, Iterator, NamedTuple, Optional, Union
+
+import numpy as np
+
+from noritake.gu600_comms import MAX_MESSAGE_SIZE, Message, as_buffer
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_enums import *
+
+# Size of the graphic area command (1FH) without its data.
+AREA_COMMAND_SIZE = 5
+MAX_COORDINATE = 0xFF
+
+
+class AreaChunk(NamedTuple):
+    """Arguments of one 'write_graphic_area' call."""
+
+    left: int
+    top: int
+    right: int
+    bottom: int
+    data: bytes
+
+
+def image_rows(image: np.ndarray) -> Iterator[bytes]:
+    """Pack a boolean image of shape (height, width) row by row, 8 horizontal pixels per byte with D7
+    leftmost."""
+    for row in np.asarray(image, dtype=bool):
+        yield np.packbits(row).tobytes()
+
+
+def area_chunks(
+    left: int,
+    top: int,
+    right: int,
+    rows: Iterable[Message],
+    max_message_size: int = MAX_MESSAGE_SIZE,
+) -> Iterator[AreaChunk]:
+    """Split packed rows of horizontal graphic data for the columns 'left' to 'right', the first row going
+    to 'top', into bands of whole rows whose graphic area commands take at most 'max_message_size'
+    bytes. Rows are consumed as the chunks are, so only one chunk is held in memory."""
+    stride = (right - left + 8) // 8
+    band = (max_message_size - AREA_COMMAND_SIZE) // stride
+    if right < left or band < 1:
+        raise ValueError(
+            f"A row of {right - left + 1} pixels does not fit into {max_message_size} bytes."
+        )
+    if not (0 <= left and right <= MAX_COORDINATE and 0 <= top):
+        raise ValueError(f"Area {left}, {top}, {right} is outside 0-{MAX_COORDINATE}.")
+    buffer = bytearray(band * stride)
+    count = 0
+    for row in rows:
+        data = as_buffer(row)
+        if len(data) != stride:
+            raise ValueError(f"Row of {len(data)} bytes where {stride} are expected.")
+        buffer[count * stride : (count + 1) * stride] = data
+        count += 1
+        if count == band:
+            yield _chunk(left, top, right, count, buffer)
+            top += count
+            count = 0
+    if count:
+        yield _chunk(left, top, right, count, buffer[: count * stride])
+
+
+def write_image(
+    driver: GU600Driver,
+    x: int,
+    y: int,
+    image: Union[np.ndarray, Iterable[Message]],
+    width: Optional[int] = None,
+    max_message_size: int = MAX_MESSAGE_SIZE,
+) -> bool:
+    """Write an image of any height with its top left corner at x, y, as a sequence of graphic area
+    commands within 'max_message_size'. The image is a boolean array of shape (height, width), or an
+    iterable of packed rows, see 'area_chunks', in which case 'width' must be given. Rows falling above
+    or below the display are left out, and rows after the last visible one are not consumed. The write
+    mode is set to horizontal orientation and pen type 'over' beforehand."""
+    if isinstance(image, np.ndarray):
+        width = image.shape[1]
+        rows: Iterable[Message] = image_rows(image)
+    else:
+        rows = image
+    if width is None:
+        raise ValueError("The width of an image given as rows is required.")
+    result = driver.set_write_mode(
+        GraphicOrientation.ORIENTATION_HORIZONTAL,
+        CursorMovement.MOVEMENT_HORIZONTAL,
+        CursorDirection.DIRECTION_FORWARD,
+        UnderScoreCursor.UNDERSCORECURSOR_STATICOFF,
+        PenType.PENTYPE_OVER,
+    )
+    visible = islice(rows, max(-y, 0), max(driver.config.height - y, 0))
+    for chunk in area_chunks(x, max(y, 0), x + width - 1, visible, max_message_size):
+        result &= driver.write_graphic_area(*chunk)
+    return result
+
+
+def _chunk(left: int, top: int, right: int, count: int, data: bytearray) -> AreaChunk:
+    bottom = top + count - 1
+    if bottom > MAX_COORDINATE:
+        raise ValueError(f"Row {bottom} is outside 0-{MAX_COORDINATE}.")
+    return AreaChunk(left, top, right, bottom, bytes(data))
@@ -0,0 +1,97 @@
+from typing import List, Optional, Tuple
+
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_fonts import DEFAULT_FONT, GU600Font
+from noritake.gu600_stream import AREA_COMMAND_SIZE
+
+CURSOR_COMMAND_SIZE = 3
+
+
+class GU600TextField:
+    """A text field of 'length' characters with its cursor, the bottom left corner of the first character,
+    at x, y. The field remembers what it shows and, for fixed spaced fonts, only rewrites the characters
+    that change. Proportional text is rewritten entirely, and whatever the previous text covered beyond
+    it is cleared. The font has to be selected on the display beforehand."""
+
+    def __init__(
+        self,
+        driver: GU600Driver,
+        x: int,
+        y: int,
+        length: int,
+        font: GU600Font = DEFAULT_FONT,
+    ) -> None:
+        self._driver = driver
+        self._x = x
+        self._y = y
+        self._length = length
+        self._font = font
+        self._text: Optional[str] = None
+        self._last_bytes = 0
+
+    @property
+    def text(self) -> Optional[str]:
+        """The text shown, None if unknown."""
+        return self._text
+
+    @property
+    def last_bytes(self) -> int:
+        """Number of bytes the last update sent."""
+        return self._last_bytes
+
+    def invalidate(self) -> None:
+        """Forget what the field shows, the next update rewrites the entire field."""
+        self._text = None
+
+    def update(self, text: str) -> bool:
+        """Show 'text', padded with spaces or truncated to the length of the field."""
+        text = text[: self._length].ljust(self._length)
+        self._last_bytes = 0
+        if text == self._text:
+            return True
+        result = True
+        if self._font.proportional:
+            result &= self._clear_beyond(text)
+            runs = [(0, self._length)]
+        elif self._text is None:
+            runs = [(0, self._length)]
+        else:
+            runs = self._changed_runs(self._text, text)
+        advance = self._font.advance(0x20)
+        for start, end in runs:
+            saved = self._driver.bytes_saved
+            result &= self._driver.write_text(
+                self._x + start * advance, self._y, text[start:end]
+            )
+            sent = CURSOR_COMMAND_SIZE + end - start
+            self._last_bytes += sent - (self._driver.bytes_saved - saved)
+        self._text = text
+        return result
+
+    def _clear_beyond(self, text: str) -> bool:
+        """Clear what the text shown covers to the right of 'text', all the field may cover if unknown."""
+        if self._text is None:
+            extent = self._length * (self._font.width + self._font.spacing)
+        else:
+            extent = self._font.text_width(self._text)
+        left = self._x + self._font.text_width(text)
+        right = min(self._x + extent, self._driver.config.width) - 1
+        if right < left:
+            return True
+        self._last_bytes += AREA_COMMAND_SIZE
+        top = max(self._y - self._font.height + 1, 0)
+        return self._driver.clear_area(left, top, right, self._y)
+
+    @staticmethod
+    def _changed_runs(old: str, new: str) -> List[Tuple[int, int]]:
+        """Return (start, end) of runs of changed characters. Runs separated by fewer unchanged characters
+        than a cursor command costs are joined."""
+        runs: List[Tuple[int, int]] = []
+        for index, (a, b) in enumerate(zip(old, new)):
+            if a == b:
+                continue
+            if runs and index - runs[-1][1] <= CURSOR_COMMAND_SIZE:
+                runs[-1] = (runs[-1][0], index + 1)
+            else:
+                runs.append((index, index + 1))
+        return runs
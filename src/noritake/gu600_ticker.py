@@ -0,0 +1,161 @@
+from typing import List, Optional
+
+from noritake import gu600_encoder as enc
+from noritake.gu600_comms import MAX_MESSAGE_SIZE
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_enums import *
+from noritake.gu600_fonts import DEFAULT_FONT, GU600Font
+from noritake.gu600_planner import Operation, apply, plan_size
+from noritake.gu600_text import GU600TextField
+
+# Longest text the scroll text command (1BH 90H mode count text 00H) carries within one message.
+MAX_SCROLL_TEXT = MAX_MESSAGE_SIZE - 5
+SCROLL_SPEED = ScrollSpeed.SCROLLSPEED_70HZ
+# Count passed to 'set_scroll_text_in_window'; FFH is taken to repeat forever, as for 'flash_window'.
+SCROLL_FOREVER = 0xFF
+# Put between the end of the text and its start again when scrolling in software.
+SEPARATOR = "   "
+
+
+class GU600Ticker:
+    """A line of text 'width' pixels wide with its cursor, the bottom left corner of the first character,
+    at x, y, that scrolls to the left when the text does not fit. Scrolling is handed to the display,
+    which scrolls the text in window 1 on its own, so a scrolling line takes no bytes after 'set_text'.
+    The ticker scrolls in software instead, one character per 'tick', if the text is longer than the
+    scroll text command takes or 'hardware' is False: window 1 scrolls one text only, so give every
+    other ticker on the display, and any layout using window 1, 'hardware=False'. Text that fits is
+    written once. The font has to be selected on the display beforehand."""
+
+    def __init__(
+        self,
+        driver: GU600Driver,
+        x: int,
+        y: int,
+        width: int,
+        font: GU600Font = DEFAULT_FONT,
+        speed: ScrollSpeed = SCROLL_SPEED,
+        hardware: bool = True,
+        separator: str = SEPARATOR,
+    ) -> None:
+        assert width >= font.advance(0x20)
+        self._driver = driver
+        self._area = (x, y - font.height + 1, x + width - 1, y)
+        self._width = width
+        self._font = font
+        self._speed = speed
+        self._hardware = hardware
+        self._separator = separator
+        self._field = GU600TextField(driver, x, y, width // font.advance(0x20), font)
+        self._text: Optional[str] = None
+        self._scrolling_in_window = False
+        self._cycle: Optional[str] = None
+        self._offset = 0
+        self._last_bytes = 0
+
+    @property
+    def text(self) -> Optional[str]:
+        """The text shown, None if unknown."""
+        return self._text
+
+    @property
+    def scrolling(self) -> bool:
+        """True if the text does not fit and scrolls."""
+        return self._scrolling_in_window or self._cycle is not None
+
+    @property
+    def hardware(self) -> bool:
+        """True if the display scrolls the text on its own."""
+        return self._scrolling_in_window
+
+    @property
+    def last_bytes(self) -> int:
+        """Number of bytes the last 'set_text', 'tick' or 'stop' sent."""
+        return self._last_bytes
+
+    def invalidate(self) -> None:
+        """Forget what the ticker shows, the next 'set_text' sends the text again."""
+        self._text = None
+        self._field.invalidate()
+
+    def set_text(self, text: str) -> bool:
+        """Show 'text', scrolling it if it does not fit."""
+        if text == self._text:
+            self._last_bytes = 0
+            return True
+        operations = self._stop_window()
+        self._text = text
+        self._cycle = None
+        self._offset = 0
+        data = enc.encode_text(text)
+        if self._font.text_width(text) <= self._width:
+            return self._write(operations, text)
+        if not self._hardware or len(data) > MAX_SCROLL_TEXT:
+            self._cycle = text + self._separator
+            return self._write(operations, self._visible())
+        operations += [
+            Operation("clear_area", self._area),
+            Operation("select_window1"),
+            Operation("define_window", self._area),
+            Operation("set_scroll_speed", (self._speed,)),
+            Operation(
+                "set_scroll_text_in_window",
+                (
+                    PadEndOfText.PADENDOFTEXT_ON,
+                    ScrollContents.SCROLLCONTENTS_OFF,
+                    ScrollDirection.SCROLLDIRECTION_LEFT,
+                    SCROLL_FOREVER,
+                    data + b"\x00",
+                ),
+            ),
+            Operation("show_window"),
+        ]
+        self._field.invalidate()
+        self._scrolling_in_window = True
+        return self._apply(operations)
+
+    def tick(self) -> bool:
+        """Scroll the text one character to the left if it scrolls in software; call this at the rate the
+        text should move."""
+        if self._cycle is None:
+            self._last_bytes = 0
+            return True
+        self._offset = (self._offset + 1) % len(self._cycle)
+        return self._write([], self._visible())
+
+    def stop(self) -> bool:
+        """Stop scrolling and clear the line."""
+        operations = self._stop_window() or [Operation("clear_area", self._area)]
+        self._text = None
+        self._cycle = None
+        self._field.invalidate()
+        return self._apply(operations)
+
+    def _stop_window(self) -> List[Operation]:
+        if not self._scrolling_in_window:
+            return []
+        self._scrolling_in_window = False
+        return [
+            Operation("select_window1"),
+            Operation("kill_window"),
+            Operation("clear_area", self._area),
+        ]
+
+    def _visible(self) -> str:
+        assert self._cycle is not None
+        length = self._width // self._font.advance(0x20)
+        repeated = self._cycle * (length // len(self._cycle) + 2)
+        return repeated[self._offset : self._offset + length]
+
+    def _write(self, operations: List[Operation], text: str) -> bool:
+        result = self._apply(operations)
+        result &= self._field.update(text)
+        self._last_bytes += self._field.last_bytes
+        return result
+
+    def _apply(self, operations: List[Operation]) -> bool:
+        """Run 'operations' and set 'last_bytes' to what they sent; the driver leaves out a window
+        selection when the window is selected already."""
+        saved = self._driver.bytes_saved
+        result = apply(self._driver, operations)
+        self._last_bytes = plan_size(operations) - (self._driver.bytes_saved - saved)
+        return result
@@ -0,0 +1,266 @@
+import json
+import os
+from typing import List, NamedTuple, Optional, Sequence
+
+from noritake import gu600_encoder as enc
+from noritake.gu600_comms import (
+    IDLE_BYTES,
+    RESPONSE_TIMEOUT,
+    SPI_SPEED_HZ,
+    GU600Comms,
+    GU600CommsSPI,
+    Message,
+    as_buffer,
+)
+from noritake.gu600_emulator import GU600CommandSplitter
+
+# Clock rates tried by 'calibrate', the first one is known to work on every board.
+SPI_SPEEDS = (
+    SPI_SPEED_HZ,
+    750000,
+    1000000,
+    1250000,
+    1500000,
+    2000000,
+    3000000,
+    4000000,
+)
+# The speed chosen is the fastest one tried at or below this fraction of the fastest that passed.
+SAFETY_MARGIN = 0.8
+TRIALS = 8
+PAYLOAD_SIZE = 252
+# Number of bytes 'GU600CommsAdaptive' writes between two checksum verifications.
+CHECK_INTERVAL = 4096
+# Dummy bytes that complete any command a corrupted transfer may have left open, the longest being a
+# graphic area command (1FH) of 256x256 pixels.
+RESYNC_SIZE = 5 + 256 * 256 // 8
+CALIBRATION_FILE = os.path.join("~", ".config", "noritake", "gu600_spi.json")
+
+
+class GU600Calibration(NamedTuple):
+    """Outcome of 'calibrate': the clock rate to use, the fastest one that passed, and the value the
+    checksum has right after being cleared, which is the sum of the checksum command if the display
+    counts it."""
+
+    speed_hz: int
+    max_speed_hz: int
+    checksum_offset: int
+
+
+def calibration_payload(size: int, seed: int = 0) -> bytes:
+    """Return 'size' bytes, rounded down to whole commands, of cursor positioning commands (10H) with
+    coordinates covering many bit patterns. They leave the display contents alone, and the last one
+    returns the cursor to 0, 0."""
+    commands = [
+        bytes((0x10, (i * 37 + seed * 11) & 0xFF, (i * 101 + seed * 29) & 0xFF))
+        for i in range(size // 3 - 1)
+    ]
+    commands.append(bytes((0x10, 0, 0)))
+    return b"".join(commands)
+
+
+def checksum_offset(
+    comms_link: GU600Comms, timeout: float = RESPONSE_TIMEOUT
+) -> Optional[int]:
+    """Clear the checksum, then read it once more; returns None if the display does not answer."""
+    comms_link.xfer(enc.CHECKSUM, 1, timeout)
+    response = comms_link.xfer(enc.CHECKSUM, 1, timeout)
+    return response[0] if response else None
+
+
+def check_speed(
+    comms_link: GU600CommsSPI,
+    speed_hz: int,
+    offset: int,
+    trials: int = TRIALS,
+    payload_size: int = PAYLOAD_SIZE,
+    timeout: float = RESPONSE_TIMEOUT,
+) -> bool:
+    """Send 'trials' test payloads at 'speed_hz' and return True if the display received every one
+    intact, judged by its checksum."""
+    comms_link.speed_hz = speed_hz
+    comms_link.xfer(enc.CHECKSUM, 1, timeout)
+    for trial in range(trials):
+        payload = calibration_payload(payload_size, trial)
+        comms_link.write(payload)
+        response = comms_link.xfer(enc.CHECKSUM, 1, timeout)
+        if not _matches(response, (sum(payload) + offset) & 0xFF):
+            return False
+    return True
+
+
+def _matches(response: List[int], checksum: int) -> bool:
+    # Over SPI a checksum equal to an idle byte reads as no answer at all.
+    return response == [checksum] or (not response and checksum in IDLE_BYTES)
+
+
+def resynchronise(comms_link: GU600Comms) -> bool:
+    """Send enough dummy bytes to complete any command a corrupted transfer left the display in."""
+    return comms_link.write(bytes(RESYNC_SIZE))
+
+
+def calibrate(
+    comms_link: GU600CommsSPI,
+    speeds: Sequence[int] = SPI_SPEEDS,
+    trials: int = TRIALS,
+    payload_size: int = PAYLOAD_SIZE,
+    margin: float = SAFETY_MARGIN,
+    eeprom_locked: bool = False,
+) -> GU600Calibration:
+    """Find the fastest SPI clock rate the display reliably receives at. The speeds are tried in rising
+    order, up to the first one at which a test payload arrives corrupted, after which the display is
+    resynchronised at the slowest speed; the checksum offset is measured at the slowest. The EEPROM is
+    locked meanwhile, so corrupted bytes cannot store macros or settings, and unlocked afterwards unless
+    'eeprom_locked' tells it was locked before, which the display cannot report. The link is left at the
+    speed chosen."""
+    speeds = sorted(speeds)
+    comms_link.speed_hz = speeds[0]
+    comms_link.write(enc.LOCK_EEPROM)
+    try:
+        offset = checksum_offset(comms_link)
+        if offset is None:
+            raise RuntimeError("Display does not answer checksum requests.")
+        fastest = None
+        for speed in speeds:
+            if not check_speed(comms_link, speed, offset, trials, payload_size):
+                comms_link.speed_hz = speeds[0]
+                resynchronise(comms_link)
+                break
+            fastest = speed
+    finally:
+        comms_link.speed_hz = speeds[0]
+        if not eeprom_locked:
+            comms_link.write(enc.UNLOCK_EEPROM)
+    if fastest is None:
+        raise RuntimeError(f"Transfers fail even at {speeds[0]}Hz.")
+    speed_hz = max(s for s in speeds if s <= fastest * margin or s == speeds[0])
+    comms_link.speed_hz = speed_hz
+    return GU600Calibration(speed_hz, fastest, offset)
+
+
+def device_name(comms_link: GU600CommsSPI) -> str:
+    return f"spi{comms_link.spi_num}.{comms_link.spi_ce}"
+
+
+def load_calibration(
+    device: str, path: str = CALIBRATION_FILE
+) -> Optional[GU600Calibration]:
+    """Return the calibration stored for 'device', or None."""
+    try:
+        with open(os.path.expanduser(path)) as fh:
+            entry = json.load(fh).get(device)
+    except FileNotFoundError:
+        return None
+    return None if entry is None else GU600Calibration(**entry)
+
+
+def save_calibration(
+    device: str, calibration: GU600Calibration, path: str = CALIBRATION_FILE
+) -> None:
+    """Store the calibration of 'device', keeping those of other devices."""
+    path = os.path.expanduser(path)
+    try:
+        with open(path) as fh:
+            calibrations = json.load(fh)
+    except FileNotFoundError:
+        calibrations = {}
+    calibrations[device] = calibration._asdict()
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as fh:
+        json.dump(calibrations, fh, indent=2)
+
+
+def tune(
+    comms_link: GU600CommsSPI,
+    device: Optional[str] = None,
+    path: str = CALIBRATION_FILE,
+    recalibrate: bool = False,
+    eeprom_locked: bool = False,
+) -> GU600Calibration:
+    """Set the link to the speed stored for the device, calibrating and storing it first if there is
+    none. 'device' defaults to the SPI bus and chip select, name boards explicitly if they are swapped."""
+    device = device or device_name(comms_link)
+    calibration = None if recalibrate else load_calibration(device, path)
+    if calibration is None:
+        calibration = calibrate(comms_link, eeprom_locked=eeprom_locked)
+        save_calibration(device, calibration, path)
+    comms_link.speed_hz = calibration.speed_hz
+    return calibration
+
+
+class GU600CommsAdaptive(GU600Comms):
+    """Verify transfers over SPI against the display checksum every 'check_interval' bytes, and lower the
+    clock rate to the next of 'speeds' on a mismatch. The write that detects a mismatch returns False,
+    as data sent since the previous verification may have been corrupted."""
+
+    def __init__(
+        self,
+        comms_link: GU600CommsSPI,
+        check_interval: int = CHECK_INTERVAL,
+        speeds: Sequence[int] = SPI_SPEEDS,
+        timeout: float = RESPONSE_TIMEOUT,
+    ) -> None:
+        self._comms_link = comms_link
+        self._check_interval = check_interval
+        self._speeds = sorted(speeds)
+        self._timeout = timeout
+        self._mismatches = 0
+        self._sum = 0
+        self._unverified = 0
+        self._splitter = GU600CommandSplitter()
+        offset = checksum_offset(comms_link, timeout)
+        if offset is None:
+            raise RuntimeError("Display does not answer checksum requests.")
+        self._offset = offset
+
+    @property
+    def comms_link(self) -> GU600CommsSPI:
+        return self._comms_link
+
+    @property
+    def mismatches(self) -> int:
+        """Number of failed verifications so far."""
+        return self._mismatches
+
+    def write(self, message: Message) -> bool:
+        data = as_buffer(message)
+        result = self._comms_link.write(data)
+        self._count(data)
+        # A checksum command sent within an incomplete command would be taken for its data.
+        if self._unverified >= self._check_interval and not self._splitter.pending:
+            result &= self.verify()
+        return result
+
+    def read(self, count: int, timeout: float = 0.0) -> List[int]:
+        return self._comms_link.read(count, timeout)
+
+    def xfer(self, message: Message, count: int, timeout: float = 0.0) -> List[int]:
+        data = as_buffer(message)
+        response = self._comms_link.xfer(data, count, timeout)
+        self._count(data)
+        return response
+
+    def verify(self) -> bool:
+        """Compare the display checksum with the bytes sent since the previous verification, backing off on a
+        mismatch."""
+        response = self._comms_link.xfer(enc.CHECKSUM, 1, self._timeout)
+        expected = (self._sum + self._offset) & 0xFF
+        self._sum, self._unverified = 0, 0
+        if _matches(response, expected):
+            return True
+        self._mismatches += 1
+        slower = [s for s in self._speeds if s < self._comms_link.speed_hz]
+        if slower:
+            self._comms_link.speed_hz = slower[-1]
+        return False
+
+    def _count(self, data: Message) -> None:
+        """Add 'data' to the bytes to verify; a checksum command (1BH 43H) within it, such as the one
+        'query_checksum' sends, clears the display checksum, so counting starts again after it. Commands
+        may be split across writes and are counted once complete."""
+        for command in self._splitter.split(data):
+            if command == enc.CHECKSUM:
+                self._sum, self._unverified = 0, 0
+            else:
+                self._sum += sum(command)
+                self._unverified += len(command)
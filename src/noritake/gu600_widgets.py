@@ -0,0 +1,259 @@
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_stream import AREA_COMMAND_SIZE
+
+# Level shown empty by 'GU600LevelMeter', in dB.
+FLOOR_DB = -48.0
+# Number of updates 'GU600LevelMeter' holds a peak for before it falls back to the level.
+PEAK_HOLD = 20
+
+AreaCommand = Callable[[int, int, int, int], bool]
+
+
+def _changed_runs(old: np.ndarray, new: np.ndarray) -> List[Tuple[int, int, bool]]:
+    """Return (start, end, lit) of runs of pixels along a line that differ and have to be lit or
+    cleared."""
+    runs: List[Tuple[int, int, bool]] = []
+    for index in np.flatnonzero(old != new):
+        lit = bool(new[index])
+        if runs and runs[-1][1] == index and runs[-1][2] == lit:
+            runs[-1] = (runs[-1][0], index + 1, lit)
+        else:
+            runs.append((int(index), int(index) + 1, lit))
+    return runs
+
+
+class GU600Bar:
+    """A bar graph within left, top, right, bottom, filled in proportion to a value from 0 to 'maximum',
+    from the left or, if 'vertical', from the bottom. Once drawn, an update only lights or clears the
+    pixels between the old and new length, one 5 byte area command when the bar grows or shrinks."""
+
+    def __init__(
+        self,
+        driver: GU600Driver,
+        left: int,
+        top: int,
+        right: int,
+        bottom: int,
+        maximum: float = 100.0,
+        vertical: bool = False,
+        outline: bool = True,
+    ) -> None:
+        assert maximum > 0
+        self._driver = driver
+        self._area = (left, top, right, bottom)
+        self._outline = outline
+        border = 1 if outline else 0
+        self._inside = (left + border, top + border, right - border, bottom - border)
+        assert right - left >= 2 * border and bottom - top >= 2 * border
+        self._vertical = vertical
+        self._maximum = maximum
+        self._length = (bottom - top if vertical else right - left) + 1 - 2 * border
+        self._value = 0.0
+        self._lit: Optional[np.ndarray] = None
+        self._last_bytes = 0
+
+    @property
+    def value(self) -> float:
+        return self._value
+
+    @property
+    def last_bytes(self) -> int:
+        """Number of bytes the last update sent."""
+        return self._last_bytes
+
+    def invalidate(self) -> None:
+        """Forget what the bar shows, the next update draws it entirely."""
+        self._lit = None
+
+    def draw(self) -> bool:
+        """Draw the bar entirely: clear its area, draw the outline and fill it."""
+        self._last_bytes = 0
+        result = self._area_command(self._driver.clear_area, *self._area)
+        if self._outline:
+            result &= self._area_command(self._driver.set_outline, *self._area)
+        self._lit = np.zeros(self._length, dtype=bool)
+        return result & self._show()
+
+    def update(self, value: float) -> bool:
+        """Show 'value', clamped to 0 to 'maximum'."""
+        self._value = min(max(value, 0.0), self._maximum)
+        if self._lit is None:
+            return self.draw()
+        self._last_bytes = 0
+        return self._show()
+
+    def _pixels(self) -> np.ndarray:
+        """Return the pixels of the bar to light, from its start."""
+        lit = np.zeros(self._length, dtype=bool)
+        lit[: round(self._value / self._maximum * self._length)] = True
+        return lit
+
+    def _show(self) -> bool:
+        assert self._lit is not None
+        lit = self._pixels()
+        result = True
+        left, top, right, bottom = self._inside
+        for start, end, on in _changed_runs(self._lit, lit):
+            command = self._driver.set_area if on else self._driver.clear_area
+            if self._vertical:
+                result &= self._area_command(
+                    command, left, bottom - end + 1, right, bottom - start
+                )
+            else:
+                result &= self._area_command(
+                    command, left + start, top, left + end - 1, bottom
+                )
+        self._lit = lit
+        return result
+
+    def _area_command(
+        self, command: AreaCommand, left: int, top: int, right: int, bottom: int
+    ) -> bool:
+        self._last_bytes += AREA_COMMAND_SIZE
+        return command(left, top, right, bottom)
+
+
+class GU600LevelMeter(GU600Bar):
+    """A bar showing a level in dB from 'floor' to 0dB, with a marker on the highest level of the last
+    'hold' updates. An update takes one area command for the bar and up to two to move the marker."""
+
+    def __init__(
+        self,
+        driver: GU600Driver,
+        left: int,
+        top: int,
+        right: int,
+        bottom: int,
+        floor: float = FLOOR_DB,
+        hold: int = PEAK_HOLD,
+        vertical: bool = False,
+        outline: bool = True,
+    ) -> None:
+        assert floor < 0 and hold >= 0
+        super().__init__(driver, left, top, right, bottom, -floor, vertical, outline)
+        self._floor = floor
+        self._hold = hold
+        self._peak = 0
+        self._peak_age = 0
+
+    @property
+    def level(self) -> float:
+        """The level shown, in dB."""
+        return self._value + self._floor
+
+    def update(self, level: float) -> bool:
+        """Show 'level' in dB, clamped to 'floor' to 0dB."""
+        return super().update(level - self._floor)
+
+    def _pixels(self) -> np.ndarray:
+        lit = super()._pixels()
+        length = int(np.count_nonzero(lit))
+        if length >= self._peak or self._peak_age >= self._hold:
+            self._peak, self._peak_age = length, 0
+        else:
+            self._peak_age += 1
+        if self._peak:
+            lit[self._peak - 1] = True
+        return lit
+
+
+class GU600Sparkline:
+    """A line graph of the last samples within left, top, right, bottom, one sample per column from
+    'minimum' at the bottom to 'maximum' at the top. The graph sweeps: each sample is drawn in the
+    column after the previous one, wrapping to the left edge, and the 'gap' columns ahead of it are
+    cleared to mark the newest sample. Only the pixels of those columns that change are sent, typically
+    two area commands per sample. A sample is drawn as a vertical line joining it to the previous one,
+    or as a column filled from the bottom if 'filled'."""
+
+    def __init__(
+        self,
+        driver: GU600Driver,
+        left: int,
+        top: int,
+        right: int,
+        bottom: int,
+        minimum: float = 0.0,
+        maximum: float = 1.0,
+        filled: bool = False,
+        gap: int = 1,
+    ) -> None:
+        assert maximum > minimum and right >= left and bottom >= top
+        assert 0 <= gap < right - left + 1
+        self._driver = driver
+        self._left = left
+        self._top = top
+        self._minimum = minimum
+        self._maximum = maximum
+        self._filled = filled
+        self._gap = gap
+        self._shown: Optional[np.ndarray] = None
+        self._height = bottom - top + 1
+        self._width = right - left + 1
+        self._column = -1
+        self._previous: Optional[int] = None
+        self._last_bytes = 0
+
+    @property
+    def last_bytes(self) -> int:
+        """Number of bytes the last update sent."""
+        return self._last_bytes
+
+    def invalidate(self) -> None:
+        """Forget what the graph shows, the next update clears it first."""
+        self._shown = None
+
+    def clear(self) -> bool:
+        """Clear the graph and start again at its left edge."""
+        self._shown = np.zeros((self._height, self._width), dtype=bool)
+        self._column = -1
+        self._previous = None
+        self._last_bytes = AREA_COMMAND_SIZE
+        return self._driver.clear_area(
+            self._left,
+            self._top,
+            self._left + self._width - 1,
+            self._top + self._height - 1,
+        )
+
+    def update(self, value: float) -> bool:
+        """Draw the next sample."""
+        result = True
+        if self._shown is None:
+            result &= self.clear()
+        else:
+            self._last_bytes = 0
+        fraction = (min(max(value, self._minimum), self._maximum) - self._minimum) / (
+            self._maximum - self._minimum
+        )
+        row = self._height - 1 - round(fraction * (self._height - 1))
+        self._column = (self._column + 1) % self._width
+        column = np.zeros(self._height, dtype=bool)
+        if self._filled:
+            column[row:] = True
+        elif self._previous is None or self._column == 0:
+            column[row] = True
+        else:
+            column[min(row, self._previous) : max(row, self._previous) + 1] = True
+        self._previous = row
+        result &= self._draw_column(self._column, column)
+        for offset in range(1, self._gap + 1):
+            result &= self._draw_column(
+                (self._column + offset) % self._width,
+                np.zeros(self._height, dtype=bool),
+            )
+        return result
+
+    def _draw_column(self, index: int, column: np.ndarray) -> bool:
+        assert self._shown is not None
+        result = True
+        x = self._left + index
+        for start, end, on in _changed_runs(self._shown[:, index], column):
+            command = self._driver.set_area if on else self._driver.clear_area
+            result &= command(x, self._top + start, x, self._top + end - 1)
+            self._last_bytes += AREA_COMMAND_SIZE
+        self._shown[:, index] = column
+        return result
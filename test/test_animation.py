@@ -0,0 +1,125 @@
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import pytest
+
+from noritake.gu600_animation import GU600AnimationPlayer, GU600AnimationWriter
+from noritake.gu600_comms import Message
+from noritake.gu600_config import GU600Config
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_emulator import GU600CommsEmulator
+
+CONFIG = GU600Config(240, 64)
+FPS = 25.0
+
+
+def _frames(count: int) -> List[np.ndarray]:
+    frames = []
+    for n in range(count):
+        image = np.zeros((CONFIG.height, CONFIG.width), dtype=bool)
+        image[10:30, 4 * n : 4 * n + 20] = True
+        image[40 + n % 10, :] = True
+        frames.append(image)
+    return frames
+
+
+def _write(path: Path, frames: List[np.ndarray], keyframe_interval: int = 8) -> None:
+    with GU600AnimationWriter(str(path), CONFIG, FPS, keyframe_interval) as writer:
+        for image in frames:
+            writer.add_frame(image)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.now += seconds
+
+
+class SlowEmulator(GU600CommsEmulator):
+    """Emulator on which every write takes 'duration' seconds of a fake clock."""
+
+    def __init__(self, config: GU600Config, clock: FakeClock, duration: float) -> None:
+        super().__init__(config)
+        self.clock = clock
+        self.duration = duration
+
+    def write(self, message: Message) -> bool:
+        self.clock.now += self.duration
+        return super().write(message)
+
+
+def test_frames_render_in_sequence(tmp_path: Path) -> None:
+    frames = _frames(20)
+    _write(tmp_path / "a.gu6", frames)
+    emulator = GU600CommsEmulator(CONFIG)
+    with GU600AnimationPlayer(str(tmp_path / "a.gu6")) as player:
+        assert player.frames == 20
+        assert player.fps == pytest.approx(FPS)
+        assert [player.is_keyframe(n) for n in range(0, 20, 8)] == [True] * 3
+        assert player.next_keyframe(1) == 8
+        for n, image in enumerate(frames):
+            with player.frame(n) as data:
+                emulator.write(data)
+            assert np.array_equal(emulator.pixels, image)
+
+
+def test_keyframes_draw_the_entire_frame(tmp_path: Path) -> None:
+    frames = _frames(20)
+    _write(tmp_path / "a.gu6", frames)
+    with GU600AnimationPlayer(str(tmp_path / "a.gu6")) as player:
+        for n in range(player.frames):
+            if player.is_keyframe(n):
+                emulator = GU600CommsEmulator(CONFIG)
+                emulator.pixels[:] = True
+                with player.frame(n) as data:
+                    emulator.write(data)
+                assert np.array_equal(emulator.pixels, frames[n])
+
+
+def test_play_keeps_time(tmp_path: Path) -> None:
+    frames = _frames(20)
+    _write(tmp_path / "a.gu6", frames)
+    clock = FakeClock()
+    emulator = SlowEmulator(CONFIG, clock, 0.001)
+    with GU600AnimationPlayer(str(tmp_path / "a.gu6")) as player:
+        stats = player.play(
+            GU600Driver(emulator, CONFIG), clock=clock, sleep=clock.sleep
+        )
+    assert (stats.frames, stats.dropped, stats.late) == (20, 0, 0)
+    assert stats.duration == pytest.approx(19 / FPS + 0.001)
+    assert np.array_equal(emulator.pixels, frames[-1])
+
+
+def test_play_skips_to_keyframes_when_behind(tmp_path: Path) -> None:
+    frames = _frames(40)
+    _write(tmp_path / "a.gu6", frames, keyframe_interval=4)
+    clock = FakeClock()
+    emulator = SlowEmulator(CONFIG, clock, 3 / FPS)
+    with GU600AnimationPlayer(str(tmp_path / "a.gu6")) as player:
+        stats = player.play(
+            GU600Driver(emulator, CONFIG), clock=clock, sleep=clock.sleep
+        )
+    assert stats.dropped > 0
+    assert stats.frames + stats.dropped == 40
+    assert stats.late > 0
+    assert np.array_equal(emulator.pixels, frames[-1])
+
+
+def test_rejects_mismatched_displays_and_files(tmp_path: Path) -> None:
+    with pytest.raises(ValueError):
+        _write(tmp_path / "a.gu6", [np.zeros((32, 128), dtype=bool)])
+    _write(tmp_path / "a.gu6", _frames(2))
+    with GU600AnimationPlayer(str(tmp_path / "a.gu6")) as player:
+        with pytest.raises(ValueError):
+            player.play(GU600Driver(GU600CommsEmulator(CONFIG), GU600Config(128, 32)))
+        with pytest.raises(IndexError):
+            player.frame(2)
+    (tmp_path / "b.gu6").write_bytes(bytes(64))
+    with pytest.raises(ValueError):
+        GU600AnimationPlayer(str(tmp_path / "b.gu6"))
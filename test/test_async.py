@@ -0,0 +1,87 @@
+import asyncio
+import threading
+from typing import List
+
+import numpy as np
+import pytest
+
+from noritake.gu600_async import AsyncGU600Driver, GU600CommsThreaded
+from noritake.gu600_comms import GU600Comms, GU600CommsRecorder, Message
+from noritake.gu600_config import GU600Config
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_emulator import GU600CommsEmulator
+
+CONFIG = GU600Config(240, 64)
+
+
+class GatedLink(GU600Comms):
+    """Record messages once 'gate' is set, so writes queue up until then."""
+
+    def __init__(self) -> None:
+        self.gate = threading.Event()
+        self.messages: List[bytes] = []
+
+    def write(self, message: Message) -> bool:
+        self.gate.wait()
+        self.messages.append(bytes(message))
+        return True
+
+
+class FailingLink(GU600Comms):
+    def write(self, message: Message) -> bool:
+        raise OSError("bus error")
+
+
+def _draw(vfd: GU600Driver) -> None:
+    vfd.set_area(0, 0, 20, 10)
+    vfd.write_text(30, 20, "queued")
+    vfd.invert_area(5, 5, 50, 30)
+
+
+def test_driver_renders_the_same_as_a_blocking_one() -> None:
+    expected = GU600CommsEmulator(CONFIG)
+    _draw(GU600Driver(expected, CONFIG))
+    emulator = GU600CommsEmulator(CONFIG)
+    with AsyncGU600Driver(emulator, CONFIG) as vfd:
+        _draw(vfd)
+        vfd.flush()
+        assert np.array_equal(emulator.pixels, expected.pixels)
+        assert vfd.stats().messages == 3
+
+
+def test_writes_return_before_they_are_written() -> None:
+    link = GatedLink()
+    writer = GU600CommsThreaded(link)
+    message = bytearray(b"\x11\x00\x00\x01\x01")
+    for _ in range(3):
+        assert writer.write(message)
+        # The queue holds a copy, the caller may reuse its buffer.
+        message[1] += 1
+    assert link.messages == []
+    link.gate.set()
+    writer.close()
+    assert [m[1] for m in link.messages] == [0, 1, 2]
+    assert writer.stats().max_depth >= 2
+    with pytest.raises(RuntimeError):
+        writer.write(b"\x11")
+
+
+def test_writer_errors_are_raised_by_flush() -> None:
+    writer = GU600CommsThreaded(FailingLink())
+    writer.write(b"\x11\x00\x00\x01\x01")
+    with pytest.raises(OSError):
+        writer.flush()
+    writer.close()
+
+
+def test_drain_waits_without_blocking_the_loop() -> None:
+    recorder = GU600CommsRecorder()
+    vfd = AsyncGU600Driver(recorder, CONFIG)
+
+    async def main() -> bool:
+        vfd.set_area(0, 0, 9, 9)
+        return await vfd.drain()
+
+    assert asyncio.run(main())
+    assert bytes(recorder.data) == b"\x11\x00\x00\x09\x09"
+    vfd.close()
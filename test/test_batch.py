@@ -0,0 +1,33 @@
+import pytest
+
+from noritake.gu600_comms import GU600CommsRecorder
+from noritake.gu600_config import GU600Config
+from noritake.gu600_driver import GU600Driver
+
+CONFIG = GU600Config(240, 64)
+
+
+def _draw(vfd: GU600Driver) -> None:
+    vfd.set_area(0, 0, 20, 10)
+    vfd.write_text(30, 20, "batched " * 20)
+    vfd.write_graphic_area(0, 40, 159, 47, bytes(range(160)))
+    vfd.draw_line(200, 60)
+
+
+@pytest.mark.parametrize("max_transfer_size", [64, 4096])
+def test_batch_sends_the_same_bytes(max_transfer_size: int) -> None:
+    direct = GU600CommsRecorder()
+    vfd = GU600Driver(direct, CONFIG)
+    _draw(vfd)
+    vfd.set_pixel()
+    recorder = GU600CommsRecorder()
+    vfd = GU600Driver(recorder, CONFIG)
+    with vfd.batch(max_transfer_size) as batch:
+        _draw(vfd)
+        with vfd.batch() as nested:
+            vfd.set_pixel()
+        assert nested is batch
+        assert recorder.writes == 0
+    assert vfd.comms_link is recorder
+    assert bytes(recorder.data) == bytes(direct.data)
+    assert recorder.writes == -(-len(direct.data) // max_transfer_size)
@@ -0,0 +1,86 @@
+from typing import Callable, List
+
+import numpy as np
+
+from noritake.gu600_cache import GU600ScreenCache
+from noritake.gu600_comms import GU600CommsRecorder
+from noritake.gu600_config import GU600Config
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_emulator import GU600CommsEmulator
+
+CONFIG = GU600Config(240, 64)
+
+
+def _screen(text: str, calls: List[str]) -> Callable[[GU600Driver], None]:
+    def render(vfd: GU600Driver) -> None:
+        calls.append(text)
+        vfd.clear_all()
+        vfd.write_text(10, 20, text)
+
+    return render
+
+
+def test_cached_screens_render_like_direct_calls() -> None:
+    emulator = GU600CommsEmulator(CONFIG)
+    cache = GU600ScreenCache(GU600Driver(emulator, CONFIG))
+    calls: List[str] = []
+    for text in ("one", "two", "one", "one"):
+        assert cache.show(("menu", text), _screen(text, calls))
+        expected = GU600CommsEmulator(CONFIG)
+        _screen(text, [])(GU600Driver(expected, CONFIG))
+        assert np.array_equal(emulator.pixels, expected.pixels)
+    assert calls == ["one", "two"]
+    stats = cache.stats()
+    assert (stats.hits, stats.misses, stats.evictions, stats.entries) == (2, 2, 0, 2)
+    assert stats.size == sum(
+        len(cache.encode(_screen(text, []))) for text in ("one", "two")
+    )
+
+
+def test_least_recently_used_screens_are_evicted() -> None:
+    calls: List[str] = []
+    size = len(
+        GU600ScreenCache(GU600Driver(GU600CommsRecorder(), CONFIG)).encode(
+            _screen("a", [])
+        )
+    )
+    cache = GU600ScreenCache(GU600Driver(GU600CommsRecorder(), CONFIG), 2 * size)
+    for text in ("a", "b", "a", "c", "a", "b"):
+        cache.show(text, _screen(text, calls))
+    assert calls == ["a", "b", "c", "b"]
+    stats = cache.stats()
+    assert (stats.evictions, stats.entries, stats.size) == (2, 2, 2 * size)
+
+
+def test_screens_larger_than_the_cache_are_not_kept() -> None:
+    calls: List[str] = []
+    recorder = GU600CommsRecorder()
+    cache = GU600ScreenCache(GU600Driver(recorder, CONFIG), 8)
+    cache.show("a", _screen("a", calls))
+    cache.show("a", _screen("a", calls))
+    assert calls == ["a", "a"]
+    assert cache.stats().entries == 0
+    assert recorder.writes == 2
+
+
+def test_invalidate_and_clear_forget_screens() -> None:
+    calls: List[str] = []
+    cache = GU600ScreenCache(GU600Driver(GU600CommsRecorder(), CONFIG))
+    for text in ("a", "b"):
+        cache.show(text, _screen(text, calls))
+    cache.invalidate("a")
+    cache.invalidate("missing")
+    assert cache.stats().entries == 1
+    cache.show("a", _screen("a", calls))
+    cache.show("b", _screen("b", calls))
+    assert calls == ["a", "b", "a"]
+    cache.clear()
+    assert cache.stats().entries == cache.stats().size == 0
+
+
+def test_keys_include_the_display_size() -> None:
+    small = GU600ScreenCache(GU600Driver(GU600CommsRecorder(), GU600Config(128, 32)))
+    large = GU600ScreenCache(GU600Driver(GU600CommsRecorder(), CONFIG))
+    assert small.key(("menu", 1)) != large.key(("menu", 1))
+    assert large.key(("menu", 1)) == large.key(("menu", 1))
+    assert large.key(("menu", 1)) != large.key(("menu", 2))
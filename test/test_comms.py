@@ -0,0 +1,69 @@
+from typing import List
+
+import numpy as np
+import pytest
+
+from noritake import gu600_comms
+from noritake.gu600_comms import GU600CommsSPI, as_buffer
+
+
+class FakeSpiDev:
+    """Answer every transfer with idle bytes until 'answer_after' reads were made."""
+
+    answer: List[int] = []
+    answer_after = 0
+
+    def __init__(self) -> None:
+        self.max_speed_hz = 0
+        self.reads = 0
+        self.written = bytearray()
+
+    def open(self, bus: int, device: int) -> None:
+        pass
+
+    def writebytes2(self, data: bytes) -> None:
+        self.written += data
+
+    def readbytes(self, count: int) -> List[int]:
+        self.reads += 1
+        if self.reads <= self.answer_after or not self.answer:
+            return [0xFF] * count
+        response, self.answer[:] = self.answer[:count], self.answer[count:]
+        return response + [0x00] * (count - len(response))
+
+
+@pytest.fixture
+def spi(monkeypatch: pytest.MonkeyPatch) -> GU600CommsSPI:
+    monkeypatch.setattr(gu600_comms.spidev, "SpiDev", FakeSpiDev)
+    monkeypatch.setattr(FakeSpiDev, "answer", [])
+    monkeypatch.setattr(FakeSpiDev, "answer_after", 0)
+    return GU600CommsSPI(0, 0)
+
+
+def test_xfer_waits_for_a_late_response(spi: GU600CommsSPI) -> None:
+    FakeSpiDev.answer[:] = [0x5A]
+    FakeSpiDev.answer_after = 3
+    assert spi.xfer(b"\x1b\x52", 1, 1.0) == [0x5A]
+    assert bytes(spi.spi.written) == b"\x1b\x52"
+
+
+def test_xfer_without_response_times_out(spi: GU600CommsSPI) -> None:
+    assert spi.xfer(b"\x1b\x43", 1, 0.01) == []
+    assert spi.spi.reads > 1
+
+
+def test_read_without_timeout_reads_once(spi: GU600CommsSPI) -> None:
+    assert spi.read(4) == []
+    assert spi.spi.reads == 1
+
+
+def test_as_buffer_converts_without_copying() -> None:
+    data = bytearray(b"\x10\x01\x02")
+    assert as_buffer(data) is data
+    assert as_buffer([0x10, 1, 2]) == b"\x10\x01\x02"
+    array = np.arange(8, dtype=np.uint8)
+    view = as_buffer(array)
+    array[0] = 0xFF
+    assert bytes(view)[0] == 0xFF
+    assert bytes(as_buffer(array[::2])) == bytes([0xFF, 2, 4, 6])
+    assert bytes(as_buffer(np.array([0x0201], dtype="<u2"))) == b"\x01\x02"
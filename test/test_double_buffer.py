@@ -0,0 +1,91 @@
+from typing import List
+
+import numpy as np
+
+from noritake.gu600_comms import GU600Comms, GU600CommsRecorder, Message
+from noritake.gu600_config import GU600Config
+from noritake.gu600_double_buffer import GU600DoubleBuffer
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_emulator import GU600CommandSplitter, GU600CommsEmulator
+
+CONFIG = GU600Config(240, 64)
+
+
+class WindowedEmulator(GU600Comms):
+    """Give each hardware window contents of its own, drawn by the commands sent while it is selected;
+    the window shown last is on display."""
+
+    def __init__(self, config: GU600Config) -> None:
+        self.windows = [GU600CommsEmulator(config), GU600CommsEmulator(config)]
+        self.selected = 0
+        self.shown: List[int] = []
+        self._splitter = GU600CommandSplitter()
+
+    @property
+    def pixels(self) -> np.ndarray:
+        return self.windows[self.shown[-1]].pixels
+
+    def write(self, message: Message) -> bool:
+        for command in self._splitter.split(message):
+            if command[:2] in (b"\x1b\x80", b"\x1b\x81"):
+                self.selected = command[1] - 0x80
+            elif command[:2] == b"\x1b\x84":
+                self.shown.append(self.selected)
+            elif command[0] == 0x1A:
+                # The write mode is shared by both windows.
+                for window in self.windows:
+                    window.write(command)
+            else:
+                self.windows[self.selected].write(command)
+        return True
+
+
+def _frames(count: int) -> List[np.ndarray]:
+    rng = np.random.default_rng(7)
+    frames = []
+    image = np.zeros((CONFIG.height, CONFIG.width), dtype=bool)
+    for _ in range(count):
+        x, y = int(rng.integers(0, CONFIG.width - 30)), int(rng.integers(0, 40))
+        image[y : y + 20, x : x + 30] = rng.random((20, 30)) < 0.5
+        frames.append(image.copy())
+    return frames
+
+
+def test_frames_are_shown_whole_in_alternating_windows() -> None:
+    display = WindowedEmulator(CONFIG)
+    framebuffer = GU600DoubleBuffer(GU600Driver(display, CONFIG))
+    frames = _frames(10)
+    for n, image in enumerate(frames):
+        framebuffer.blit(0, 0, image)
+        assert framebuffer.flush()
+        assert framebuffer.front == n % 2 + 1
+        assert display.shown[-1] == n % 2
+        assert np.array_equal(display.pixels, image)
+        if n:
+            hidden = display.windows[1 - display.shown[-1]]
+            assert np.array_equal(hidden.pixels, frames[n - 1])
+
+
+def test_flush_sends_changes_since_the_hidden_window_was_drawn() -> None:
+    recorder = GU600CommsRecorder()
+    framebuffer = GU600DoubleBuffer(GU600Driver(recorder, CONFIG))
+    framebuffer.fill_rect(0, 0, 50, 20)
+    framebuffer.flush()
+    framebuffer.flush()
+    recorder.clear()
+    assert framebuffer.dirty_rectangles() == []
+    assert framebuffer.flush()
+    # Only select, show.
+    assert len(recorder.data) == 4
+    framebuffer.set_pixel(100, 30)
+    assert len(framebuffer.dirty_rectangles()) == 1
+    recorder.clear()
+    framebuffer.flush()
+    # The other window still lacks the pixel.
+    assert len(framebuffer.dirty_rectangles()) == 1
+    full = len(recorder.data)
+    framebuffer.invalidate()
+    assert framebuffer.dirty_rectangles() == [(0, 0, 239, 63)]
+    recorder.clear()
+    framebuffer.flush()
+    assert len(recorder.data) > full
@@ -0,0 +1,82 @@
+import numpy as np
+
+from noritake.gu600_comms import GU600CommsRecorder
+from noritake.gu600_config import GU600Config
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_enums import *
+
+CONFIG = GU600Config(240, 64)
+
+
+def _driver() -> GU600Driver:
+    vfd = GU600Driver(GU600CommsRecorder(), CONFIG)
+    vfd.set_write_mode(
+        GraphicOrientation.ORIENTATION_HORIZONTAL,
+        CursorMovement.MOVEMENT_HORIZONTAL,
+        CursorDirection.DIRECTION_FORWARD,
+        UnderScoreCursor.UNDERSCORECURSOR_STATICOFF,
+        PenType.PENTYPE_OVER,
+    )
+    return vfd
+
+
+def test_cursor_follows_fixed_spaced_text() -> None:
+    vfd = _driver()
+    vfd.select_font(FontFace.FIXEDSPACED_5X7)
+    vfd.write_text(0, 7, "ab")
+    recorder = vfd.comms_link
+    assert isinstance(recorder, GU600CommsRecorder)
+    recorder.clear()
+    vfd.write_text(12, 7, "c")
+    assert bytes(recorder.data) == b"c"
+
+
+def test_cursor_is_forgotten_after_proportional_text() -> None:
+    vfd = _driver()
+    vfd.select_font(FontFace.PROPORTIONAL_MINI)
+    vfd.write_text(0, 7, "ab")
+    recorder = vfd.comms_link
+    assert isinstance(recorder, GU600CommsRecorder)
+    recorder.clear()
+    vfd.set_cursor_position(12, 7)
+    assert bytes(recorder.data) == b"\x10\x0c\x07"
+
+
+def test_cursor_is_forgotten_after_hex_prefix() -> None:
+    vfd = _driver()
+    vfd.select_font(FontFace.FIXEDSPACED_5X7)
+    vfd.set_hex_mode()
+    vfd.write_text(0, 7, "`41")
+    recorder = vfd.comms_link
+    assert isinstance(recorder, GU600CommsRecorder)
+    recorder.clear()
+    vfd.write_text(18, 7, "B")
+    assert bytes(recorder.data) == b"\x10\x12\x07B"
+
+
+def test_cursor_follows_text_with_backquote_in_binary_mode() -> None:
+    vfd = _driver()
+    vfd.select_font(FontFace.FIXEDSPACED_5X7)
+    vfd.set_binary_mMode()
+    vfd.write_text(0, 7, "`41")
+    recorder = vfd.comms_link
+    assert isinstance(recorder, GU600CommsRecorder)
+    recorder.clear()
+    vfd.write_text(18, 7, "B")
+    assert bytes(recorder.data) == b"B"
+
+
+def test_commands_with_payload_reuse_one_buffer() -> None:
+    vfd = _driver()
+    recorder = vfd.comms_link
+    assert isinstance(recorder, GU600CommsRecorder)
+    recorder.clear()
+    vfd.write_graphic_area(0, 0, 7, 1, np.array([0x81, 0x42], dtype=np.uint8))
+    vfd.write_text(0, 20, "x" * 300)
+    vfd.write_graphic_area(8, 0, 15, 0, b"\x18")
+    assert bytes(recorder.data) == (
+        b"\x1f\x00\x00\x07\x01\x81\x42"
+        + b"\x10\x00\x14"
+        + b"x" * 300
+        + b"\x1f\x08\x00\x0f\x00\x18"
+    )
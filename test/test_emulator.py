@@ -0,0 +1,75 @@
+from typing import Tuple
+
+import numpy as np
+
+from noritake.gu600_config import GU600Config
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_emulator import GU600CommsEmulator
+from noritake.gu600_enums import *
+from noritake.gu600_fonts import DEFAULT_FONT
+
+CONFIG = GU600Config(240, 64)
+
+
+def _display() -> Tuple[GU600CommsEmulator, GU600Driver]:
+    emulator = GU600CommsEmulator(CONFIG)
+    return emulator, GU600Driver(emulator, CONFIG)
+
+
+def test_area_commands() -> None:
+    emulator, vfd = _display()
+    vfd.set_area(10, 5, 19, 14)
+    vfd.invert_area(15, 10, 24, 19)
+    expected = np.zeros((CONFIG.height, CONFIG.width), dtype=bool)
+    expected[5:15, 10:20] = True
+    expected[10:20, 15:25] ^= True
+    assert np.array_equal(emulator.pixels, expected)
+    assert emulator.cursor == (15, 10)
+
+
+def test_commands_split_across_writes() -> None:
+    emulator = GU600CommsEmulator(CONFIG)
+    for byte in b"\x11\x00\x00\x07\x07\x10\x14\x1fA":
+        emulator.write(bytes((byte,)))
+    assert emulator.pixels[:8, :8].all()
+    glyph = DEFAULT_FONT.glyph(ord("A"))
+    top = 0x1F - glyph.shape[0] + 1
+    assert np.array_equal(
+        emulator.pixels[top : 0x1F + 1, 0x14 : 0x14 + glyph.shape[1]], glyph
+    )
+    assert emulator.commands == 3
+
+
+def test_checksum_and_port_responses() -> None:
+    emulator, vfd = _display()
+    vfd.set_cursor_position(1, 2)
+    assert vfd.query_checksum() == (0x10 + 1 + 2 + 0x1B + 0x43) & 0xFF
+    assert vfd.query_checksum() == 0x1B + 0x43
+    emulator.port = 0x5A
+    assert vfd.query_port() == 0x5A
+
+
+def test_backward_graphic_keeps_the_cursor_on_the_display() -> None:
+    emulator, vfd = _display()
+    vfd.set_write_mode(
+        GraphicOrientation.ORIENTATION_VERTICAL,
+        CursorMovement.MOVEMENT_HORIZONTAL,
+        CursorDirection.DIRECTION_BACKWARDS,
+        UnderScoreCursor.UNDERSCORECURSOR_STATICOFF,
+        PenType.PENTYPE_OVER,
+    )
+    vfd.set_cursor_position(2, 0)
+    vfd.write_graphic(bytes(16))
+    assert emulator.cursor == (0, 0)
+    vfd.set_pixel()
+    assert emulator.pixels[0, 0]
+    assert emulator.pixels.sum() == 1
+
+
+def test_text_past_the_right_edge_stays_off_the_display() -> None:
+    emulator, vfd = _display()
+    vfd.select_font(FontFace.FIXEDSPACED_5X7)
+    vfd.write_text(230, 7, "WWWW")
+    assert emulator.cursor == (CONFIG.width, 7)
+    vfd.set_pixel()
+    assert not emulator.pixels[:, :230].any()
@@ -0,0 +1,63 @@
+from typing import Callable, Tuple
+
+import pytest
+
+from noritake import gu600_encoder as enc
+from noritake.gu600_comms import GU600CommsRecorder
+from noritake.gu600_config import GU600Config
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_enums import *
+
+CONFIG = GU600Config(240, 64)
+
+
+def test_text_is_encoded_like_single_characters() -> None:
+    text = "A\x00b\x1f~\xe9€"
+    recorder = GU600CommsRecorder()
+    vfd = GU600Driver(recorder, CONFIG)
+    for c in text.encode("latin-1", "replace"):
+        vfd.write_character(c)
+    assert enc.encode_text(text) == bytes(recorder.data)
+    assert enc.encode_text(text) == b"A b ~\xe9?"
+
+
+def test_commands_match_the_datasheet() -> None:
+    recorder = GU600CommsRecorder()
+    vfd = GU600Driver(recorder, CONFIG)
+    vfd.set_write_mode(
+        GraphicOrientation.ORIENTATION_VERTICAL,
+        CursorMovement.MOVEMENT_VERTICAL,
+        CursorDirection.DIRECTION_BACKWARDS,
+        UnderScoreCursor.UNDERSCORECURSOR_FLASHON,
+        PenType.PENTYPE_XOR,
+    )
+    vfd.set_window_flash_speed(FlashTime.FLASHTIME_30ms, FlashTime.FLASHTIME_100ms)
+    vfd.set_auto_fade(Luminance.LUMINANCE_43, FadeSpeed.FADESPEED_SLOW)
+    vfd.send_macro_start(3)
+    vfd.set_brightness(2)
+    assert bytes(recorder.data) == bytes(
+        (0x1A, 0xFB, 0x1B, 0x87, 0x13, 0x1B, 0x9C, 0x23, 0x03, 0x1B, 0xFA)
+    )
+
+
+@pytest.mark.parametrize(
+    "encode, args",
+    [
+        (
+            enc.write_mode,
+            (
+                GraphicOrientation.ORIENTATION_HORIZONTAL,
+                CursorMovement.MOVEMENT_HORIZONTAL,
+                CursorDirection.DIRECTION_FORWARD,
+                UnderScoreCursor.UNDERSCORECURSOR_STATICOFF,
+                PenType.PENTYPE_OR,
+            ),
+        ),
+        (enc.window_flash_speed, (FlashTime.FLASHTIME_15ms, FlashTime.FLASHTIME_45ms)),
+        (enc.auto_fade, (Luminance.LUMINANCE_14, FadeSpeed.FADESPEED_FAST)),
+    ],
+)
+def test_commands_are_encoded_once(
+    encode: Callable[..., bytes], args: Tuple[IntEnum, ...]
+) -> None:
+    assert encode(*args) is encode(*args)
@@ -0,0 +1,68 @@
+import threading
+import time
+from contextlib import contextmanager
+from typing import Iterator, List
+
+from noritake.gu600_comms import GU600Comms, Message
+from noritake.gu600_config import GU600Config
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_emulator import GU600CommsEmulator
+from noritake.gu600_events import EventType, GU600EventSource
+
+CONFIG = GU600Config(240, 64)
+
+
+class ExclusiveLink(GU600Comms):
+    """Pass everything on to the emulator, failing if two threads use the link at once."""
+
+    def __init__(self) -> None:
+        self.emulator = GU600CommsEmulator(CONFIG)
+        self._busy = threading.Lock()
+
+    def write(self, message: Message) -> bool:
+        with self._use():
+            return self.emulator.write(message)
+
+    def read(self, count: int, timeout: float = 0.0) -> List[int]:
+        with self._use():
+            return self.emulator.read(count, timeout)
+
+    @contextmanager
+    def _use(self) -> Iterator[None]:
+        assert self._busy.acquire(blocking=False), "link used by two threads at once"
+        try:
+            # Widen the window in which another thread could get in.
+            time.sleep(0.0001)
+            yield
+        finally:
+            self._busy.release()
+
+
+def test_poll_does_not_flush_a_batch() -> None:
+    emulator = GU600CommsEmulator(CONFIG)
+    vfd = GU600Driver(emulator, CONFIG)
+    vfd.enable_key_scanning()
+    source = GU600EventSource(vfd, port=True)
+    emulator.press_key(0x31)
+    with vfd.batch() as batch:
+        vfd.set_area(0, 0, 9, 9)
+        events = source.poll()
+        assert batch.pending == 5
+        assert not emulator.pixels.any()
+    assert [(e.type, e.value) for e in events] == [
+        (EventType.EVENT_KEY, 0x31),
+        (EventType.EVENT_PORT, emulator.port),
+    ]
+    assert emulator.pixels[:10, :10].all()
+
+
+def test_polling_thread_does_not_interleave_with_writes() -> None:
+    link = ExclusiveLink()
+    vfd = GU600Driver(link, CONFIG)
+    with GU600EventSource(vfd, interval=0.0005, port=True):
+        for i in range(200):
+            with vfd.batch():
+                vfd.set_area(i % 230, 0, i % 230 + 9, 9)
+                vfd.clear_area(i % 230, 0, i % 230 + 9, 9)
+            vfd.write_text(0, 20, str(i))
+    assert not link.emulator.pixels[:10].any()
@@ -0,0 +1,45 @@
+import numpy as np
+
+from noritake.gu600_comms import GU600CommsRecorder
+from noritake.gu600_config import GU600Config
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_emulator import GU600CommsEmulator
+from noritake.gu600_framebuffer import GU600FrameBuffer
+
+CONFIG = GU600Config(240, 64)
+
+
+def test_flush_matches_pixels() -> None:
+    rng = np.random.default_rng(5)
+    emulator = GU600CommsEmulator(CONFIG)
+    framebuffer = GU600FrameBuffer(GU600Driver(emulator, CONFIG))
+    framebuffer.fill_rect(3, 4, 50, 20)
+    assert framebuffer.flush()
+    assert np.array_equal(emulator.pixels, framebuffer.pixels)
+    for _ in range(20):
+        x, y = int(rng.integers(-10, CONFIG.width)), int(
+            rng.integers(-10, CONFIG.height)
+        )
+        framebuffer.blit(
+            x, y, rng.random((int(rng.integers(1, 30)), int(rng.integers(1, 40)))) < 0.5
+        )
+        framebuffer.set_pixel(
+            int(rng.integers(0, CONFIG.width)),
+            int(rng.integers(0, CONFIG.height)),
+            False,
+        )
+        assert framebuffer.flush()
+        assert np.array_equal(emulator.pixels, framebuffer.pixels)
+
+
+def test_flush_sends_only_changes() -> None:
+    recorder = GU600CommsRecorder()
+    framebuffer = GU600FrameBuffer(GU600Driver(recorder, CONFIG))
+    framebuffer.flush()
+    recorder.clear()
+    assert framebuffer.flush()
+    assert recorder.writes == 0
+    framebuffer.set_pixel(100, 30)
+    assert framebuffer.dirty_rectangles() == [(96, 30, 103, 30)]
+    framebuffer.flush()
+    assert bytes(recorder.data) == bytes((0x1F, 96, 30, 103, 30, 0x08))
@@ -0,0 +1,127 @@
+import threading
+
+import numpy as np
+import pytest
+
+from noritake.gu600_comms import GU600Comms, GU600CommsRecorder, Message
+from noritake.gu600_config import GU600Config
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_emulator import GU600CommsEmulator
+from noritake.gu600_grayscale import (
+    GU600GrayscaleDisplay,
+    bit_planes,
+    grayscale_frames,
+    plane_sequence,
+)
+
+CONFIG = GU600Config(240, 64)
+
+
+class SignallingEmulator(GU600CommsEmulator):
+    """Emulator setting 'written' once a frame has been written."""
+
+    def __init__(self, config: GU600Config) -> None:
+        super().__init__(config)
+        self.written = threading.Event()
+
+    def write(self, message: Message) -> bool:
+        result = super().write(message)
+        self.written.set()
+        return result
+
+
+class FailingLink(GU600Comms):
+    def __init__(self) -> None:
+        self.written = threading.Event()
+
+    def write(self, message: Message) -> bool:
+        self.written.set()
+        raise OSError("bus error")
+
+
+def _gradient() -> np.ndarray:
+    return np.tile(
+        np.linspace(0, 255, CONFIG.width).astype(np.uint8), (CONFIG.height, 1)
+    )
+
+
+@pytest.mark.parametrize("bits", [1, 2, 3, 4])
+def test_planes_are_shown_in_proportion_to_their_weight(bits: int) -> None:
+    sequence = plane_sequence(bits)
+    assert len(sequence) == 2**bits - 1
+    assert [sequence.count(k) for k in range(bits)] == [2**k for k in range(bits)]
+    # Every other frame shows the most significant plane.
+    assert sequence[::2] == [bits - 1] * 2 ** (bits - 1)
+
+
+@pytest.mark.parametrize("bits", [1, 2, 3, 4])
+def test_frames_average_to_the_gray_level(bits: int) -> None:
+    image = _gradient()
+    levels = (image.astype(int) * (2**bits - 1) + 127) // 255
+    assert np.abs(levels * 255 / (2**bits - 1) - image).max() <= 255 / (2**bits - 1) / 2
+    planes = bit_planes(image, bits)
+    assert np.array_equal(sum(p.astype(int) << k for k, p in enumerate(planes)), levels)
+    assert np.array_equal(
+        sum(f.astype(int) for f in grayscale_frames(image, bits)), levels
+    )
+
+
+def test_step_cycles_through_the_frames() -> None:
+    emulator = GU600CommsEmulator(CONFIG)
+    display = GU600GrayscaleDisplay(GU600Driver(emulator, CONFIG))
+    assert display.step() == 0
+    first = _gradient()
+    second = first[:, ::-1]
+    display.show(first)
+    frames = grayscale_frames(first)
+    for n in range(7):
+        display.step()
+        assert np.array_equal(emulator.pixels, frames[n % 3])
+    display.show(second)
+    frames = grayscale_frames(second)
+    for n in range(4):
+        display.step()
+        assert np.array_equal(emulator.pixels, frames[n % 3])
+    assert display.bandwidth == display.cycle_size * display.rate / 3
+
+
+def test_play_sends_frames_at_the_rate() -> None:
+    now = [0.0]
+
+    def sleep(seconds: float) -> None:
+        now[0] += seconds
+
+    recorder = GU600CommsRecorder()
+    display = GU600GrayscaleDisplay(GU600Driver(recorder, CONFIG), rate=100)
+    display.show(_gradient())
+    stats = display.play(30, clock=lambda: now[0], sleep=sleep)
+    assert (stats.frames, stats.dropped, stats.late) == (30, 0, 0)
+    assert stats.bytes == len(recorder.data)
+    assert stats.duration == pytest.approx(0.29)
+
+
+def test_background_thread_sends_frames() -> None:
+    emulator = SignallingEmulator(CONFIG)
+    display = GU600GrayscaleDisplay(GU600Driver(emulator, CONFIG), bits=1, rate=1000)
+    display.show(_gradient())
+    with display:
+        assert emulator.written.wait(5)
+    assert display.stats().frames > 0
+    assert np.array_equal(emulator.pixels, grayscale_frames(_gradient(), 1)[0])
+
+
+def test_close_raises_errors_of_the_background_thread() -> None:
+    link = FailingLink()
+    display = GU600GrayscaleDisplay(GU600Driver(link, CONFIG))
+    display.show(_gradient())
+    display.start()
+    assert link.written.wait(5)
+    with pytest.raises(OSError):
+        display.close()
+    display.close()
+
+
+def test_show_rejects_images_of_another_size() -> None:
+    display = GU600GrayscaleDisplay(GU600Driver(GU600CommsRecorder(), CONFIG))
+    with pytest.raises(ValueError):
+        display.show(np.zeros((32, 128), dtype=np.uint8))
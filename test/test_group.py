@@ -0,0 +1,82 @@
+import threading
+from typing import Callable, List
+
+import pytest
+
+from noritake.gu600_async import AsyncGU600Driver
+from noritake.gu600_comms import GU600CommsRecorder
+from noritake.gu600_config import GU600Config
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_emulator import GU600CommsEmulator
+from noritake.gu600_group import DisplayGroup, spi_bus
+
+CONFIG = GU600Config(240, 64)
+
+
+def test_panels_on_different_buses_run_in_parallel() -> None:
+    # Both operations only return once the other one has started.
+    barrier = threading.Barrier(2, timeout=5)
+    with DisplayGroup() as group:
+        group.add("left", GU600Driver(GU600CommsRecorder(), CONFIG))
+        group.add("right", GU600Driver(GU600CommsRecorder(), CONFIG))
+        futures = group.run(lambda vfd: barrier.wait() >= 0)
+        assert all(future.result() for future in futures.values())
+
+
+def test_panels_on_one_bus_run_one_after_the_other() -> None:
+    order: List[str] = []
+    running = threading.Lock()
+
+    def operation(name: str) -> Callable[[GU600Driver], bool]:
+        def run(vfd: GU600Driver) -> bool:
+            assert running.acquire(blocking=False)
+            order.append(name)
+            running.release()
+            return True
+
+        return run
+
+    with DisplayGroup() as group:
+        for name in ("a", "b", "c"):
+            group.add(name, GU600Driver(GU600CommsRecorder(), CONFIG), bus="spi0")
+        for _ in range(10):
+            for name in group.names:
+                group.submit(name, operation(name))
+        assert group.flush(timeout=5)
+    assert order == ["a", "b", "c"] * 10
+
+
+def test_flush_waits_for_asynchronous_drivers() -> None:
+    emulator = GU600CommsEmulator(CONFIG)
+    expected = GU600CommsEmulator(CONFIG)
+    GU600Driver(expected, CONFIG).set_area(0, 0, 99, 31)
+    vfd = AsyncGU600Driver(emulator, CONFIG)
+    with DisplayGroup() as group:
+        group.add("async", vfd)
+        group.run(lambda vfd: vfd.set_area(0, 0, 99, 31))
+        assert group.flush(timeout=5)
+        assert (emulator.pixels == expected.pixels).all()
+    vfd.close()
+
+
+def test_failures_are_counted_and_reported_by_flush() -> None:
+    def fail(vfd: GU600Driver) -> bool:
+        raise OSError("bus error")
+
+    with DisplayGroup() as group:
+        group.add("ok", GU600Driver(GU600CommsRecorder(), CONFIG))
+        group.add("bad", GU600Driver(GU600CommsRecorder(), CONFIG))
+        assert group.clear_all()
+        assert group.flush(timeout=5)
+        group.submit("bad", lambda vfd: False)
+        assert not group.flush(timeout=5)
+        with pytest.raises(OSError):
+            group.submit("bad", fail).result(timeout=5)
+        stats = group.stats()
+    assert stats["ok"].operations == 1 and stats["ok"].failures == 0
+    assert stats["bad"].operations == 3 and stats["bad"].failures == 2
+    assert stats["bad"].max_latency >= stats["bad"].mean_latency > 0
+
+
+def test_spi_bus_of_links_not_on_spi() -> None:
+    assert spi_bus(GU600CommsRecorder()) is None
@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from noritake.gu600_config import GU600Config
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_emulator import GU600CommsEmulator, area_size, unpack_area
+from noritake.gu600_enums import *
+from noritake.gu600_image import (
+    Dither,
+    convert,
+    dither_floyd_steinberg,
+    dither_ordered,
+    from_buffer,
+    pack_bitmap,
+    to_grayscale,
+)
+
+CONFIG = GU600Config(240, 64)
+
+
+def _floyd_steinberg(gray: np.ndarray, level: int = 128) -> np.ndarray:
+    """Pixel by pixel reference."""
+    values = gray.astype(np.float32)
+    height, width = values.shape
+    result = np.zeros((height, width), dtype=bool)
+    for y in range(height):
+        for x in range(width):
+            old = values[y, x]
+            result[y, x] = on = old >= level
+            error = old - on * np.float32(255.0)
+            for dy, dx, weight in ((0, 1, 7), (1, -1, 3), (1, 0, 5), (1, 1, 1)):
+                if 0 <= y + dy < height and 0 <= x + dx < width:
+                    values[y + dy, x + dx] += error * np.float32(weight / 16)
+    return result
+
+
+@pytest.mark.parametrize("orientation", list(GraphicOrientation))
+@pytest.mark.parametrize("height,width", [(8, 8), (13, 21), (1, 30)])
+def test_pack_bitmap_renders_on_the_emulator(
+    orientation: GraphicOrientation, height: int, width: int
+) -> None:
+    bits = np.random.default_rng(height * width).random((height, width)) < 0.5
+    data = pack_bitmap(bits, orientation)
+    assert len(data) == area_size(width, height, orientation)
+    assert np.array_equal(unpack_area(data.tobytes(), width, height, orientation), bits)
+    emulator = GU600CommsEmulator(CONFIG)
+    vfd = GU600Driver(emulator, CONFIG)
+    vfd.set_write_mode(
+        orientation,
+        CursorMovement.MOVEMENT_HORIZONTAL,
+        CursorDirection.DIRECTION_FORWARD,
+        UnderScoreCursor.UNDERSCORECURSOR_STATICOFF,
+        PenType.PENTYPE_OVER,
+    )
+    vfd.write_graphic_area(3, 2, 3 + width - 1, 2 + height - 1, data)
+    assert np.array_equal(emulator.pixels[2 : 2 + height, 3 : 3 + width], bits)
+
+
+def test_floyd_steinberg_matches_the_reference() -> None:
+    gray = np.random.default_rng(1).integers(0, 256, (17, 23), dtype=np.uint8)
+    assert np.array_equal(dither_floyd_steinberg(gray), _floyd_steinberg(gray))
+
+
+def test_dithering_keeps_the_mean_brightness() -> None:
+    gray = np.full((32, 32), 64, dtype=np.uint8)
+    assert dither_ordered(gray).mean() == pytest.approx(0.25)
+    assert dither_floyd_steinberg(gray).mean() == pytest.approx(0.25, abs=0.02)
+
+
+def test_from_buffer_converts_rgb_to_grayscale() -> None:
+    rgb = bytes([255, 255, 255, 0, 0, 0, 255, 0, 0])
+    assert from_buffer(rgb, 3, 1, 3).tolist() == [[255, 0, 76]]
+    gray = bytearray([1, 2, 3, 4])
+    image = from_buffer(gray, 2, 2)
+    gray[0] = 9
+    assert image[0, 0] == 9
+    assert to_grayscale(np.array([[True, False]])).tolist() == [[255, 0]]
+
+
+def test_convert_thresholds_and_packs() -> None:
+    image = np.array([[0, 200, 127, 128, 0, 0, 0, 255, 255]], dtype=np.uint8)
+    packed = convert(
+        image, GraphicOrientation.ORIENTATION_HORIZONTAL, Dither.DITHER_NONE
+    )
+    assert packed.tolist() == [0b01010001, 0b10000000]
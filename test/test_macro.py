@@ -0,0 +1,63 @@
+import numpy as np
+import pytest
+
+from noritake.gu600_config import GU600Config
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_emulator import GU600CommsEmulator
+from noritake.gu600_macro import MAX_MACRO_SIZE, GU600MacroRecorder
+
+CONFIG = GU600Config(240, 64)
+
+
+def test_played_macro_renders_the_recorded_calls() -> None:
+    emulator = GU600CommsEmulator(CONFIG)
+    macros = GU600MacroRecorder(GU600Driver(emulator, CONFIG))
+    with macros.record(2) as vfd:
+        vfd.set_area(0, 0, 30, 10)
+        vfd.write_text(40, 20, "macro")
+    assert emulator.commands == 0
+    expected = GU600CommsEmulator(CONFIG)
+    direct = GU600Driver(expected, CONFIG)
+    direct.set_area(0, 0, 30, 10)
+    direct.write_text(40, 20, "macro")
+    assert macros.upload()
+    assert not emulator.pixels.any()
+    assert macros.play(2)
+    assert np.array_equal(emulator.pixels, expected.pixels)
+    emulator.pixels[:] = False
+    assert macros.play(2)
+    assert np.array_equal(emulator.pixels, expected.pixels)
+
+
+def test_macros_are_limited_in_size() -> None:
+    macros = GU600MacroRecorder(GU600Driver(GU600CommsEmulator(CONFIG), CONFIG))
+    with pytest.raises(ValueError):
+        with macros.record(1) as vfd:
+            vfd.write_text(0, 7, "x" * MAX_MACRO_SIZE)
+    for number in (1, 2):
+        with macros.record(number) as vfd:
+            vfd.write_text(0, 7, "x" * 200)
+    with pytest.raises(ValueError):
+        with macros.record(3) as vfd:
+            vfd.write_text(0, 7, "x" * 200)
+    # Recording a macro again replaces it.
+    with macros.record(2) as vfd:
+        vfd.write_text(0, 7, "y" * 200)
+    assert macros.size == 2 * 203
+    with pytest.raises(ValueError):
+        macros.play(0)
+    with pytest.raises(ValueError):
+        with macros.record(8):
+            pass
+
+
+def test_erase_clears_the_display_macros() -> None:
+    emulator = GU600CommsEmulator(CONFIG)
+    macros = GU600MacroRecorder(GU600Driver(emulator, CONFIG))
+    with macros.record(1) as vfd:
+        vfd.set_area(0, 0, 9, 9)
+    macros.upload()
+    assert macros.erase()
+    assert macros.macros == {}
+    macros.play(1)
+    assert not emulator.pixels.any()
@@ -0,0 +1,144 @@
+import random
+from typing import List, Tuple
+
+import numpy as np
+import pytest
+
+from noritake.gu600_config import GU600Config
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_emulator import GU600CommsEmulator, area_size
+from noritake.gu600_enums import *
+from noritake.gu600_optimizer import GU600OperationBuffer, optimize, renders_identically
+from noritake.gu600_planner import Operation, apply, plan_size
+
+CONFIG = GU600Config(64, 32)
+AREA_OPERATIONS = [
+    "set_area",
+    "clear_area",
+    "invert_area",
+    "set_outline",
+    "clear_outline",
+]
+CURSOR_OPERATIONS = [
+    "set_pixel",
+    "clear_pixel",
+    "move_curser_carriage_return",
+    "send_backspace",
+]
+
+
+def _rectangle(rnd: random.Random) -> Tuple[int, int, int, int]:
+    left, top = rnd.randrange(CONFIG.width), rnd.randrange(CONFIG.height)
+    return (
+        left,
+        top,
+        min(CONFIG.width - 1, left + rnd.randrange(20)),
+        min(CONFIG.height - 1, top + rnd.randrange(12)),
+    )
+
+
+def _operations(rnd: random.Random) -> List[Operation]:
+    """A random mix of the operations the optimizer drops, merges and fuses, and barriers."""
+    operations: List[Operation] = []
+    orientation = GraphicOrientation.ORIENTATION_HORIZONTAL
+    for _ in range(rnd.randrange(1, 40)):
+        kind = rnd.randrange(13)
+        if kind < 3:
+            operation = Operation(rnd.choice(AREA_OPERATIONS), _rectangle(rnd))
+        elif kind == 3:
+            operation = Operation("clear_all")
+        elif kind == 4:
+            operation = Operation(
+                "set_cursor_position",
+                (rnd.randrange(CONFIG.width), rnd.randrange(CONFIG.height)),
+            )
+        elif kind == 5:
+            operation = Operation("write_character", (rnd.randrange(0x20, 0x80),))
+        elif kind == 6:
+            orientation = rnd.choice(list(GraphicOrientation))
+            operation = Operation(
+                "set_write_mode",
+                (
+                    orientation,
+                    rnd.choice(list(CursorMovement)),
+                    rnd.choice(list(CursorDirection)),
+                    UnderScoreCursor.UNDERSCORECURSOR_STATICOFF,
+                    rnd.choice(list(PenType)),
+                ),
+            )
+        elif kind in (7, 8):
+            left, top, right, bottom = _rectangle(rnd)
+            previous = operations[-1] if operations else None
+            if (
+                rnd.random() < 0.5
+                and previous
+                and previous.method == "write_graphic_area"
+            ):
+                # Adjacent to the previous area, so the two can be fused.
+                left, top, right, bottom = previous.args[:4]
+                if rnd.random() < 0.5 and bottom + 1 < CONFIG.height:
+                    top, bottom = bottom + 1, min(
+                        CONFIG.height - 1, bottom + 1 + rnd.randrange(5)
+                    )
+                elif right + 1 < CONFIG.width:
+                    left, right = right + 1, min(
+                        CONFIG.width - 1, right + 1 + rnd.randrange(9)
+                    )
+            size = area_size(right - left + 1, bottom - top + 1, orientation)
+            data = bytes(rnd.randrange(256) for _ in range(size))
+            operation = Operation(
+                "write_graphic_area", (left, top, right, bottom, data)
+            )
+        elif kind == 9:
+            operation = Operation(rnd.choice(CURSOR_OPERATIONS))
+        elif kind == 10:
+            operation = Operation(
+                "draw_line", (rnd.randrange(CONFIG.width), rnd.randrange(CONFIG.height))
+            )
+        elif kind == 11:
+            operation = Operation("set_brightness", (rnd.randrange(8),))
+        else:
+            operation = Operation("select_window1")
+        operations.append(operation)
+    return operations
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_optimized_operations_render_identically(seed: int) -> None:
+    rnd = random.Random(seed)
+    before = after = 0
+    for trial in range(100):
+        operations = _operations(rnd)
+        optimized = optimize(operations, CONFIG)
+        previous = (
+            np.random.default_rng(trial).random((CONFIG.height, CONFIG.width)) < 0.5
+        )
+        assert renders_identically(CONFIG, operations, optimized)
+        assert renders_identically(CONFIG, operations, optimized, previous)
+        emulators = GU600CommsEmulator(CONFIG), GU600CommsEmulator(CONFIG)
+        apply(GU600Driver(emulators[0], CONFIG), operations)
+        apply(GU600Driver(emulators[1], CONFIG), optimized)
+        assert emulators[0].cursor == emulators[1].cursor
+        before += plan_size(operations)
+        after += plan_size(optimized)
+    assert after < before
+
+
+def test_operation_buffer_drops_overwritten_areas() -> None:
+    emulator = GU600CommsEmulator(CONFIG)
+    buffer = GU600OperationBuffer(GU600Driver(emulator, CONFIG))
+    buffer.set_area(0, 0, 10, 10)
+    buffer.clear_all()
+    buffer.set_cursor_position(1, 8)
+    buffer.write_character(0x41)
+    buffer.write_character(0x42)
+    operations = buffer.operations
+    assert buffer.flush()
+    assert buffer.bytes_saved > 0
+    assert np.array_equal(emulator.pixels, _rendered(operations))
+
+
+def _rendered(operations: List[Operation]) -> np.ndarray:
+    emulator = GU600CommsEmulator(CONFIG)
+    apply(GU600Driver(emulator, CONFIG), operations)
+    return emulator.pixels
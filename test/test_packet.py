@@ -0,0 +1,85 @@
+import numpy as np
+import pytest
+
+from noritake.gu600_comms import GU600CommsRecorder
+from noritake.gu600_config import GU600Config
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_emulator import GU600CommsEmulator, command_size
+from noritake.gu600_enums import *
+from noritake.gu600_packet import (
+    MAX_PAYLOAD_SIZE,
+    PACKET_OVERHEAD,
+    GU600CommsLoopback,
+    GU600CommsPacket,
+)
+from noritake.gu600_stream import write_image
+
+CONFIG = GU600Config(240, 64)
+
+
+def _message() -> bytes:
+    recorder = GU600CommsRecorder()
+    vfd = GU600Driver(recorder, CONFIG)
+    rng = np.random.default_rng(0)
+    for i in range(40):
+        vfd.invert_area(i, 0, i + 20, 30)
+        vfd.write_text(i, 40, f"Variatio {i}")
+        vfd.draw_line(239 - i, 63)
+    write_image(
+        vfd, 0, 0, rng.random((64, 96)) > 0.5, max_message_size=MAX_PAYLOAD_SIZE
+    )
+    return bytes(recorder.data)
+
+
+@pytest.mark.parametrize("nak_every,drop_every", [(0, 0), (3, 0), (0, 3), (4, 5)])
+def test_round_trip(nak_every: int, drop_every: int) -> None:
+    message = _message()
+    loopback = GU600CommsLoopback(nak_every=nak_every, drop_every=drop_every)
+    link = GU600CommsPacket(loopback, timeout=0.0)
+    assert link.write(message)
+    assert loopback.received == message
+    assert link.retransmissions > 0 or not (nak_every or drop_every)
+
+
+def test_packets_end_at_command_boundaries() -> None:
+    message = _message()
+    loopback = GU600CommsLoopback(GU600CommsEmulator(CONFIG))
+    link = GU600CommsPacket(loopback, timeout=0.0)
+    sizes = []
+    original = loopback.write
+
+    def write(packet: bytes) -> bool:
+        sizes.append(len(packet) - PACKET_OVERHEAD)
+        return original(packet)
+
+    loopback.write = write  # type: ignore[assignment]
+    assert link.write(message)
+    orientation = GraphicOrientation.ORIENTATION_HORIZONTAL
+    position = 0
+    for size in sizes:
+        assert size <= MAX_PAYLOAD_SIZE
+        end = position + size
+        while position < end:
+            if message[position] == 0x1A:
+                orientation = GraphicOrientation(message[position + 1] >> 7)
+            length = command_size(message, position, orientation)
+            assert length is not None
+            position += length
+        assert position == end
+
+
+def test_every_rejected_packet_is_resent_in_order() -> None:
+    message = _message()
+    loopback = GU600CommsLoopback(nak_every=3)
+    link = GU600CommsPacket(loopback, timeout=0.0)
+    assert link.write(message)
+    assert loopback.received == message
+    assert link.retransmissions == (link.packets + link.retransmissions) // 3 > 0
+
+
+def test_write_fails_after_max_retries() -> None:
+    loopback = GU600CommsLoopback(nak_every=1)
+    link = GU600CommsPacket(loopback, timeout=0.0, max_retries=2)
+    assert not link.write(_message())
+    assert link.retransmissions == 2
+    assert loopback.received == b""
@@ -0,0 +1,46 @@
+import numpy as np
+import pytest
+
+from noritake.gu600_config import GU600Config
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_emulator import GU600CommsEmulator
+from noritake.gu600_planner import GU600PlannedFrameBuffer, plan, render
+
+CONFIG = GU600Config(240, 64)
+
+
+def _frames(seed: int) -> np.ndarray:
+    """A few frames with the kinds of change the planner tells apart."""
+    rng = np.random.default_rng(seed)
+    frames = np.zeros((6, CONFIG.height, CONFIG.width), dtype=bool)
+    frames[1, 10:30, 20:100] = True
+    frames[2] = frames[1]
+    frames[2, 12:28, 22:98] = False
+    frames[3] = frames[2]
+    for i in range(40):
+        frames[3, 5 + i // 2, 150 + i] = True
+    frames[4] = frames[3]
+    frames[
+        4, rng.integers(0, CONFIG.height, 30), rng.integers(0, CONFIG.width, 30)
+    ] ^= True
+    frames[5] = rng.random((CONFIG.height, CONFIG.width)) < 0.5
+    return frames
+
+
+@pytest.mark.parametrize("seed", range(3))
+def test_plan_renders_the_current_frame(seed: int) -> None:
+    frames = _frames(seed)
+    for previous in frames:
+        for current in frames:
+            operations = plan(previous, current)
+            assert np.array_equal(render(CONFIG, previous, operations), current)
+
+
+def test_planned_frame_buffer_flush_matches_pixels() -> None:
+    emulator = GU600CommsEmulator(CONFIG)
+    framebuffer = GU600PlannedFrameBuffer(GU600Driver(emulator, CONFIG))
+    for frame in _frames(0):
+        framebuffer.clear()
+        framebuffer.blit(0, 0, frame)
+        assert framebuffer.flush()
+        assert np.array_equal(emulator.pixels, framebuffer.pixels)
@@ -0,0 +1,60 @@
+import numpy as np
+
+from noritake.gu600_comms import GU600CommsRecorder
+from noritake.gu600_config import GU600Config
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_enums import *
+from noritake.gu600_stats import GU600CommsInstrumented, opcode
+
+CONFIG = GU600Config(240, 64)
+
+
+def test_opcode_of_buffers() -> None:
+    assert opcode(np.array([], dtype=np.uint8)) == -1
+    assert opcode(np.array([0x1B, 0x43], dtype=np.uint8)) == 0x1B43
+    assert opcode(np.array([0x431B], dtype="<u2").data) == 0x1B43
+    assert opcode(b"") == -1
+    assert opcode([0x10, 0, 0]) == 0x10
+
+
+def test_bytes_are_counted_for_any_buffer() -> None:
+    recorder = GU600CommsRecorder()
+    link = GU600CommsInstrumented(recorder)
+    link.write(np.array([0x10, 1, 2], dtype=np.uint8))
+    link.write(np.array([0x4241, 0x4443], dtype="<u2").data)
+    link.write(np.array([], dtype=np.uint8))
+    stats = link.stats()
+    assert stats.writes == 3
+    assert stats.bytes == len(recorder.data) == 7
+    assert stats.opcodes[0x10] == (1, 3)
+    assert stats.opcodes[0x41] == (1, 4)
+
+
+def test_batched_transfers_are_counted_per_command() -> None:
+    direct = GU600CommsInstrumented(GU600CommsRecorder())
+    batched = GU600CommsInstrumented(GU600CommsRecorder())
+    for link, max_transfer_size in ((direct, None), (batched, 64)):
+        vfd = GU600Driver(link, CONFIG)
+        if max_transfer_size is None:
+            _draw(vfd)
+        else:
+            with vfd.batch(max_transfer_size):
+                _draw(vfd)
+    assert batched.stats().writes < direct.stats().writes
+    assert batched.stats().opcodes == direct.stats().opcodes
+    assert direct.stats().opcodes[0x1F] == (2, 2 * (5 + 80))
+    assert direct.stats().opcodes[0x10] == (1, 3 + 11)
+
+
+def _draw(vfd: GU600Driver) -> None:
+    vfd.set_area(0, 0, 9, 9)
+    vfd.write_text(0, 20, "hello world")
+    vfd.set_write_mode(
+        GraphicOrientation.ORIENTATION_VERTICAL,
+        CursorMovement.MOVEMENT_HORIZONTAL,
+        CursorDirection.DIRECTION_FORWARD,
+        UnderScoreCursor.UNDERSCORECURSOR_STATICOFF,
+        PenType.PENTYPE_OVER,
+    )
+    vfd.write_graphic_area(0, 24, 79, 31, bytes([0x1B, 0x43] * 40))
+    vfd.write_graphic_area(80, 24, 159, 31, bytes(80))
@@ -0,0 +1,47 @@
+from typing import Iterator
+
+import numpy as np
+
+from noritake.gu600_comms import GU600CommsRecorder
+from noritake.gu600_config import GU600Config
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_emulator import GU600CommsEmulator
+from noritake.gu600_stream import image_rows, write_image
+
+CONFIG = GU600Config(240, 64)
+
+
+def _canvas(height: int) -> np.ndarray:
+    rng = np.random.default_rng(3)
+    return rng.random((height, CONFIG.width)) < 0.5
+
+
+def test_image_taller_than_the_display_is_clipped() -> None:
+    canvas = _canvas(300)
+    emulator = GU600CommsEmulator(CONFIG)
+    assert write_image(GU600Driver(emulator, CONFIG), 0, 0, canvas)
+    assert np.array_equal(emulator.pixels, canvas[: CONFIG.height])
+
+
+def test_image_is_clipped_at_both_edges() -> None:
+    canvas = _canvas(100)
+    emulator = GU600CommsEmulator(CONFIG)
+    assert write_image(GU600Driver(emulator, CONFIG), 0, -20, canvas)
+    assert np.array_equal(emulator.pixels, canvas[20 : 20 + CONFIG.height])
+    emulator = GU600CommsEmulator(CONFIG)
+    assert write_image(GU600Driver(emulator, CONFIG), 0, 50, canvas)
+    assert np.array_equal(emulator.pixels[50:], canvas[: CONFIG.height - 50])
+    assert not emulator.pixels[:50].any()
+
+
+def test_rows_below_the_display_are_not_consumed() -> None:
+    consumed = []
+
+    def rows() -> Iterator[bytes]:
+        for index, row in enumerate(image_rows(_canvas(300))):
+            consumed.append(index)
+            yield row
+
+    recorder = GU600CommsRecorder()
+    write_image(GU600Driver(recorder, CONFIG), 0, 0, rows(), CONFIG.width)
+    assert len(consumed) == CONFIG.height
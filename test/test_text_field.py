@@ -0,0 +1,90 @@
+from typing import Tuple
+
+import numpy as np
+
+from noritake.gu600_comms import GU600Comms, GU600CommsRecorder, Message
+from noritake.gu600_config import GU600Config
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_emulator import GU600CommsEmulator
+from noritake.gu600_enums import *
+from noritake.gu600_fonts import FONTS
+from noritake.gu600_text import GU600TextField
+
+CONFIG = GU600Config(240, 64)
+
+
+class Tee(GU600Comms):
+    """Record what is written and pass it on to the emulator."""
+
+    def __init__(self) -> None:
+        self.emulator = GU600CommsEmulator(CONFIG)
+        self.recorder = GU600CommsRecorder()
+
+    def write(self, message: Message) -> bool:
+        self.recorder.write(message)
+        return self.emulator.write(message)
+
+
+def _field(face: FontFace) -> Tuple[Tee, GU600Driver, GU600TextField]:
+    link = Tee()
+    vfd = GU600Driver(link, CONFIG)
+    vfd.set_write_mode(
+        GraphicOrientation.ORIENTATION_HORIZONTAL,
+        CursorMovement.MOVEMENT_HORIZONTAL,
+        CursorDirection.DIRECTION_FORWARD,
+        UnderScoreCursor.UNDERSCORECURSOR_STATICOFF,
+        PenType.PENTYPE_OVER,
+    )
+    vfd.select_font(face)
+    link.recorder.clear()
+    return link, vfd, GU600TextField(vfd, 10, 20, 8, FONTS[face])
+
+
+def _shown(face: FontFace, text: str) -> np.ndarray:
+    link, _, field = _field(face)
+    field.update(text)
+    return link.emulator.pixels
+
+
+def test_fixed_spaced_field_rewrites_changed_characters() -> None:
+    link, _, field = _field(FontFace.FIXEDSPACED_5X7)
+    assert field.update("12:00")
+    link.recorder.clear()
+    assert field.update("12:01")
+    assert bytes(link.recorder.data) == b"\x10\x22\x141"
+    assert field.last_bytes == len(link.recorder.data)
+    assert np.array_equal(
+        link.emulator.pixels, _shown(FontFace.FIXEDSPACED_5X7, "12:01")
+    )
+
+
+def test_unchanged_text_sends_nothing() -> None:
+    for face in (FontFace.FIXEDSPACED_5X7, FontFace.PROPORTIONAL_MINI):
+        link, _, field = _field(face)
+        field.update("same")
+        link.recorder.clear()
+        assert field.update("same")
+        assert link.recorder.writes == 0
+        assert field.last_bytes == 0
+
+
+def test_proportional_field_clears_what_shorter_text_leaves() -> None:
+    link, _, field = _field(FontFace.PROPORTIONAL_MINI)
+    field.update("WWWWWWWW")
+    field.update("iiii")
+    assert np.array_equal(
+        link.emulator.pixels, _shown(FontFace.PROPORTIONAL_MINI, "iiii")
+    )
+    field.update("WWWWWWWW")
+    assert np.array_equal(
+        link.emulator.pixels, _shown(FontFace.PROPORTIONAL_MINI, "WWWWWWWW")
+    )
+
+
+def test_last_bytes_counts_skipped_cursor_commands() -> None:
+    link, vfd, field = _field(FontFace.FIXEDSPACED_5X7)
+    vfd.set_cursor_position(10, 20)
+    link.recorder.clear()
+    field.update("abc")
+    assert bytes(link.recorder.data) == b"abc     "
+    assert field.last_bytes == 8
@@ -0,0 +1,98 @@
+from typing import Tuple
+
+import numpy as np
+
+from noritake.gu600_comms import GU600Comms, GU600CommsRecorder, Message
+from noritake.gu600_config import GU600Config
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_emulator import GU600CommsEmulator
+from noritake.gu600_fonts import DEFAULT_FONT
+from noritake.gu600_ticker import GU600Ticker
+
+CONFIG = GU600Config(240, 64)
+LONG_TEXT = "a line of text far too long for the ticker"
+
+
+class Tee(GU600Comms):
+    """Record what is written and pass it on to the emulator."""
+
+    def __init__(self) -> None:
+        self.emulator = GU600CommsEmulator(CONFIG)
+        self.recorder = GU600CommsRecorder()
+
+    def write(self, message: Message) -> bool:
+        self.recorder.write(message)
+        return self.emulator.write(message)
+
+
+def _ticker(hardware: bool = True) -> Tuple[Tee, GU600Ticker]:
+    link = Tee()
+    width = 10 * DEFAULT_FONT.advance(0x20)
+    return link, GU600Ticker(
+        GU600Driver(link, CONFIG), 20, 30, width, hardware=hardware
+    )
+
+
+def _rendered(text: str) -> np.ndarray:
+    emulator = GU600CommsEmulator(CONFIG)
+    GU600Driver(emulator, CONFIG).write_text(20, 30, text)
+    return emulator.pixels
+
+
+def test_text_that_fits_is_written_once() -> None:
+    link, ticker = _ticker()
+    assert ticker.set_text("short")
+    assert not ticker.scrolling
+    assert np.array_equal(link.emulator.pixels, _rendered("short"))
+    assert ticker.last_bytes == len(link.recorder.data)
+    link.recorder.clear()
+    assert ticker.set_text("short") and ticker.tick()
+    assert ticker.last_bytes == len(link.recorder.data) == 0
+
+
+def test_long_text_scrolls_in_window_1() -> None:
+    link, ticker = _ticker()
+    ticker.set_text("short")
+    link.recorder.clear()
+    assert ticker.set_text(LONG_TEXT)
+    assert (ticker.scrolling, ticker.hardware) == (True, True)
+    assert ticker.last_bytes == len(link.recorder.data)
+    emulator = link.emulator
+    assert emulator.windows[1] == (20, 30 - DEFAULT_FONT.height + 1, 79, 30)
+    assert emulator.visible_windows == {1: True, 2: False}
+    assert LONG_TEXT.encode() in emulator.scroll_text
+    # The text written before is cleared.
+    assert not emulator.pixels.any()
+    link.recorder.clear()
+    assert ticker.tick()
+    assert ticker.last_bytes == len(link.recorder.data) == 0
+    assert ticker.set_text("short")
+    assert not ticker.scrolling
+    assert emulator.visible_windows == {1: False, 2: False}
+    assert np.array_equal(emulator.pixels, _rendered("short"))
+
+
+def test_software_scrolling_moves_one_character_per_tick() -> None:
+    link, ticker = _ticker(hardware=False)
+    assert ticker.set_text(LONG_TEXT)
+    assert (ticker.scrolling, ticker.hardware) == (True, False)
+    cycle = LONG_TEXT + "   "
+    for offset in range(1, len(cycle) + 3):
+        link.recorder.clear()
+        assert ticker.tick()
+        assert ticker.last_bytes == len(link.recorder.data)
+        visible = (cycle * 2)[offset % len(cycle) :][:10]
+        assert np.array_equal(link.emulator.pixels, _rendered(visible))
+    assert link.emulator.visible_windows == {1: False, 2: False}
+
+
+def test_stop_clears_the_line() -> None:
+    for hardware in (True, False):
+        link, ticker = _ticker(hardware)
+        ticker.set_text(LONG_TEXT)
+        link.recorder.clear()
+        assert ticker.stop()
+        assert ticker.last_bytes == len(link.recorder.data)
+        assert not ticker.scrolling and ticker.text is None
+        assert not link.emulator.pixels.any()
+        assert not link.emulator.visible_windows[1]
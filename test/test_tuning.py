@@ -0,0 +1,89 @@
+from typing import List
+
+from noritake import gu600_encoder as enc
+from noritake.gu600_comms import GU600Comms, Message, as_buffer
+from noritake.gu600_config import GU600Config
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_emulator import GU600CommsEmulator
+from noritake.gu600_tuning import GU600CommsAdaptive, calibrate
+
+CONFIG = GU600Config(240, 64)
+
+
+class FakeSPI(GU600Comms):
+    """Emulated display behind an SPI link that corrupts transfers above 'limit' Hz by turning a byte
+    into the start of a graphic area command, leaving the display waiting for its data."""
+
+    def __init__(self, limit: int) -> None:
+        self.emulator = GU600CommsEmulator(CONFIG)
+        self.limit = limit
+        self.speed_hz = 500000
+        self.sent: List[bytes] = []
+
+    def write(self, message: Message) -> bool:
+        data = bytearray(as_buffer(message))
+        if self.speed_hz > self.limit and len(data) > 10:
+            data[5] = 0x1F
+        self.sent.append(bytes(data))
+        return self.emulator.write(data)
+
+    def read(self, count: int, timeout: float = 0.0) -> List[int]:
+        return self.emulator.read(count)
+
+
+def test_calibrate_stops_at_first_failure() -> None:
+    link = FakeSPI(1250000)
+    calibration = calibrate(link)  # type: ignore[arg-type]
+    assert calibration.max_speed_hz == 1250000
+    assert calibration.speed_hz == 1000000
+    assert link.speed_hz == 1000000
+    assert link.sent[0] == enc.LOCK_EEPROM
+    assert enc.UNLOCK_EEPROM in link.sent
+    vfd = GU600Driver(link, CONFIG)
+    vfd.set_area(0, 0, 9, 9)
+    assert link.emulator.pixels[:10, :10].all()
+
+
+def test_calibrate_keeps_eeprom_locked() -> None:
+    link = FakeSPI(1250000)
+    calibrate(link, eeprom_locked=True)  # type: ignore[arg-type]
+    assert enc.UNLOCK_EEPROM not in link.sent
+
+
+def test_adaptive_link_counts_from_checksum_queries() -> None:
+    link = FakeSPI(4000000)
+    link.speed_hz = 2000000
+    adaptive = GU600CommsAdaptive(link, check_interval=1 << 20)  # type: ignore[arg-type]
+    vfd = GU600Driver(adaptive, CONFIG)
+    vfd.write_text(0, 7, "before")
+    assert vfd.query_checksum() is not None
+    vfd.write_text(0, 15, "after")
+    assert adaptive.verify()
+    assert adaptive.mismatches == 0
+    assert link.speed_hz == 2000000
+
+
+def test_adaptive_link_backs_off_on_corruption() -> None:
+    link = FakeSPI(1000000)
+    link.speed_hz = 2000000
+    adaptive = GU600CommsAdaptive(link, check_interval=100)  # type: ignore[arg-type]
+    vfd = GU600Driver(adaptive, CONFIG)
+    for _ in range(20):
+        vfd.write_text(0, 10, "hello world " * 3)
+    assert adaptive.mismatches > 0
+    assert link.speed_hz <= 1000000
+
+
+def test_adaptive_link_parses_commands_split_across_transfers() -> None:
+    link = FakeSPI(4000000)
+    link.speed_hz = 2000000
+    adaptive = GU600CommsAdaptive(link, check_interval=50)  # type: ignore[arg-type]
+    vfd = GU600Driver(adaptive, CONFIG)
+    data = bytes([0x1B, 0x43] * 40)
+    for row in range(4):
+        with vfd.batch(64):
+            vfd.write_text(0, 7, "split")
+            vfd.write_graphic_area(0, row * 8, 79, row * 8 + 7, data)
+    assert adaptive.verify()
+    assert adaptive.mismatches == 0
+    assert link.speed_hz == 2000000
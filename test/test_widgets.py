@@ -0,0 +1,89 @@
+import numpy as np
+import pytest
+
+from noritake.gu600_config import GU600Config
+from noritake.gu600_driver import GU600Driver
+from noritake.gu600_emulator import GU600CommsEmulator
+from noritake.gu600_stream import AREA_COMMAND_SIZE
+from noritake.gu600_widgets import GU600Bar, GU600LevelMeter, GU600Sparkline
+
+CONFIG = GU600Config(240, 64)
+
+
+@pytest.mark.parametrize("vertical", [False, True])
+def test_bar_updates_render_like_a_full_redraw(vertical: bool) -> None:
+    emulator = GU600CommsEmulator(CONFIG)
+    bar = GU600Bar(GU600Driver(emulator, CONFIG), 10, 5, 109, 44, vertical=vertical)
+    for value in (0, 50, 51, 51, 20, 100, 120, -5, 75):
+        bar.update(value)
+        expected = GU600CommsEmulator(CONFIG)
+        GU600Bar(
+            GU600Driver(expected, CONFIG), 10, 5, 109, 44, vertical=vertical
+        ).update(value)
+        assert np.array_equal(emulator.pixels, expected.pixels)
+    assert bar.value == 75
+    inside = emulator.pixels[6:44, 11:109]
+    if vertical:
+        assert inside[:, 0].sum() == round(0.75 * 38)
+        assert inside[-1, :].all()
+    else:
+        assert inside[0, :].sum() == round(0.75 * 98)
+        assert inside[:, 0].all()
+
+
+def test_bar_sends_only_the_change() -> None:
+    bar = GU600Bar(GU600Driver(GU600CommsEmulator(CONFIG), CONFIG), 0, 0, 99, 9)
+    bar.update(50)
+    assert bar.last_bytes == 3 * AREA_COMMAND_SIZE
+    bar.update(60)
+    assert bar.last_bytes == AREA_COMMAND_SIZE
+    bar.update(60)
+    assert bar.last_bytes == 0
+    bar.invalidate()
+    bar.update(60)
+    assert bar.last_bytes == 3 * AREA_COMMAND_SIZE
+
+
+def test_level_meter_holds_the_peak() -> None:
+    emulator = GU600CommsEmulator(CONFIG)
+    meter = GU600LevelMeter(
+        GU600Driver(emulator, CONFIG), 0, 0, 49, 9, floor=-48, hold=2, outline=False
+    )
+    meter.update(0)
+    assert emulator.pixels[0, :50].all()
+    for _ in range(2):
+        meter.update(-24)
+        assert meter.level == -24
+        assert emulator.pixels[0, :25].all() and not emulator.pixels[0, 25:49].any()
+        assert emulator.pixels[0, 49]
+    meter.update(-24)
+    assert not emulator.pixels[0, 25:].any()
+    meter.update(-100)
+    assert meter.level == -48
+    assert meter.last_bytes <= 3 * AREA_COMMAND_SIZE
+
+
+@pytest.mark.parametrize("filled", [False, True])
+def test_sparkline_sweeps_across_its_area(filled: bool) -> None:
+    emulator = GU600CommsEmulator(CONFIG)
+    emulator.pixels[:] = True
+    graph = GU600Sparkline(
+        GU600Driver(emulator, CONFIG), 100, 10, 109, 19, filled=filled, gap=2
+    )
+    values = [0.0, 1.0, 0.5, 0.2, 0.9, 0.4, 0.0, 0.3, 1.0, 0.7, 0.6, 0.1, 0.5]
+    rows = [9 - round(value * 9) for value in values]
+    for n, value in enumerate(values):
+        graph.update(value)
+        column = emulator.pixels[10:20, 100 + n % 10]
+        if filled:
+            assert column.sum() == 10 - rows[n] and column[rows[n] :].all()
+        elif n % 10:
+            low, high = sorted((rows[n], rows[n - 1]))
+            assert np.flatnonzero(column).tolist() == list(range(low, high + 1))
+        else:
+            assert np.flatnonzero(column).tolist() == [rows[n]]
+        for offset in (1, 2):
+            assert not emulator.pixels[10:20, 100 + (n + offset) % 10].any()
+    # Nothing outside the area is touched.
+    assert emulator.pixels[:10].all() and emulator.pixels[20:].all()
+    assert emulator.pixels[:, :100].all() and emulator.pixels[:, 110:].all()